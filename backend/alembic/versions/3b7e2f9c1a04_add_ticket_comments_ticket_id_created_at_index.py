@@ -0,0 +1,29 @@
+"""add_ticket_comments_ticket_id_created_at_index
+
+Revision ID: 3b7e2f9c1a04
+Revises: 66a22deb97fe
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e2f9c1a04'
+down_revision = '66a22deb97fe'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_ticket_comments_ticket_id_created_at',
+        'ticket_comments',
+        ['ticket_id', 'created_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ticket_comments_ticket_id_created_at', table_name='ticket_comments')
@@ -0,0 +1,82 @@
+"""add_ticket_archive_tables
+
+Revision ID: 7c4d1e8a9b52
+Revises: 3b7e2f9c1a04
+Create Date: 2026-10-19 14:03:27.551920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4d1e8a9b52'
+down_revision = '3b7e2f9c1a04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Enum tipleri tickets tablosuyla paylaşılır
+    ticket_status = postgresql.ENUM(name='ticketstatus', create_type=False)
+    ticket_priority = postgresql.ENUM(name='ticketpriority', create_type=False)
+    ticket_category = postgresql.ENUM(name='ticketcategory', create_type=False)
+
+    op.create_table('tickets_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('title', sa.String(length=500), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('status', ticket_status, nullable=True),
+    sa.Column('priority', ticket_priority, nullable=True),
+    sa.Column('category', ticket_category, nullable=True),
+    sa.Column('created_by_id', sa.Integer(), nullable=False),
+    sa.Column('assigned_to_id', sa.Integer(), nullable=True),
+    sa.Column('escalated_to_id', sa.Integer(), nullable=True),
+    sa.Column('last_updated_by_id', sa.Integer(), nullable=True),
+    sa.Column('resolution', sa.Text(), nullable=True),
+    sa.Column('attachment_urls', sa.Text(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['assigned_to_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['escalated_to_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['last_updated_by_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tickets_archive_created_by_id_created_at', 'tickets_archive', ['created_by_id', 'created_at'], unique=False)
+    op.create_index('ix_tickets_archive_created_at', 'tickets_archive', ['created_at'], unique=False)
+
+    op.create_table('ticket_comments_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('ticket_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('is_internal', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['ticket_id'], ['tickets_archive.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ticket_comments_archive_ticket_id_created_at', 'ticket_comments_archive', ['ticket_id', 'created_at', 'id'], unique=False)
+
+    # Arşivleme adayları: sadece kapalı ticket'ları kapsayan küçük kısmi index
+    op.create_index(
+        'ix_tickets_closed_updated_at',
+        'tickets',
+        ['updated_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'CLOSED'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tickets_closed_updated_at', table_name='tickets')
+    op.drop_index('ix_ticket_comments_archive_ticket_id_created_at', table_name='ticket_comments_archive')
+    op.drop_table('ticket_comments_archive')
+    op.drop_index('ix_tickets_archive_created_at', table_name='tickets_archive')
+    op.drop_index('ix_tickets_archive_created_by_id_created_at', table_name='tickets_archive')
+    op.drop_table('tickets_archive')
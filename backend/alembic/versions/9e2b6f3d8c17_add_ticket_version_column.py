@@ -0,0 +1,27 @@
+"""add_ticket_version_column
+
+Revision ID: 9e2b6f3d8c17
+Revises: 7c4d1e8a9b52
+Create Date: 2026-10-19 15:21:08.104733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e2b6f3d8c17'
+down_revision = '7c4d1e8a9b52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Sabit varsayılanlı NOT NULL kolon PostgreSQL 11+ üzerinde tabloyu yeniden yazmaz
+    op.add_column('tickets', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('tickets_archive', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('tickets_archive', 'version')
+    op.drop_column('tickets', 'version')
@@ -0,0 +1,34 @@
+"""add_tickets_updated_at_index
+
+Revision ID: a3d8f1c6b2e4
+Revises: f4a7d2c8e9b3
+Create Date: 2026-10-19 21:14:05.318842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d8f1c6b2e4'
+down_revision = 'f4a7d2c8e9b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Kopya index'i son senkronizasyondan beri değişen ticket'ları okur
+    # (updated_at >= :since). Tablo yazmaya açık kalsın diye CONCURRENTLY.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tickets_updated_at', 'tickets', ['updated_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tickets_updated_at', table_name='tickets',
+            postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,32 @@
+"""add_auto_assignment_columns
+
+Revision ID: b5f8a2c6d913
+Revises: 9e2b6f3d8c17
+Create Date: 2026-10-19 16:40:52.387615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5f8a2c6d913'
+down_revision = '9e2b6f3d8c17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('ticket_categories', sa.JSON(), nullable=True))
+    op.create_index(
+        'ix_tickets_open_assigned_to_id',
+        'tickets',
+        ['assigned_to_id'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('OPEN', 'IN_PROGRESS', 'WAITING')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tickets_open_assigned_to_id', table_name='tickets')
+    op.drop_column('users', 'ticket_categories')
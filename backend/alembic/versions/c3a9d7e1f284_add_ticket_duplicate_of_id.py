@@ -0,0 +1,29 @@
+"""add_ticket_duplicate_of_id
+
+Revision ID: c3a9d7e1f284
+Revises: b5f8a2c6d913
+Create Date: 2026-10-19 17:55:13.902461
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a9d7e1f284'
+down_revision = 'b5f8a2c6d913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Asıl ticket arşive taşınabileceği için FK tanımlanmaz
+    op.add_column('tickets', sa.Column('duplicate_of_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_tickets_duplicate_of_id'), 'tickets', ['duplicate_of_id'], unique=False)
+    op.add_column('tickets_archive', sa.Column('duplicate_of_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('tickets_archive', 'duplicate_of_id')
+    op.drop_index(op.f('ix_tickets_duplicate_of_id'), table_name='tickets')
+    op.drop_column('tickets', 'duplicate_of_id')
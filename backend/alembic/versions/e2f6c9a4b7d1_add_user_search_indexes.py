@@ -0,0 +1,34 @@
+"""add_user_search_indexes
+
+Revision ID: e2f6c9a4b7d1
+Revises: d8e4b1f7a3c5
+Create Date: 2026-10-19 19:26:48.570213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2f6c9a4b7d1'
+down_revision = 'd8e4b1f7a3c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # /users/search: içinde geçen arama için trigram, kısa önek araması için
+    # text_pattern_ops index'leri. İfadeler USER_SEARCH_DOCUMENT ile aynı olmalı.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX ix_users_search_trgm ON users "
+        "USING gin ((username || ' ' || full_name || ' ' || email) gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX ix_users_username_prefix ON users (lower(username) text_pattern_ops)")
+    op.execute("CREATE INDEX ix_users_full_name_prefix ON users (lower(full_name) text_pattern_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_full_name_prefix', table_name='users')
+    op.drop_index('ix_users_username_prefix', table_name='users')
+    op.drop_index('ix_users_search_trgm', table_name='users')
@@ -0,0 +1,96 @@
+"""add_soft_delete_and_fk_cascades
+
+Revision ID: f4a7d2c8e9b3
+Revises: e2f6c9a4b7d1
+Create Date: 2026-10-19 20:08:35.164907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a7d2c8e9b3'
+down_revision = 'e2f6c9a4b7d1'
+branch_labels = None
+depends_on = None
+
+
+# (tablo, kolon, hedef tablo, ON DELETE davranışı)
+FOREIGN_KEYS = [
+    ('ticket_comments', 'ticket_id', 'tickets', 'CASCADE'),
+    ('ticket_comments_archive', 'ticket_id', 'tickets_archive', 'CASCADE'),
+    ('tickets', 'assigned_to_id', 'users', 'SET NULL'),
+    ('tickets', 'escalated_to_id', 'users', 'SET NULL'),
+    ('tickets', 'last_updated_by_id', 'users', 'SET NULL'),
+    ('tickets_archive', 'assigned_to_id', 'users', 'SET NULL'),
+    ('tickets_archive', 'escalated_to_id', 'users', 'SET NULL'),
+    ('tickets_archive', 'last_updated_by_id', 'users', 'SET NULL'),
+]
+
+# Silinen satırı referans eden kolonlar index'siz olursa her silmede tablo taranır
+FOREIGN_KEY_INDEXES = [
+    ('tickets', 'created_by_id'),
+    ('tickets', 'assigned_to_id'),
+    ('tickets', 'escalated_to_id'),
+    ('tickets', 'last_updated_by_id'),
+    ('tickets_archive', 'assigned_to_id'),
+    ('tickets_archive', 'escalated_to_id'),
+    ('tickets_archive', 'last_updated_by_id'),
+    ('ticket_comments', 'user_id'),
+    ('ticket_comments_archive', 'user_id'),
+]
+
+
+def _replace_foreign_key(table: str, column: str, target: str, ondelete) -> str:
+    name = f'{table}_{column}_fkey'
+    on_delete = f' ON DELETE {ondelete}' if ondelete else ''
+    op.execute(
+        f'ALTER TABLE {table} DROP CONSTRAINT {name}, '
+        f'ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {target} (id){on_delete} NOT VALID'
+    )
+    return name
+
+
+def upgrade() -> None:
+    op.add_column('tickets', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('tickets_archive', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_tickets_deleted_at', 'tickets', ['deleted_at'], unique=False,
+        postgresql_where=sa.text('deleted_at IS NOT NULL')
+    )
+    
+    # Kısıtlar NOT VALID eklenir ve ayrı transaction'larda doğrulanır; index'ler
+    # CONCURRENTLY kurulur. Böylece büyük tablolarda yazmalar tarama boyunca beklemez.
+    constraints = [
+        (table, _replace_foreign_key(table, column, target, ondelete))
+        for table, column, target, ondelete in FOREIGN_KEYS
+    ]
+    
+    with op.get_context().autocommit_block():
+        for table, name in constraints:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+        for table, column in FOREIGN_KEY_INDEXES:
+            op.create_index(
+                op.f(f'ix_{table}_{column}'), table, [column], unique=False,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in reversed(FOREIGN_KEY_INDEXES):
+            op.drop_index(
+                op.f(f'ix_{table}_{column}'), table_name=table,
+                postgresql_concurrently=True, if_exists=True
+            )
+    
+    for table, column, target, _ in reversed(FOREIGN_KEYS):
+        name = _replace_foreign_key(table, column, target, None)
+        op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+    
+    op.drop_index('ix_tickets_deleted_at', table_name='tickets')
+    op.drop_column('users', 'deleted_at')
+    op.drop_column('tickets_archive', 'deleted_at')
+    op.drop_column('tickets', 'deleted_at')
@@ -1,9 +1,10 @@
 from datetime import timedelta, datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 from app.core.config import settings
+from app.core.conditional import compute_etag, conditional_response
 from app.core.security import (
     verify_password, 
     create_access_token_for_user, 
@@ -13,10 +14,11 @@ from app.core.security import (
     get_password_hash,
     verify_token
 )
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User, UserRole, UserStatus
 from app.models.role import Role, RoleType
 from app.models.ticket import Ticket, TicketStatus
+from app.core.visibility import ticket_not_deleted
 from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
 
@@ -206,14 +208,26 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     }
 
 @router.get("/auth/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_active_user)):
+async def read_users_me(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user)
+):
     """Mevcut kullanıcı bilgilerini getir"""
+    # Yanıttaki rol adı ve izinler de ETag'e girer; rol izinleri değişince 304 dönmez
+    etag = compute_etag(
+        "auth-me", current_user.id, current_user.updated_at, current_user.role_id,
+        current_user.role_name, ",".join(current_user.permissions)
+    )
+    cached = conditional_response(request, response, etag)
+    if cached is not None:
+        return cached
     return current_user
 
 @router.get("/auth/me/stats", response_model=UserStats)
 async def get_user_stats(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Kullanıcının ticket istatistiklerini getir"""
     
@@ -221,6 +235,7 @@ async def get_user_stats(
     active_tickets = db.query(Ticket).filter(
         and_(
             Ticket.created_by_id == current_user.id,
+            ticket_not_deleted(),
             Ticket.status.in_([TicketStatus.OPEN, TicketStatus.IN_PROGRESS, TicketStatus.WAITING])
         )
     ).count()
@@ -229,13 +244,15 @@ async def get_user_stats(
     resolved_tickets = db.query(Ticket).filter(
         and_(
             Ticket.created_by_id == current_user.id,
+            ticket_not_deleted(),
             Ticket.status.in_([TicketStatus.RESOLVED, TicketStatus.CLOSED])
         )
     ).count()
     
     # Toplam ticket sayısı
     total_tickets = db.query(Ticket).filter(
-        Ticket.created_by_id == current_user.id
+        Ticket.created_by_id == current_user.id,
+        ticket_not_deleted()
     ).count()
     
     # Ortalama çözüm süresi (çözülen ticketlar için)
@@ -246,6 +263,7 @@ async def get_user_stats(
     ).filter(
         and_(
             Ticket.created_by_id == current_user.id,
+            ticket_not_deleted(),
             Ticket.status.in_([TicketStatus.RESOLVED, TicketStatus.CLOSED]),
             Ticket.updated_at.isnot(None)
         )
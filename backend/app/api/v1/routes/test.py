@@ -34,7 +34,7 @@ async def create_sample_data(db: Session = Depends(get_db)):
             email="teknisyen1@techmax.com",
             full_name="Ahmet Yılmaz",
             hashed_password=get_password_hash("tech123"),
-            role=UserRole.TECHNICIAN,
+            role=UserRole.AGENT,
             is_admin=False,
             is_active=True,
             department="IT"
@@ -1,14 +1,39 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from itertools import islice
+import enum
+import heapq
+import json
 import os
 import base64
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from sqlalchemy.orm import Session, joinedload
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Request, Response, Header
+from sqlalchemy import Integer, func, select, tuple_, update, insert, case, literal, bindparam, any_, exists
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, joinedload, aliased
+from sqlalchemy.orm.exc import StaleDataError
+from app.db.session import get_db, get_read_db
+from app.core.config import settings
+from app.core.conditional import (
+    compute_etag,
+    compute_versioned_etag,
+    conditional_response,
+    if_match_versions,
+    precondition_failed
+)
+from app.core.fast_json import fast_json_response
+from app.core.idempotency import IDEMPOTENCY_HEADER, claim_idempotency_key
+from app.core.visibility import ticket_visibility, ticket_editability, comment_visibility, ticket_not_deleted
+from app.core.compression import compressible
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from app.core.metrics import UPLOAD_BYTES, UPLOAD_DURATION, observe_duration
 from app.models.ticket import Ticket, TicketStatus, TicketPriority, TicketCategory
 from app.models.ticket_comment import TicketComment
+from app.models.archive import ArchivedTicket, ArchivedTicketComment
 from app.models.user import User
+from app.models.role import Role
+from app.services.assignment import assignment_engine, load_owner, OPEN_STATUSES
+from app.services.duplicates import duplicate_index
 from app.core.security import (
     get_current_active_user,
     require_agent_or_above,
@@ -16,7 +41,7 @@ from app.core.security import (
     require_admin,
     require_permission
 )
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 router = APIRouter()
 
@@ -51,6 +76,36 @@ class TicketResolve(BaseModel):
 class TicketClose(BaseModel):
     closing_note: Optional[str] = Field(None, description="Kapatma notu")
 
+class BulkTicketAction(str, enum.Enum):
+    ASSIGN = "assign"
+    CLOSE = "close"
+    PRIORITY = "priority"
+
+class BulkTicketFilter(BaseModel):
+    status: Optional[TicketStatus] = None
+    priority: Optional[TicketPriority] = None
+    category: Optional[TicketCategory] = None
+    assigned_to_id: Optional[int] = None
+
+class BulkTicketOperation(BaseModel):
+    action: BulkTicketAction
+    ticket_ids: Optional[List[int]] = Field(None, max_length=5000)
+    filter: Optional[BulkTicketFilter] = None
+    assigned_to_id: Optional[int] = None
+    priority: Optional[TicketPriority] = None
+    note: Optional[str] = Field(None, description="Her ticket'a internal yorum olarak eklenir")
+
+class BulkTicketResult(BaseModel):
+    ticket_id: int
+    success: bool
+    detail: Optional[str] = None
+
+class BulkTicketResponse(BaseModel):
+    action: BulkTicketAction
+    updated: int
+    failed: int
+    results: List[BulkTicketResult]
+
 class FileUpload(BaseModel):
     filename: str
     file_data: str  # Base64 encoded
@@ -109,6 +164,61 @@ class TicketResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class DuplicateCandidate(BaseModel):
+    id: int
+    title: str
+    status: str
+    created_at: datetime
+    similarity: float
+
+class TicketCreateResponse(TicketResponse):
+    # Başlık/açıklaması benzer açık ticket'lar (olası kopyalar)
+    possible_duplicates: List[DuplicateCandidate] = []
+
+class DuplicateCheck(BaseModel):
+    title: str
+    description: str = ""
+
+class TicketDuplicateLink(BaseModel):
+    duplicate_of_id: int
+    merge: bool = Field(False, description="Yorumları asıl ticket'a taşı ve bu ticket'ı kapat")
+
+class TicketCapabilities(BaseModel):
+    # Ticket sayfasında hangi aksiyonların gösterileceği (endpoint kurallarıyla aynı)
+    can_edit: bool
+    can_comment: bool
+    can_add_internal_note: bool
+    can_upload_attachments: bool
+    can_assign: bool
+    can_escalate: bool
+    can_resolve: bool
+    can_close: bool
+    can_reopen: bool
+    can_delete: bool
+
+class TicketFullResponse(BaseModel):
+    ticket: TicketResponse
+    comments: List[CommentResponse]
+    # Sonraki yorum sayfası için GET /tickets/{id}/comments?cursor=...
+    next_comments_cursor: Optional[str] = None
+    attachments: List[Dict[str, Any]]
+    capabilities: TicketCapabilities
+
+class TicketBatchCreate(BaseModel):
+    # Öğeler tek tek doğrulanır; hatalı öğe tüm partiyi düşürmez
+    tickets: List[Dict[str, Any]] = Field(..., min_length=1, max_length=5000)
+
+class TicketBatchResult(BaseModel):
+    index: int
+    ticket_id: Optional[int] = None
+    success: bool
+    detail: Optional[str] = None
+
+class TicketBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[TicketBatchResult]
+
 class TicketListResponse(BaseModel):
     id: int
     title: str
@@ -122,61 +232,193 @@ class TicketListResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.get("/tickets/", response_model=List[TicketResponse])
-async def get_tickets(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
-    status: Optional[TicketStatus] = Query(None),
-    priority: Optional[TicketPriority] = Query(None),
-    category: Optional[TicketCategory] = Query(None),
-    search: Optional[str] = Query(None, description="Başlık veya açıklamada arama"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
-):
-    """Ticket listesi - Rol bazlı filtreleme"""
-    query = db.query(Ticket).options(
-        joinedload(Ticket.created_by),
-        joinedload(Ticket.assigned_to),
-        joinedload(Ticket.escalated_to),
-        joinedload(Ticket.last_updated_by)
+# Yanıttaki gömülü kullanıcı ilişkileri (TicketResponse alan sırasıyla)
+TICKET_USER_RELATIONS = ("created_by", "assigned_to", "escalated_to", "last_updated_by")
+
+def _fast_ticket_list(db: Session, whereclause, skip: int, limit: int):
+    """
+    ORM nesnesi ve Pydantic doğrulaması olmadan kolon projeksiyonundan
+    TicketResponse ile birebir aynı JSON'u üret
+    """
+    users = [aliased(User, name=relation) for relation in TICKET_USER_RELATIONS]
+    columns = [
+        Ticket.id, Ticket.title, Ticket.description, Ticket.status, Ticket.priority,
+        Ticket.category, Ticket.resolution, Ticket.created_at, Ticket.updated_at
+    ]
+    for user in users:
+        columns.extend([user.id, user.username, user.email, user.full_name])
+    
+    statement = select(*columns)
+    for relation, user in zip(TICKET_USER_RELATIONS, users):
+        statement = statement.outerjoin(user, user.id == getattr(Ticket, f"{relation}_id"))
+    if whereclause is not None:
+        statement = statement.where(whereclause)
+    statement = statement.order_by(Ticket.created_at.desc()).offset(skip).limit(limit)
+    
+    tickets = []
+    for row in db.execute(statement):
+        ticket = {
+            "id": row[0],
+            "title": row[1],
+            "description": row[2],
+            "status": row[3].value,
+            "priority": row[4].value,
+            "category": row[5].value,
+            "resolution": row[6],
+            "created_at": row[7],
+            "updated_at": row[8],
+        }
+        offset = 9
+        for relation in TICKET_USER_RELATIONS:
+            user_id = row[offset]
+            ticket[relation] = None if user_id is None else {
+                "id": user_id,
+                "username": row[offset + 1],
+                "email": row[offset + 2],
+                "full_name": row[offset + 3],
+            }
+            offset += 4
+        tickets.append(ticket)
+    
+    return fast_json_response(tickets)
+
+NORMALIZE_USERS_DESCRIPTION = (
+    "Kullanıcıları her ticket'a gömmek yerine sadece *_id alanlarını ve tekilleştirilmiş "
+    "bir users haritasını döndür: {\"tickets\": [...], \"users\": {\"<id>\": {...}}}"
+)
+
+def _ticket_ref_rows(db: Session, model, whereclause, skip: int, limit: int) -> List[dict]:
+    """Kullanıcı join'i olmadan ticket satırları; kullanıcılar sadece id olarak"""
+    statement = select(
+        model.id, model.title, model.description, model.status, model.priority,
+        model.category, model.resolution, model.created_at, model.updated_at,
+        *(getattr(model, f"{relation}_id") for relation in TICKET_USER_RELATIONS)
+    )
+    if whereclause is not None:
+        statement = statement.where(whereclause)
+    statement = statement.order_by(model.created_at.desc()).offset(skip).limit(limit)
+    
+    tickets = []
+    for row in db.execute(statement):
+        ticket = {
+            "id": row[0],
+            "title": row[1],
+            "description": row[2],
+            "status": row[3].value,
+            "priority": row[4].value,
+            "category": row[5].value,
+            "resolution": row[6],
+            "created_at": row[7],
+            "updated_at": row[8],
+        }
+        for offset, relation in enumerate(TICKET_USER_RELATIONS, start=9):
+            ticket[f"{relation}_id"] = row[offset]
+        tickets.append(ticket)
+    return tickets
+
+def _normalized_ticket_list(db: Session, tickets: List[dict]):
+    """Ticket'larda geçen kullanıcıları tek IN sorgusuyla yükleyip users haritası olarak ekle"""
+    user_ids = {
+        ticket[f"{relation}_id"] for ticket in tickets for relation in TICKET_USER_RELATIONS
+    } - {None}
+    users = {}
+    if user_ids:
+        rows = db.execute(
+            select(User.id, User.username, User.email, User.full_name).where(User.id.in_(user_ids))
+        )
+        users = {
+            str(user_id): {"id": user_id, "username": username, "email": email, "full_name": full_name}
+            for user_id, username, email, full_name in rows
+        }
+    return fast_json_response({"tickets": tickets, "users": users})
+
+def _ticket_list_query(db: Session, model, current_user: User, status, priority, category, search):
+    """Ticket listesi sorgusu; model sıcak (Ticket) veya arşiv (ArchivedTicket) tablosu"""
+    query = db.query(model).options(
+        joinedload(model.created_by),
+        joinedload(model.assigned_to),
+        joinedload(model.escalated_to),
+        joinedload(model.last_updated_by)
     )
     
-    # Rol bazlı erişim kontrolü
-    if current_user.is_customer:
-        # Customer sadece kendi ticket'larını görebilir
-        query = query.filter(Ticket.created_by_id == current_user.id)
-    # Agent, Supervisor ve Admin tüm ticket'ları görebilir
+    # Rol bazlı erişim kontrolü (görünmeyen ve silinmiş satırlar hiç okunmaz)
+    query = query.filter(ticket_visibility(current_user, model), ticket_not_deleted(model))
     
     # Filtreler
     if status:
-        query = query.filter(Ticket.status == status)
+        query = query.filter(model.status == status)
     if priority:
-        query = query.filter(Ticket.priority == priority)
+        query = query.filter(model.priority == priority)
     if category:
-        query = query.filter(Ticket.category == category)
+        query = query.filter(model.category == category)
     
     # Arama
     if search:
         search_term = f"%{search}%"
         query = query.filter(
-            (Ticket.title.ilike(search_term)) |
-            (Ticket.description.ilike(search_term))
+            (model.title.ilike(search_term)) |
+            (model.description.ilike(search_term))
         )
     
+    return query
+
+@router.get("/tickets/", response_model=List[TicketResponse])
+@compressible
+async def get_tickets(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[TicketStatus] = Query(None),
+    priority: Optional[TicketPriority] = Query(None),
+    category: Optional[TicketCategory] = Query(None),
+    search: Optional[str] = Query(None, description="Başlık veya açıklamada arama"),
+    include_archived: bool = Query(False, description="Arşivlenmiş kapalı ticket'ları da dahil et"),
+    normalize_users: bool = Query(False, description=NORMALIZE_USERS_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Ticket listesi - Rol bazlı filtreleme"""
+    query = _ticket_list_query(db, Ticket, current_user, status, priority, category, search)
+    
+    # Arşivde sadece kapalı ticket'lar var; başka bir durum istendiyse arşive gitmeye gerek yok
+    include_archived = include_archived and status in (None, TicketStatus.CLOSED)
+    
+    if include_archived:
+        # Her iki tablodan ilk skip+limit kaydı al ve created_at'e göre birleştir
+        window = skip + limit
+        archived_query = _ticket_list_query(db, ArchivedTicket, current_user, status, priority, category, search)
+        if normalize_users:
+            hot = _ticket_ref_rows(db, Ticket, query.whereclause, 0, window)
+            cold = _ticket_ref_rows(db, ArchivedTicket, archived_query.whereclause, 0, window)
+            merged = heapq.merge(hot, cold, key=lambda ticket: ticket["created_at"], reverse=True)
+            return _normalized_ticket_list(db, list(islice(merged, skip, window)))
+        hot = query.order_by(Ticket.created_at.desc()).limit(window).all()
+        cold = archived_query.order_by(ArchivedTicket.created_at.desc()).limit(window).all()
+        merged = heapq.merge(hot, cold, key=lambda ticket: ticket.created_at, reverse=True)
+        return list(islice(merged, skip, window))
+    
+    if normalize_users:
+        return _normalized_ticket_list(db, _ticket_ref_rows(db, Ticket, query.whereclause, skip, limit))
+    
+    if settings.FAST_LIST_SERIALIZATION:
+        return _fast_ticket_list(db, query.whereclause, skip, limit)
+    
     tickets = query.order_by(Ticket.created_at.desc()).offset(skip).limit(limit).all()
     return tickets
 
 @router.get("/tickets/assigned-to-me", response_model=List[TicketResponse])
+@compressible
 async def get_assigned_tickets(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[TicketStatus] = Query(None),
-    db: Session = Depends(get_db),
+    normalize_users: bool = Query(False, description=NORMALIZE_USERS_DESCRIPTION),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_agent_or_above)
 ):
     """Bana atanan ticket'lar - Agent ve üstü"""
     query = db.query(Ticket).filter(
-        Ticket.assigned_to_id == current_user.id
+        Ticket.assigned_to_id == current_user.id,
+        ticket_not_deleted()
     ).options(
         joinedload(Ticket.created_by),
         joinedload(Ticket.assigned_to)
@@ -185,20 +427,29 @@ async def get_assigned_tickets(
     if status:
         query = query.filter(Ticket.status == status)
     
+    if normalize_users:
+        return _normalized_ticket_list(db, _ticket_ref_rows(db, Ticket, query.whereclause, skip, limit))
+    
+    if settings.FAST_LIST_SERIALIZATION:
+        return _fast_ticket_list(db, query.whereclause, skip, limit)
+    
     tickets = query.order_by(Ticket.created_at.desc()).offset(skip).limit(limit).all()
     return tickets
 
 @router.get("/tickets/my-tickets", response_model=List[TicketResponse])
+@compressible
 async def get_my_tickets(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[TicketStatus] = Query(None),
-    db: Session = Depends(get_db),
+    normalize_users: bool = Query(False, description=NORMALIZE_USERS_DESCRIPTION),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Benim oluşturduğum ticket'lar"""
     query = db.query(Ticket).filter(
-        Ticket.created_by_id == current_user.id
+        Ticket.created_by_id == current_user.id,
+        ticket_not_deleted()
     ).options(
         joinedload(Ticket.created_by),
         joinedload(Ticket.assigned_to)
@@ -207,106 +458,526 @@ async def get_my_tickets(
     if status:
         query = query.filter(Ticket.status == status)
     
+    if normalize_users:
+        return _normalized_ticket_list(db, _ticket_ref_rows(db, Ticket, query.whereclause, skip, limit))
+    
+    if settings.FAST_LIST_SERIALIZATION:
+        return _fast_ticket_list(db, query.whereclause, skip, limit)
+    
     tickets = query.order_by(Ticket.created_at.desc()).offset(skip).limit(limit).all()
     return tickets
 
-@router.get("/tickets/{ticket_id}", response_model=TicketResponse)
-async def get_ticket(
+def _ticket_validator_query(db: Session, ticket_id: int, current_user: User, model=Ticket):
+    """Ticket'ın erişim hakkını ve ETag parçalarını tam yükleme yapmadan getir"""
+    # Yanıttaki gömülü kullanıcıların en son güncellenme zamanı
+    related_users_updated = (
+        select(func.max(User.updated_at))
+        .where(User.id.in_([
+            model.created_by_id,
+            model.assigned_to_id,
+            model.escalated_to_id,
+            model.last_updated_by_id
+        ]))
+        .scalar_subquery()
+    )
+    return db.query(
+        model.id,
+        model.version,
+        related_users_updated.label("users_updated_at"),
+        ticket_visibility(current_user, model).label("allowed")
+    ).filter(model.id == ticket_id, ticket_not_deleted(model)).first()
+
+def _require_access(row, detail: str):
+    """
+    Erişim koşulu sorguya "allowed" sütunu olarak eklenir; yetki ve getirme tek
+    ifadede yapılır. Satır yoksa 404, koşul sağlanmıyorsa 403.
+    """
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ticket bulunamadı"
+        )
+    if not row.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+    return row
+
+def _ticket_etag(header) -> str:
+    return compute_versioned_etag(header.version, "ticket", header.id, header.users_updated_at)
+
+TICKET_CONFLICT_DETAIL = "Ticket siz görüntüledikten sonra değiştirildi; güncel hâlini alıp tekrar deneyin"
+
+def _check_if_match(request: Request, ticket: Ticket) -> None:
+    """If-Match ile gelen sürüm yüklenen satırla aynı değilse 412"""
+    versions = if_match_versions(request)
+    if versions is not None and ticket.version not in versions:
+        raise precondition_failed(TICKET_CONFLICT_DETAIL)
+
+def _ticket_changed(ticket: Ticket, owner_before: Optional[int]) -> None:
+    """Commit sonrası bellek içi index'leri (agent yükü, kopya tespiti) güncelle"""
+    assignment_engine.move(owner_before, load_owner(ticket))
+    if settings.DUPLICATE_DETECTION_ENABLED:
+        duplicate_index.update(ticket)
+
+def _find_duplicates(
+    db: Session,
+    title: str,
+    description: str,
+    current_user: User,
+    exclude_id: Optional[int] = None
+) -> List[DuplicateCandidate]:
+    """
+    LSH adaylarını tek sorguda doğrula: kapanmış (başka worker'da veya toplu işlemle)
+    olanlar index'ten düşer; customer sadece kendi ticket'larını görür.
+    """
+    if not settings.DUPLICATE_DETECTION_ENABLED:
+        return []
+    duplicate_index.sync(db)
+    matches = duplicate_index.candidates(title, description, exclude_id=exclude_id)
+    if not matches:
+        return []
+    
+    rows = {
+        row.id: row for row in db.query(
+            Ticket.id, Ticket.title, Ticket.status, Ticket.created_at,
+            ticket_visibility(current_user).label("allowed")
+        ).filter(
+            Ticket.id == _id_array([match.ticket_id for match in matches]),
+            Ticket.status.in_(OPEN_STATUSES),
+            ticket_not_deleted()
+        ).all()
+    }
+    duplicate_index.discard(match.ticket_id for match in matches if match.ticket_id not in rows)
+    
+    duplicates = []
+    for match in matches:
+        row = rows.get(match.ticket_id)
+        if row is None or not row.allowed:
+            continue
+        duplicates.append(DuplicateCandidate(
+            id=row.id,
+            title=row.title,
+            status=row.status.value,
+            created_at=row.created_at,
+            similarity=round(match.similarity, 3)
+        ))
+        if len(duplicates) >= settings.DUPLICATE_MAX_RESULTS:
+            break
+    return duplicates
+
+def _commit_ticket(db: Session, ticket: Ticket, response: Optional[Response] = None) -> None:
+    """
+    Değişiklikleri yaz. UPDATE "WHERE id = :id AND version = :v" ile çalıştığı için
+    arada başka biri güncellediyse satır kilidi tutmadan 412 döner.
+    """
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise precondition_failed(TICKET_CONFLICT_DETAIL)
+    db.refresh(ticket)
+    
+    if response is not None:
+        # Yeni sürümün ETag'i: istemci sonraki güncellemede If-Match olarak gönderebilir
+        related = [getattr(ticket, relation) for relation in TICKET_USER_RELATIONS]
+        users_updated_at = max((user.updated_at for user in related if user is not None), default=None)
+        response.headers["ETag"] = compute_versioned_etag(
+            ticket.version, "ticket", ticket.id, users_updated_at
+        )
+
+def _mutate_ticket(
+    db: Session,
     ticket_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    values: dict,
+    conditions=(),
+    comment: Optional[TicketComment] = None,
+    extra_columns=()
 ):
-    """Belirli bir ticket'ı getir"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).options(
-        joinedload(Ticket.created_by),
-        joinedload(Ticket.assigned_to),
-        joinedload(Ticket.escalated_to),
-        joinedload(Ticket.last_updated_by)
-    ).first()
+    """
+    Durum değişikliğini tek ifadede yap: koşullar (ve If-Match) sağlanıyorsa
+    UPDATE ... RETURNING ile güncelle, otomatik yorumu ekle. Satır kilidi
+    tutulmaz; önceki hâl UPDATE'in "before" ile join'inden RETURNING'de döner.
+    Dönen satırda güncellenmiş sütunlar ile *_before sütunları bulunur; koşul
+    sağlanmadıysa id None'dır ve transaction geri alınır.
+    """
+    before = (
+        select(Ticket.id, Ticket.status, Ticket.assigned_to_id, Ticket.version)
+        .where(Ticket.id == ticket_id, ticket_not_deleted())
+        .cte("before")
+    )
     
-    if not ticket:
+    versions = if_match_versions(request)
+    if versions is not None:
+        conditions = (*conditions, Ticket.version.in_(versions))
+    
+    updated = (
+        update(Ticket)
+        .where(Ticket.id == before.c.id, *conditions)
+        .values(**values, version=Ticket.version + 1)
+        .returning(
+            *Ticket.__table__.columns,
+            before.c.status.label("status_before"),
+            before.c.assigned_to_id.label("assigned_to_id_before")
+        )
+        .cte("updated")
+    )
+    
+    # before'a outer join: ticket yoksa satır dönmez (404), koşul sağlanmadıysa id None
+    statement = select(
+        before.c.version.label("version_before"),
+        *extra_columns,
+        *updated.c
+    ).select_from(before.outerjoin(updated, updated.c.id == before.c.id))
+    
+    if comment is not None:
+        # Yorum sadece güncelleme gerçekleştiyse eklenir
+        statement = statement.add_cte(
+            insert(TicketComment).from_select(
+                ["ticket_id", "user_id", "content", "is_internal"],
+                select(
+                    updated.c.id,
+                    literal(comment.user_id),
+                    literal(comment.content),
+                    literal(comment.is_internal)
+                )
+            ).returning(TicketComment.id).cte("comment")
+        )
+    
+    row = db.execute(statement).first()
+    if row is None:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket bulunamadı"
         )
+    if row.id is None:
+        db.rollback()
+        if versions is not None and row.version_before not in versions:
+            raise precondition_failed(TICKET_CONFLICT_DETAIL)
+    return row
+
+def _mutation_response(db: Session, row, current_user: User, response: Response) -> TicketResponse:
+    """
+    _mutate_ticket sonrası: yanıttaki kullanıcıları tek sorguda yükle, commit et,
+    ETag'i ve bellek içi index'leri güncelle. Yanıt commit'ten önce kurulur;
+    commit yüklü nesneleri expire ettiği için sonrasında okunan her alan
+    kullanıcı başına ayrı bir SELECT'e dönüşürdü.
+    """
+    user_ids = {getattr(row, f"{relation}_id") for relation in TICKET_USER_RELATIONS} - {None}
+    users = {current_user.id: current_user}
+    missing = user_ids - users.keys()
+    if missing:
+        users.update((user.id, user) for user in db.query(User).filter(User.id.in_(missing)))
+    
+    related = {relation: users.get(getattr(row, f"{relation}_id")) for relation in TICKET_USER_RELATIONS}
+    users_updated_at = max((user.updated_at for user in related.values() if user is not None), default=None)
+    result = TicketResponse.model_validate({
+        **{field: getattr(row, field) for field in TicketResponse.model_fields if field not in related},
+        **{relation: user and UserResponseSimple.model_validate(user) for relation, user in related.items()}
+    })
     
-    # Rol bazlı erişim kontrolü
-    can_access = False
-    
-    if current_user.is_supervisor or current_user.is_system_admin:
-        # Supervisor ve Admin tüm ticket'lara erişebilir
-        can_access = True
-    elif current_user.is_agent:
-        # Agent kendi oluşturduğu veya atanan ticket'lara erişebilir
-        can_access = (ticket.created_by_id == current_user.id or 
-                     ticket.assigned_to_id == current_user.id)
-    elif current_user.is_customer:
-        # Customer sadece kendi oluşturduğu ticket'lara erişebilir
-        can_access = (ticket.created_by_id == current_user.id)
-    
-    if not can_access:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Bu ticket'a erişim yetkiniz yok"
-        )
+    db.commit()
+    response.headers["ETag"] = compute_versioned_etag(row.version, "ticket", row.id, users_updated_at)
+    
+    owner_before = row.assigned_to_id_before if row.status_before in OPEN_STATUSES else None
+    _ticket_changed(row, owner_before)
+    
+    return result
+
+@router.get("/tickets/{ticket_id}", response_model=TicketResponse)
+async def get_ticket(
+    ticket_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Belirli bir ticket'ı getir (sıcak tabloda yoksa arşivden)"""
+    model = Ticket
+    header = _ticket_validator_query(db, ticket_id, current_user)
+    if not header:
+        model = ArchivedTicket
+        header = _ticket_validator_query(db, ticket_id, current_user, ArchivedTicket)
+    
+    _require_access(header, "Bu ticket'a erişim yetkiniz yok")
+    
+    # İstemcideki kopya güncelse yanıtı yeniden oluşturma
+    cached = conditional_response(request, response, _ticket_etag(header))
+    if cached is not None:
+        return cached
+    
+    ticket = db.query(model).filter(model.id == ticket_id).options(
+        joinedload(model.created_by),
+        joinedload(model.assigned_to),
+        joinedload(model.escalated_to),
+        joinedload(model.last_updated_by)
+    ).first()
     
     return ticket
 
-@router.post("/tickets/", response_model=TicketResponse)
+def _parse_attachments(raw: Optional[str]) -> List[Dict[str, Any]]:
+    """attachment_urls sütunundaki JSON listesini çöz (bozuksa boş liste)"""
+    if not raw:
+        return []
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return []
+
+def _ticket_capabilities(ticket, current_user: User, editable: bool) -> TicketCapabilities:
+    """Kullanıcının ticket üzerindeki yetkileri; ek sorgu yapmadan yüklü satırdan hesaplanır"""
+    is_staff = not current_user.is_customer
+    is_lead = current_user.is_supervisor or current_user.is_system_admin
+    archived = isinstance(ticket, ArchivedTicket)
+    return TicketCapabilities(
+        can_edit=editable and not archived,
+        can_comment=not archived,
+        can_add_internal_note=is_staff and not archived,
+        can_upload_attachments=not archived,
+        can_assign=is_lead and not archived,
+        can_escalate=is_staff and not archived,
+        can_resolve=is_staff and (is_lead or ticket.assigned_to_id == current_user.id) and not archived,
+        can_close=is_lead and ticket.status == TicketStatus.RESOLVED and not archived,
+        can_reopen=is_staff and ticket.status in (TicketStatus.CLOSED, TicketStatus.RESOLVED) and not archived,
+        can_delete=current_user.is_system_admin and not archived
+    )
+
+@router.get("/tickets/{ticket_id}/full", response_model=TicketFullResponse)
+@compressible
+async def get_ticket_full(
+    ticket_id: int,
+    comment_limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Ticket sayfası için tek istek: ticket, görünür yorumların ilk sayfası, dosyalar
+    ve kullanıcının yetkileri. Erişim ticket'la aynı sorguda bir kez kontrol edilir;
+    toplam iki sorgu (arşivdeki ticket için üç).
+    """
+    model, comment_model = Ticket, TicketComment
+    row = _ticket_full_query(db, model, ticket_id, current_user)
+    if row is None:
+        model, comment_model = ArchivedTicket, ArchivedTicketComment
+        row = _ticket_full_query(db, model, ticket_id, current_user)
+    ticket = _require_access(row, "Bu ticket'a erişim yetkiniz yok")[0]
+    
+    comments = db.query(comment_model).filter(
+        comment_model.ticket_id == ticket_id,
+        comment_visibility(current_user, comment_model)
+    ).options(
+        joinedload(comment_model.user)
+    ).order_by(
+        comment_model.created_at.asc(),
+        comment_model.id.asc()
+    ).limit(comment_limit + 1).all()
+    
+    next_cursor = None
+    if len(comments) > comment_limit:
+        comments = comments[:comment_limit]
+        next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+    
+    return TicketFullResponse(
+        ticket=TicketResponse.model_validate(ticket),
+        comments=[CommentResponse.model_validate(comment) for comment in comments],
+        next_comments_cursor=next_cursor,
+        attachments=_parse_attachments(ticket.attachment_urls),
+        capabilities=_ticket_capabilities(ticket, current_user, row.editable)
+    )
+
+def _ticket_full_query(db: Session, model, ticket_id: int, current_user: User):
+    return db.query(
+        model,
+        ticket_visibility(current_user, model).label("allowed"),
+        ticket_editability(current_user, model).label("editable")
+    ).filter(model.id == ticket_id, ticket_not_deleted(model)).options(
+        joinedload(model.created_by),
+        joinedload(model.assigned_to),
+        joinedload(model.escalated_to),
+        joinedload(model.last_updated_by)
+    ).first()
+
+@router.post("/tickets/", response_model=TicketCreateResponse)
 async def create_ticket(
     ticket_create: TicketCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
-    """Yeni ticket oluştur"""
+    """
+    Yeni ticket oluştur (açıksa kategoriye bakan en az yüklü agent'a otomatik atanır).
+    Idempotency-Key ile tekrarlanan istek yeni ticket açmaz, ilk yanıtı döner.
+    """
+    claim = await claim_idempotency_key(db, idempotency_key, current_user.id, "tickets.create", ticket_create)
+    if claim and claim.replay:
+        return claim.replay
+    
+    try:
+        result = _insert_ticket(db, ticket_create, current_user)
+    except Exception:
+        if claim:
+            claim.release(db)
+        raise
+    
+    if claim:
+        claim.complete(db, result)
+    return result
+
+def _insert_ticket(db: Session, ticket_create: TicketCreate, current_user: User) -> TicketCreateResponse:
+    assigned_to_id = None
+    if settings.AUTO_ASSIGN_ENABLED:
+        assigned_to_id = assignment_engine.choose(db, ticket_create.category)
+    
     new_ticket = Ticket(
         title=ticket_create.title,
         description=ticket_create.description,
         priority=ticket_create.priority,
         category=ticket_create.category,
         created_by_id=current_user.id,
-        status=TicketStatus.OPEN,
+        assigned_to_id=assigned_to_id,
+        # Tekil atamadaki gibi atanan ticket IN_PROGRESS olur
+        status=TicketStatus.IN_PROGRESS if assigned_to_id else TicketStatus.OPEN,
         last_updated_by_id=current_user.id
     )
     
     db.add(new_ticket)
-    db.commit()
+    try:
+        db.commit()
+    except Exception:
+        assignment_engine.release(assigned_to_id)
+        raise
     db.refresh(new_ticket)
     
-    return new_ticket
+    # Aynı sorunu bildiren açık ticket'lar (ör. kesinti sırasında)
+    result = TicketCreateResponse.model_validate(new_ticket)
+    result.possible_duplicates = _find_duplicates(
+        db, new_ticket.title, new_ticket.description, current_user, exclude_id=new_ticket.id
+    )
+    if settings.DUPLICATE_DETECTION_ENABLED:
+        duplicate_index.update(new_ticket)
+    
+    return result
+
+@router.post("/tickets/duplicates/check", response_model=List[DuplicateCandidate])
+async def check_duplicate_tickets(
+    check: DuplicateCheck,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Ticket açmadan önce benzer açık ticket'ları getir"""
+    return _find_duplicates(db, check.title, check.description, current_user)
+
+TICKET_TITLE_MAX_LENGTH = Ticket.__table__.c.title.type.length
+
+def _validate_batch_item(raw: Dict[str, Any]):
+    """Öğeyi TicketCreate olarak doğrula; (ticket, None) veya (None, hata) döner"""
+    try:
+        ticket_create = TicketCreate.model_validate(raw)
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        field = ".".join(str(part) for part in error["loc"])
+        return None, f"{field}: {error['msg']}"
+    if not ticket_create.title.strip():
+        return None, "Başlık boş olamaz"
+    if len(ticket_create.title) > TICKET_TITLE_MAX_LENGTH:
+        return None, f"Başlık en fazla {TICKET_TITLE_MAX_LENGTH} karakter olabilir"
+    return ticket_create, None
+
+@router.post("/tickets/batch", response_model=TicketBatchResponse)
+async def create_tickets_batch(
+    batch: TicketBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
+):
+    """
+    Entegrasyonlar için toplu ticket oluşturma. Geçerli öğeler tek transaction'da
+    çok satırlı INSERT ... RETURNING ile yazılır; sonuçlar istek sırasıyla döner.
+    """
+    claim = await claim_idempotency_key(db, idempotency_key, current_user.id, "tickets.batch", batch)
+    if claim and claim.replay:
+        return claim.replay
+    
+    try:
+        result = _insert_ticket_batch(db, batch, current_user)
+    except Exception:
+        if claim:
+            claim.release(db)
+        raise
+    
+    if claim:
+        claim.complete(db, result)
+    return result
+
+def _insert_ticket_batch(db: Session, batch: TicketBatchCreate, current_user: User) -> TicketBatchResponse:
+    results: List[Optional[TicketBatchResult]] = [None] * len(batch.tickets)
+    rows = []
+    positions = []
+    
+    for index, raw in enumerate(batch.tickets):
+        ticket_create, error = _validate_batch_item(raw)
+        if error:
+            results[index] = TicketBatchResult(index=index, success=False, detail=error)
+            continue
+        
+        assigned_to_id = None
+        if settings.AUTO_ASSIGN_ENABLED:
+            assigned_to_id = assignment_engine.choose(db, ticket_create.category)
+        rows.append({
+            "title": ticket_create.title,
+            "description": ticket_create.description,
+            "priority": ticket_create.priority,
+            "category": ticket_create.category,
+            "created_by_id": current_user.id,
+            "assigned_to_id": assigned_to_id,
+            "status": TicketStatus.IN_PROGRESS if assigned_to_id else TicketStatus.OPEN,
+            "last_updated_by_id": current_user.id
+        })
+        positions.append(index)
+    
+    created = []
+    if rows:
+        # insertmanyvalues: satırlar çok satırlı VALUES partileriyle gider, RETURNING parametre sırasıyla gelir
+        try:
+            created = db.execute(
+                insert(Ticket).returning(
+                    Ticket.id, Ticket.title, Ticket.description, Ticket.status,
+                    sort_by_parameter_order=True
+                ),
+                rows
+            ).all()
+            db.commit()
+        except Exception:
+            db.rollback()
+            for row in rows:
+                assignment_engine.release(row["assigned_to_id"])
+            raise
+    
+    for index, ticket in zip(positions, created):
+        results[index] = TicketBatchResult(index=index, ticket_id=ticket.id, success=True)
+        if settings.DUPLICATE_DETECTION_ENABLED:
+            duplicate_index.update(ticket)
+    
+    return TicketBatchResponse(
+        created=len(created),
+        failed=len(batch.tickets) - len(created),
+        results=results
+    )
 
 @router.put("/tickets/{ticket_id}", response_model=TicketResponse)
 async def update_ticket(
     ticket_id: int,
     ticket_update: TicketUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Ticket güncelle"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket bulunamadı"
-        )
-    
-    # Rol bazlı güncelleme kontrolü
-    can_update = False
-    
-    if current_user.is_system_admin:
-        # Admin her şeyi güncelleyebilir
-        can_update = True
-    elif current_user.is_supervisor:
-        # Supervisor tüm ticket'ları güncelleyebilir
-        can_update = True
-    elif current_user.is_agent:
-        # Agent kendi oluşturduğu veya atanan ticket'ları güncelleyebilir
-        can_update = (ticket.created_by_id == current_user.id or 
-                     ticket.assigned_to_id == current_user.id)
-    elif current_user.is_customer:
-        # Customer sadece kendi ticket'ının bazı alanlarını güncelleyebilir
-        can_update = (ticket.created_by_id == current_user.id)
+    if current_user.is_customer:
         # Customer sadece title, description güncelleyebilir
         allowed_fields = ['title', 'description']
         for field in ticket_update.dict(exclude_unset=True).keys():
@@ -316,11 +987,15 @@ async def update_ticket(
                     detail=f"'{field}' alanını güncelleme yetkiniz yok"
                 )
     
-    if not can_update:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Bu ticket'ı güncelleme yetkiniz yok"
-        )
+    # Rol bazlı güncelleme kontrolü ticket'la aynı sorguda
+    ticket = _require_access(
+        db.query(Ticket, ticket_editability(current_user).label("allowed"))
+        .filter(Ticket.id == ticket_id, ticket_not_deleted()).first(),
+        "Bu ticket'ı güncelleme yetkiniz yok"
+    ).Ticket
+    
+    _check_if_match(request, ticket)
+    owner_before = load_owner(ticket)
     
     # Güncelleme işlemi
     for field, value in ticket_update.dict(exclude_unset=True).items():
@@ -329,8 +1004,8 @@ async def update_ticket(
     
     ticket.last_updated_by_id = current_user.id
     
-    db.commit()
-    db.refresh(ticket)
+    _commit_ticket(db, ticket, response)
+    _ticket_changed(ticket, owner_before)
     
     return ticket
 
@@ -338,11 +1013,13 @@ async def update_ticket(
 async def assign_ticket(
     ticket_id: int,
     assign_data: TicketAssign,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_supervisor_or_admin)
 ):
     """Ticket atama - Supervisor ve Admin"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = db.query(Ticket).filter(Ticket.id == ticket_id, ticket_not_deleted()).first()
     
     if not ticket:
         raise HTTPException(
@@ -350,8 +1027,14 @@ async def assign_ticket(
             detail="Ticket bulunamadı"
         )
     
+    _check_if_match(request, ticket)
+    owner_before = load_owner(ticket)
+    
     # Atanacak kullanıcıyı kontrol et
-    assigned_user = db.query(User).filter(User.id == assign_data.assigned_to_id).first()
+    assigned_user = db.query(User).filter(
+        User.id == assign_data.assigned_to_id,
+        User.deleted_at.is_(None)
+    ).first()
     if not assigned_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -365,73 +1048,120 @@ async def assign_ticket(
     if ticket.status == TicketStatus.OPEN:
         ticket.status = TicketStatus.IN_PROGRESS
     
-    db.commit()
-    db.refresh(ticket)
+    _commit_ticket(db, ticket, response)
+    _ticket_changed(ticket, owner_before)
     
     return ticket
 
 @router.delete("/tickets/{ticket_id}")
 async def delete_ticket(
     ticket_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    """Ticket silme - Sadece Admin"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    """
+    Ticket silme - Sadece Admin. Tek UPDATE ile silinmiş olarak işaretlenir ve
+    hemen görünmez olur; satır ve yorumları arka plandaki purge ile partiler
+    hâlinde kalıcı silinir (istek süresi yorum sayısından bağımsızdır).
+    """
+    conditions = [Ticket.id == ticket_id, ticket_not_deleted()]
+    versions = if_match_versions(request)
+    if versions is not None:
+        conditions.append(Ticket.version.in_(versions))
+    
+    deleted = db.execute(
+        update(Ticket)
+        .where(*conditions)
+        .values(deleted_at=func.now(), last_updated_by_id=current_user.id, version=Ticket.version + 1)
+        .returning(Ticket.status, Ticket.assigned_to_id)
+        .execution_options(synchronize_session=False)
+    ).first()
     
-    if not ticket:
+    if deleted is None:
+        db.rollback()
+        if versions is not None and db.query(Ticket.id).filter(Ticket.id == ticket_id, ticket_not_deleted()).first():
+            raise precondition_failed(TICKET_CONFLICT_DETAIL)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket bulunamadı"
         )
     
-    db.delete(ticket)
     db.commit()
+    assignment_engine.move(load_owner(deleted), None)
+    duplicate_index.discard([ticket_id])
     
     return {"message": "Ticket başarıyla silindi"}
 
 # Ticket Comments Endpoints
 
 @router.get("/tickets/{ticket_id}/comments", response_model=List[CommentResponse])
+@compressible
 async def get_ticket_comments(
     ticket_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki X-Next-Cursor değeri"),
+    since: Optional[datetime] = Query(None, description="Sadece bu zamandan sonra eklenen yorumlar"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Ticket yorumlarını getir"""
-    # Ticket'ın var olup olmadığını ve erişim kontrolünü yap
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    """Ticket yorumlarını getir - (created_at, id) üzerinden cursor sayfalama"""
+    # Ticket'ın var olup olmadığını ve erişim kontrolünü yap (arşivlenmişse yorumları da arşivde)
+    comment_model = TicketComment
+    ticket = db.query(Ticket.id, ticket_visibility(current_user).label("allowed")).filter(
+        Ticket.id == ticket_id,
+        ticket_not_deleted()
+    ).first()
     if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket bulunamadı"
-        )
+        comment_model = ArchivedTicketComment
+        ticket = db.query(
+            ArchivedTicket.id, ticket_visibility(current_user, ArchivedTicket).label("allowed")
+        ).filter(ArchivedTicket.id == ticket_id).first()
+    _require_access(ticket, "Bu ticket'ın yorumlarına erişim yetkiniz yok")
+    
+    # Yorumları getir - (ticket_id, created_at, id) index'i üzerinden sıralı okuma
+    query = db.query(comment_model).filter(
+        comment_model.ticket_id == ticket_id,
+        comment_visibility(current_user, comment_model)
+    ).options(
+        joinedload(comment_model.user)
+    )
     
-    # Erişim kontrolü
-    can_access = False
-    if current_user.is_supervisor or current_user.is_system_admin:
-        can_access = True
-    elif current_user.is_agent:
-        can_access = True  # Agent tüm ticket'ları görebilir
-    elif current_user.is_customer:
-        can_access = (ticket.created_by_id == current_user.id)
+    if since:
+        query = query.filter(comment_model.created_at > since)
     
-    if not can_access:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Bu ticket'ın yorumlarına erişim yetkiniz yok"
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(comment_model.created_at, comment_model.id) > tuple_(cursor_created_at, cursor_id)
         )
     
-    # Yorumları getir
-    query = db.query(TicketComment).filter(TicketComment.ticket_id == ticket_id).options(
-        joinedload(TicketComment.user)
+    # Bir fazla satır okuyarak sonraki sayfa olup olmadığını anla
+    comments = query.order_by(
+        comment_model.created_at.asc(),
+        comment_model.id.asc()
+    ).limit(limit + 1).all()
+    
+    # Doğrulayıcı sadece bu sayfanın satırlarından üretilir; maliyet thread
+    # boyutuna değil sayfa boyutuna bağlıdır
+    etag = compute_etag(
+        "comments", ticket_id, current_user.is_customer, limit, cursor, since,
+        *(
+            part for comment in comments
+            for part in (comment.id, comment.updated_at, comment.user.updated_at if comment.user else None)
+        )
     )
+    cached = conditional_response(request, response, etag)
+    if cached is not None:
+        return cached
     
-    # Customer'lar internal notları göremez
-    if current_user.is_customer:
-        query = query.filter(TicketComment.is_internal == False)
+    if len(comments) > limit:
+        comments = comments[:limit]
+        last = comments[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
     
-    comments = query.order_by(TicketComment.created_at.asc()).all()
     return comments
 
 @router.post("/tickets/{ticket_id}/comments", response_model=CommentResponse)
@@ -439,31 +1169,34 @@ async def create_ticket_comment(
     ticket_id: int,
     comment_data: CommentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
-    """Ticket'a yorum ekle"""
-    # Ticket'ın var olup olmadığını kontrol et
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket bulunamadı"
-        )
-    
-    # Erişim kontrolü
-    can_comment = False
-    if current_user.is_supervisor or current_user.is_system_admin:
-        can_comment = True
-    elif current_user.is_agent:
-        can_comment = True
-    elif current_user.is_customer:
-        can_comment = (ticket.created_by_id == current_user.id)
-    
-    if not can_comment:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Bu ticket'a yorum ekleme yetkiniz yok"
-        )
+    """Ticket'a yorum ekle (Idempotency-Key ile tekrarlanan istek ikinci yorum eklemez)"""
+    claim = await claim_idempotency_key(
+        db, idempotency_key, current_user.id, f"tickets.{ticket_id}.comment", comment_data
+    )
+    if claim and claim.replay:
+        return claim.replay
+    
+    try:
+        result = CommentResponse.model_validate(_insert_comment(db, ticket_id, comment_data, current_user))
+    except Exception:
+        if claim:
+            claim.release(db)
+        raise
+    
+    if claim:
+        claim.complete(db, result)
+    return result
+
+def _insert_comment(db: Session, ticket_id: int, comment_data: CommentCreate, current_user: User) -> TicketComment:
+    # Ticket'ın varlığı ve erişim kontrolü tek sorguda
+    _require_access(
+        db.query(Ticket.id, ticket_visibility(current_user).label("allowed"))
+        .filter(Ticket.id == ticket_id, ticket_not_deleted()).first(),
+        "Bu ticket'a yorum ekleme yetkiniz yok"
+    )
     
     # Customer'lar internal note ekleyemez
     if current_user.is_customer and comment_data.is_internal:
@@ -482,8 +1215,14 @@ async def create_ticket_comment(
     
     db.add(new_comment)
     
-    # Ticket'ın son güncelleme bilgisini güncelle
-    ticket.last_updated_by_id = current_user.id
+    # Ticket'ın son güncelleme bilgisini güncelle. Yorum eklemek eşzamanlı
+    # güncellemelerle çakışmamalı; sürüm koşulsuz artırılır (ETag değişir)
+    db.execute(
+        update(Ticket)
+        .where(Ticket.id == ticket_id)
+        .values(last_updated_by_id=current_user.id, version=Ticket.version + 1)
+        .execution_options(synchronize_session=False)
+    )
     
     db.commit()
     db.refresh(new_comment)
@@ -502,33 +1241,12 @@ async def create_ticket_comment(
 async def escalate_ticket(
     ticket_id: int,
     escalate_data: TicketEscalate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_agent_or_above)
 ):
     """Ticket'ı üst seviyeye yükselt - Agent ve üstü"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket bulunamadı"
-        )
-    
-    # Yükseltilecek kullanıcıyı kontrol et
-    escalated_user = db.query(User).filter(User.id == escalate_data.escalated_to_id).first()
-    if not escalated_user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Yükseltilecek kullanıcı bulunamadı"
-        )
-    
-    # Yükseltme yetkisi kontrolü
-    if current_user.is_agent and not (escalated_user.is_supervisor or escalated_user.is_system_admin):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Agent sadece supervisor veya admin'e yükseltebilir"
-        )
-    
     # Kendi kendine yükseltme kontrolü
     if escalate_data.escalated_to_id == current_user.id:
         raise HTTPException(
@@ -536,147 +1254,297 @@ async def escalate_ticket(
             detail="Ticket'ı kendinize yükseltemezsiniz"
         )
     
-    # Ticket'ı güncelle
-    ticket.escalated_to_id = escalate_data.escalated_to_id
-    ticket.last_updated_by_id = current_user.id
-    ticket.status = TicketStatus.WAITING  # Yükseltilen ticket'lar bekleme durumunda
-    
-    # Yükseltme nedeni için otomatik yorum ekle
-    escalation_comment = TicketComment(
-        ticket_id=ticket_id,
-        user_id=current_user.id,
-        content=f"🔺 Ticket yükseltildi: {escalate_data.escalation_reason}",
-        is_internal=True
+    # Yükseltilecek kullanıcı ve rolü güncellemeyle aynı ifadede kontrol edilir
+    # Silinmiş kullanıcılar yükseltme hedefi olamaz
+    escalated_user = select(User.id).where(
+        User.id == escalate_data.escalated_to_id,
+        User.deleted_at.is_(None)
+    )
+    escalated_role = (
+        select(Role.name)
+        .join(User, User.role_id == Role.id)
+        .where(User.id == escalate_data.escalated_to_id, User.deleted_at.is_(None))
+        .scalar_subquery()
+    )
+    conditions = [exists(escalated_user)]
+    if current_user.is_agent:
+        # Agent sadece supervisor veya admin'e yükseltebilir
+        conditions.append(escalated_role.in_(["supervisor", "admin"]))
+    
+    row = _mutate_ticket(
+        db, ticket_id, request,
+        values={
+            "escalated_to_id": escalate_data.escalated_to_id,
+            "last_updated_by_id": current_user.id,
+            "status": TicketStatus.WAITING  # Yükseltilen ticket'lar bekleme durumunda
+        },
+        conditions=conditions,
+        # Yükseltme nedeni için otomatik yorum ekle
+        comment=TicketComment(
+            user_id=current_user.id,
+            content=f"🔺 Ticket yükseltildi: {escalate_data.escalation_reason}",
+            is_internal=True
+        ),
+        extra_columns=[exists(escalated_user).label("escalated_exists")]
     )
     
-    db.add(escalation_comment)
-    db.commit()
-    db.refresh(ticket)
+    if row.id is None:
+        if not row.escalated_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Yükseltilecek kullanıcı bulunamadı"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Agent sadece supervisor veya admin'e yükseltebilir"
+        )
     
-    return ticket
+    return _mutation_response(db, row, current_user, response)
 
 
 @router.put("/tickets/{ticket_id}/resolve", response_model=TicketResponse)
 async def resolve_ticket(
     ticket_id: int,
     resolve_data: TicketResolve,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_agent_or_above)
 ):
     """Ticket'ı çöz - Agent ve üstü"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket bulunamadı"
-        )
-    
     # Sadece atanmış kişi veya üst seviye çözebilir
-    can_resolve = (
-        current_user.is_supervisor or 
-        current_user.is_system_admin or 
-        ticket.assigned_to_id == current_user.id
+    conditions = []
+    if not (current_user.is_supervisor or current_user.is_system_admin):
+        conditions.append(Ticket.assigned_to_id == current_user.id)
+    
+    row = _mutate_ticket(
+        db, ticket_id, request,
+        values={
+            "resolution": resolve_data.resolution,
+            "status": resolve_data.status,
+            "last_updated_by_id": current_user.id
+        },
+        conditions=conditions,
+        # Çözüm için otomatik yorum ekle
+        comment=TicketComment(
+            user_id=current_user.id,
+            content=f"✅ Ticket çözüldü: {resolve_data.resolution}",
+            is_internal=False  # Müşteri de görebilir
+        )
     )
     
-    if not can_resolve:
+    if row.id is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Bu ticket'ı çözme yetkiniz yok"
         )
     
-    # Ticket'ı çöz
-    ticket.resolution = resolve_data.resolution
-    ticket.status = resolve_data.status
-    ticket.last_updated_by_id = current_user.id
-    
-    # Çözüm için otomatik yorum ekle
-    resolution_comment = TicketComment(
-        ticket_id=ticket_id,
-        user_id=current_user.id,
-        content=f"✅ Ticket çözüldü: {resolve_data.resolution}",
-        is_internal=False  # Müşteri de görebilir
-    )
-    
-    db.add(resolution_comment)
-    db.commit()
-    db.refresh(ticket)
-    
-    return ticket
+    return _mutation_response(db, row, current_user, response)
 
 
 @router.put("/tickets/{ticket_id}/close", response_model=TicketResponse)
 async def close_ticket(
     ticket_id: int,
     close_data: TicketClose,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_supervisor_or_admin)
 ):
     """Ticket'ı kapat - Supervisor ve Admin"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket bulunamadı"
+    # Kapatma notu varsa yorum ekle
+    closing_comment = None
+    if close_data.closing_note:
+        closing_comment = TicketComment(
+            user_id=current_user.id,
+            content=f"🔒 Ticket kapatıldı: {close_data.closing_note}",
+            is_internal=True
         )
     
     # Sadece çözülmüş ticket'lar kapatılabilir
-    if ticket.status != TicketStatus.RESOLVED:
+    row = _mutate_ticket(
+        db, ticket_id, request,
+        values={"status": TicketStatus.CLOSED, "last_updated_by_id": current_user.id},
+        conditions=[Ticket.status == TicketStatus.RESOLVED],
+        comment=closing_comment
+    )
+    
+    if row.id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Sadece çözülmüş ticket'lar kapatılabilir"
         )
     
-    # Ticket'ı kapat
-    ticket.status = TicketStatus.CLOSED
-    ticket.last_updated_by_id = current_user.id
+    return _mutation_response(db, row, current_user, response)
+
+
+# ============= TOPLU İŞLEMLER =============
+
+MAX_BULK_TICKETS = 5000
+
+BULK_COMMENT_PREFIXES = {
+    BulkTicketAction.ASSIGN: "👤 Ticket toplu atandı",
+    BulkTicketAction.CLOSE: "🔒 Ticket kapatıldı",
+    BulkTicketAction.PRIORITY: "⚡ Ticket önceliği değiştirildi",
+}
+
+def _id_array(ids: List[int]):
+    """id listesini tek bir PostgreSQL dizi parametresi olarak bağla (id = ANY(:ids))"""
+    return any_(bindparam("ticket_ids", list(ids), type_=ARRAY(Integer)))
+
+@router.post("/tickets/bulk", response_model=BulkTicketResponse)
+async def bulk_ticket_operation(
+    operation: BulkTicketOperation,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_supervisor_or_admin)
+):
+    """Toplu ticket işlemi (atama, kapatma, öncelik) - Supervisor ve Admin"""
+    if (operation.ticket_ids is None) == (operation.filter is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ticket_ids veya filter alanlarından yalnızca biri verilmelidir"
+        )
     
-    # Kapatma notu varsa yorum ekle
-    if close_data.closing_note:
-        closing_comment = TicketComment(
-            ticket_id=ticket_id,
-            user_id=current_user.id,
-            content=f"🔒 Ticket kapatıldı: {close_data.closing_note}",
-            is_internal=True
+    # Hedef ticket id'lerini belirle
+    if operation.ticket_ids is not None:
+        ticket_ids = list(dict.fromkeys(operation.ticket_ids))
+    else:
+        query = db.query(Ticket.id).filter(ticket_not_deleted())
+        if operation.filter.status:
+            query = query.filter(Ticket.status == operation.filter.status)
+        if operation.filter.priority:
+            query = query.filter(Ticket.priority == operation.filter.priority)
+        if operation.filter.category:
+            query = query.filter(Ticket.category == operation.filter.category)
+        if operation.filter.assigned_to_id:
+            query = query.filter(Ticket.assigned_to_id == operation.filter.assigned_to_id)
+        ticket_ids = [row.id for row in query.order_by(Ticket.id).limit(MAX_BULK_TICKETS).all()]
+    
+    if not ticket_ids:
+        return BulkTicketResponse(action=operation.action, updated=0, failed=0, results=[])
+    
+    # Toplu UPDATE ORM sürüm kontrolünü atlar; sürüm elle artırılır ki açık ETag'ler geçersizleşsin
+    values = {"last_updated_by_id": current_user.id, "version": Ticket.version + 1}
+    conditions = [Ticket.id == _id_array(ticket_ids), ticket_not_deleted()]
+    failure_detail = "Ticket bulunamadı"
+    
+    if operation.action == BulkTicketAction.ASSIGN:
+        if not operation.assigned_to_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Atama için assigned_to_id gereklidir"
+            )
+        assignee = db.query(User.id, Role.name.label("role_name")).outerjoin(
+            Role, User.role_id == Role.id
+        ).filter(
+            User.id == operation.assigned_to_id,
+            User.deleted_at.is_(None)
+        ).first()
+        if not assignee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Atanacak kullanıcı bulunamadı"
+            )
+        # Ticket'lar müşterilere atanamaz
+        if assignee.role_name not in ("agent", "supervisor", "admin"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Ticket'lar sadece agent, supervisor veya admin'e atanabilir"
+            )
+        values["assigned_to_id"] = operation.assigned_to_id
+        # Tekil atamadaki gibi OPEN ticket'lar IN_PROGRESS olur
+        values["status"] = case(
+            (Ticket.status == TicketStatus.OPEN, literal(TicketStatus.IN_PROGRESS, Ticket.status.type)),
+            else_=Ticket.status
         )
-        db.add(closing_comment)
+    elif operation.action == BulkTicketAction.CLOSE:
+        # Sadece çözülmüş ticket'lar kapatılabilir
+        values["status"] = TicketStatus.CLOSED
+        conditions.append(Ticket.status == TicketStatus.RESOLVED)
+        failure_detail = "Sadece çözülmüş ticket'lar kapatılabilir"
+    elif operation.action == BulkTicketAction.PRIORITY:
+        if not operation.priority:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Öncelik değişikliği için priority gereklidir"
+            )
+        values["priority"] = operation.priority
+    
+    # Tek UPDATE ... WHERE id = ANY(:ids) RETURNING id
+    updated_ids = set(db.execute(
+        update(Ticket)
+        .where(*conditions)
+        .values(**values)
+        .returning(Ticket.id)
+        .execution_options(synchronize_session=False)
+    ).scalars())
+    
+    # Güncellenmeyenlerin var olup olmadığını tek sorguda ayırt et
+    missing_ids = [ticket_id for ticket_id in ticket_ids if ticket_id not in updated_ids]
+    existing_ids = set()
+    if missing_ids:
+        existing_ids = {
+            row.id for row in db.query(Ticket.id).filter(
+                Ticket.id == _id_array(missing_ids),
+                ticket_not_deleted()
+            ).all()
+        }
+    
+    # Sistem yorumlarını tek çok satırlı INSERT ile yaz
+    if operation.note and updated_ids:
+        content = f"{BULK_COMMENT_PREFIXES[operation.action]}: {operation.note}"
+        db.execute(insert(TicketComment).values([
+            {
+                "ticket_id": ticket_id,
+                "user_id": current_user.id,
+                "content": content,
+                "is_internal": True
+            }
+            for ticket_id in ticket_ids if ticket_id in updated_ids
+        ]))
     
     db.commit()
-    db.refresh(ticket)
     
-    return ticket
+    # Toplu atama/kapatma agent yüklerini değiştirir; index bir sonraki seçimde yeniden kurulur
+    if updated_ids and operation.action in (BulkTicketAction.ASSIGN, BulkTicketAction.CLOSE):
+        assignment_engine.invalidate()
+    # Kapanan ticket'lar tekil kapatmadaki gibi kopya index'inden hemen çıkar
+    if updated_ids and operation.action == BulkTicketAction.CLOSE and settings.DUPLICATE_DETECTION_ENABLED:
+        duplicate_index.discard(updated_ids)
+    
+    results = []
+    for ticket_id in ticket_ids:
+        if ticket_id in updated_ids:
+            results.append(BulkTicketResult(ticket_id=ticket_id, success=True))
+        elif ticket_id in existing_ids:
+            results.append(BulkTicketResult(ticket_id=ticket_id, success=False, detail=failure_detail))
+        else:
+            results.append(BulkTicketResult(ticket_id=ticket_id, success=False, detail="Ticket bulunamadı"))
+    
+    return BulkTicketResponse(
+        action=operation.action,
+        updated=len(updated_ids),
+        failed=len(ticket_ids) - len(updated_ids),
+        results=results
+    )
 
 
 @router.post("/tickets/{ticket_id}/attachments")
 async def upload_attachments(
     ticket_id: int,
+    request: Request,
     files: List[UploadFile] = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Ticket'a dosya ekle"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket bulunamadı"
-        )
-    
-    # Erişim kontrolü
-    can_upload = (
-        current_user.is_supervisor or 
-        current_user.is_system_admin or
-        current_user.is_agent or
-        ticket.created_by_id == current_user.id
-    )
+    ticket = _require_access(
+        db.query(Ticket, ticket_visibility(current_user).label("allowed"))
+        .filter(Ticket.id == ticket_id, ticket_not_deleted()).first(),
+        "Bu ticket'a dosya yükleme yetkiniz yok"
+    ).Ticket
     
-    if not can_upload:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Bu ticket'a dosya yükleme yetkiniz yok"
-        )
+    _check_if_match(request, ticket)
     
     # Dosya boyutu kontrolü (5MB max)
     MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
@@ -704,9 +1572,11 @@ async def upload_attachments(
         file_path = os.path.join(upload_dir, safe_filename)
         
         # Dosyayı kaydet
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        with observe_duration(UPLOAD_DURATION, "ticket_attachment"):
+            content = await file.read()
+            with open(file_path, "wb") as f:
+                f.write(content)
+        UPLOAD_BYTES.labels("ticket_attachment").inc(len(content))
         
         uploaded_files.append({
             "original_name": file.filename,
@@ -717,7 +1587,6 @@ async def upload_attachments(
         })
     
     # Mevcut attachment_urls'i güncelle
-    import json
     current_attachments = []
     if ticket.attachment_urls:
         try:
@@ -739,7 +1608,7 @@ async def upload_attachments(
     )
     
     db.add(attachment_comment)
-    db.commit()
+    _commit_ticket(db, ticket)
     
     return {
         "message": "Dosyalar başarıyla yüklendi",
@@ -754,79 +1623,130 @@ async def get_ticket_attachments(
     current_user: User = Depends(get_current_active_user)
 ):
     """Ticket'ın dosyalarını listele"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket bulunamadı"
-        )
-    
-    # Erişim kontrolü
-    can_view = (
-        current_user.is_supervisor or 
-        current_user.is_system_admin or
-        current_user.is_agent or
-        ticket.created_by_id == current_user.id or
-        ticket.assigned_to_id == current_user.id
+    ticket = _require_access(
+        db.query(Ticket.attachment_urls, ticket_visibility(current_user).label("allowed"))
+        .filter(Ticket.id == ticket_id, ticket_not_deleted()).first(),
+        "Bu ticket'ın dosyalarını görme yetkiniz yok"
     )
     
-    if not can_view:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Bu ticket'ın dosyalarını görme yetkiniz yok"
-        )
-    
-    attachments = []
-    if ticket.attachment_urls:
-        try:
-            import json
-            attachments = json.loads(ticket.attachment_urls)
-        except:
-            attachments = []
-    
     return {
         "ticket_id": ticket_id,
-        "attachments": attachments
+        "attachments": _parse_attachments(ticket.attachment_urls)
     }
 
 
 @router.put("/tickets/{ticket_id}/reopen", response_model=TicketResponse)
 async def reopen_ticket(
     ticket_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_agent_or_above)
 ):
     """Kapatılmış ticket'ı yeniden aç"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    row = _mutate_ticket(
+        db, ticket_id, request,
+        values={
+            "status": TicketStatus.IN_PROGRESS,
+            "resolution": None,  # Çözümü temizle
+            "last_updated_by_id": current_user.id
+        },
+        conditions=[Ticket.status.in_([TicketStatus.CLOSED, TicketStatus.RESOLVED])],
+        # Yeniden açma yorumu
+        comment=TicketComment(
+            user_id=current_user.id,
+            content="🔄 Ticket yeniden açıldı",
+            is_internal=True
+        )
+    )
     
-    if not ticket:
+    if row.id is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket bulunamadı"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sadece kapatılmış veya çözülmüş ticket'lar yeniden açılabilir"
+        )
+    
+    return _mutation_response(db, row, current_user, response)
+
+
+@router.post("/tickets/{ticket_id}/duplicate", response_model=TicketResponse)
+async def mark_ticket_duplicate(
+    ticket_id: int,
+    link: TicketDuplicateLink,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_agent_or_above)
+):
+    """Ticket'ı başka bir ticket'ın kopyası olarak işaretle; merge ile yorumlarını taşı ve kapat"""
+    if link.duplicate_of_id == ticket_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ticket kendisinin kopyası olamaz"
         )
     
-    if ticket.status not in [TicketStatus.CLOSED, TicketStatus.RESOLVED]:
+    # Kopya güncellenebilir, asıl ticket (merge'de yorumların taşındığı) görünür olmalı
+    ticket = _require_access(
+        db.query(Ticket, ticket_editability(current_user).label("allowed"))
+        .filter(Ticket.id == ticket_id, ticket_not_deleted()).first(),
+        "Bu ticket'ı güncelleme yetkiniz yok"
+    ).Ticket
+    
+    target = db.query(
+        Ticket.id,
+        Ticket.duplicate_of_id,
+        ticket_visibility(current_user).label("allowed")
+    ).filter(Ticket.id == link.duplicate_of_id, ticket_not_deleted()).first()
+    if not target:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Asıl ticket bulunamadı"
+        )
+    _require_access(target, "Asıl ticket'ı görme yetkiniz yok")
+    if target.duplicate_of_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Sadece kapatılmış veya çözülmüş ticket'lar yeniden açılabilir"
+            detail=f"Asıl ticket zaten #{target.duplicate_of_id} ticket'ının kopyası"
         )
     
-    # Ticket'ı yeniden aç
-    ticket.status = TicketStatus.IN_PROGRESS
-    ticket.resolution = None  # Çözümü temizle
+    _check_if_match(request, ticket)
+    owner_before = load_owner(ticket)
+    
+    ticket.duplicate_of_id = target.id
     ticket.last_updated_by_id = current_user.id
     
-    # Yeniden açma yorumu
-    reopen_comment = TicketComment(
-        ticket_id=ticket_id,
-        user_id=current_user.id,
-        content="🔄 Ticket yeniden açıldı",
-        is_internal=True
-    )
+    if link.merge:
+        # Yorumlar asıl ticket'a taşınır, kopya kapatılır
+        db.execute(
+            update(TicketComment)
+            .where(TicketComment.ticket_id == ticket_id)
+            .values(ticket_id=target.id)
+            .execution_options(synchronize_session=False)
+        )
+        ticket.status = TicketStatus.CLOSED
+        ticket.resolution = f"#{target.id} ile birleştirildi"
+        db.add(TicketComment(
+            ticket_id=target.id,
+            user_id=current_user.id,
+            content=f"🔗 #{ticket_id} bu ticket ile birleştirildi",
+            is_internal=True
+        ))
+        # Asıl ticket'ın yorum listesi değişti; açık ETag'leri geçersizleştir
+        db.execute(
+            update(Ticket)
+            .where(Ticket.id == target.id)
+            .values(last_updated_by_id=current_user.id, version=Ticket.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        db.add(TicketComment(
+            ticket_id=ticket_id,
+            user_id=current_user.id,
+            content=f"🔗 #{target.id} ticket'ının kopyası olarak işaretlendi",
+            is_internal=True
+        ))
     
-    db.add(reopen_comment)
-    db.commit()
-    db.refresh(ticket)
+    _commit_ticket(db, ticket, response)
+    _ticket_changed(ticket, owner_before)
     
     return ticket
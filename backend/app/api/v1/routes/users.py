@@ -1,19 +1,29 @@
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Request, Response
 from fastapi.responses import JSONResponse
+from sqlalchemy import bindparam, case, func, literal, literal_column, or_, update
 from sqlalchemy.orm import Session
 import os
+import psycopg2
 import uuid
 from pathlib import Path
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User, UserStatus
 from app.models.role import Role
+from app.core.conditional import compute_etag, conditional_response
+from app.core.metrics import UPLOAD_BYTES, UPLOAD_DURATION, observe_duration
+from app.core.compression import compressible
+from app.services.user_import import UserImportResult, parse_user_rows, import_users
+from app.services.role_cache import role_cache
+from app.services.assignment import assignment_engine, OPEN_STATUSES
+from app.models.ticket import Ticket, TicketCategory, TicketStatus
 from app.core.security import (
     get_password_hash,
     get_current_active_user,
     require_admin,
     require_supervisor_or_admin,
+    require_agent_or_above,
     require_permission
 )
 from pydantic import BaseModel, EmailStr
@@ -36,6 +46,8 @@ class UserUpdate(BaseModel):
     phone: Optional[str] = None
     department: Optional[str] = None
     status: Optional[str] = None
+    # Agent'ın otomatik atamada baktığı kategoriler (boş liste = hepsi)
+    ticket_categories: Optional[List[TicketCategory]] = None
 
 class UserRoleUpdate(BaseModel):
     role_id: int
@@ -60,6 +72,7 @@ class UserResponse(BaseModel):
     status: Optional[str] = None
     is_active: bool
     phone: Optional[str] = None
+    ticket_categories: Optional[List[str]] = None
     created_at: datetime
     
     # Rol kontrol property'leri
@@ -88,10 +101,11 @@ class UserListResponse(BaseModel):
         from_attributes = True
 
 @router.get("/users/agents-customers", response_model=List[UserListResponse])
+@compressible
 async def get_agents_and_customers(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Supervisor ve Admin için Agent ve Customer kullanıcıları görüntüleme"""
@@ -103,16 +117,14 @@ async def get_agents_and_customers(
         )
     
     # Role ID 2 (agent) olan kullanıcıları getir
-    query = db.query(User).filter(User.role_id == 2)
+    query = db.query(User).filter(User.role_id == 2, User.deleted_at.is_(None))
     
     users = query.offset(skip).limit(limit).all()
     
     # Response için kullanıcı listesini hazırla
     result = []
     for user in users:
-        role = None
-        if user.role_id:
-            role = db.query(Role).filter(Role.id == user.role_id).first()
+        role = role_cache.get(db, user.role_id)
         
         user_data = {
             "id": user.id,
@@ -131,18 +143,75 @@ async def get_agents_and_customers(
     
     return result
 
+class UserSearchResult(BaseModel):
+    id: int
+    username: str
+    full_name: str
+
+# Trigram index'iyle (ix_users_search_trgm) birebir aynı ifade olmalı
+USER_SEARCH_DOCUMENT = literal_column("(username || ' ' || full_name || ' ' || email)")
+# Bundan kısa aramalarda trigram çıkmaz; önek (text_pattern_ops) index'leri kullanılır
+TRIGRAM_MIN_LENGTH = 3
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+@router.get("/users/search", response_model=List[UserSearchResult])
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=100, description="Kullanıcı adı, ad soyad veya e-posta"),
+    role: Optional[List[str]] = Query(None, description="Rol adı (birden fazla verilebilir)"),
+    department: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_agent_or_above)
+):
+    """Atama ve yükseltme seçicileri için kullanıcı arama (typeahead) - Agent ve üstü"""
+    term = q.strip().lower()
+    if not term:
+        return []
+    
+    query = db.query(User.id, User.username, User.full_name).filter(
+        User.is_active == True,
+        User.status == UserStatus.ACTIVE
+    )
+    
+    if role:
+        role_ids = [cached.id for cached in (role_cache.get_by_name(db, name) for name in role) if cached]
+        if not role_ids:
+            return []
+        query = query.filter(User.role_id.in_(role_ids))
+    
+    if department:
+        query = query.filter(User.department == department)
+    
+    if len(term) < TRIGRAM_MIN_LENGTH:
+        # Kısa aramada sadece önek eşleşmesi: lower(...) text_pattern_ops index'leri
+        prefix = f"{_escape_like(term)}%"
+        query = query.filter(or_(
+            func.lower(User.username).like(prefix),
+            func.lower(User.full_name).like(prefix)
+        )).order_by(User.full_name, User.id)
+    else:
+        # İçinde geçen eşleşme GIN trigram index'inden; en iyi kelime eşleşmesi önde
+        query = query.filter(
+            USER_SEARCH_DOCUMENT.ilike(bindparam("pattern", f"%{_escape_like(term)}%"))
+        ).order_by(func.word_similarity(term, USER_SEARCH_DOCUMENT).desc(), User.full_name, User.id)
+    
+    return query.limit(limit).all()
+
 @router.get("/users/", response_model=List[UserListResponse])
+@compressible
 async def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     role_filter: Optional[str] = Query(None, description="Rol bazlı filtreleme"),
     department_filter: Optional[str] = Query(None, description="Departman bazlı filtreleme"),
     status_filter: Optional[str] = Query(None, description="Durum bazlı filtreleme"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_supervisor_or_admin)
 ):
     """Kullanıcı listesi - Supervisor ve Admin erişimi"""
-    query = db.query(User)
+    query = db.query(User).filter(User.deleted_at.is_(None))
     
     # Supervisor sadece kendi departmanını görebilir
     if current_user.is_supervisor and not current_user.is_system_admin:
@@ -151,7 +220,7 @@ async def get_users(
     
     # Filtreler
     if role_filter:
-        role = db.query(Role).filter(Role.name == role_filter).first()
+        role = role_cache.get_by_name(db, role_filter)
         if role:
             query = query.filter(User.role_id == role.id)
     
@@ -165,9 +234,7 @@ async def get_users(
     users = query.order_by(User.id).offset(skip).limit(limit).all()    # Response için kullanıcı listesini hazırla
     result = []
     for user in users:
-        role = None
-        if user.role_id:
-            role = db.query(Role).filter(Role.id == user.role_id).first()
+        role = role_cache.get(db, user.role_id)
         
         user_data = {
             "id": user.id,
@@ -188,14 +255,24 @@ async def get_users(
 
 @router.get("/users/me", response_model=UserResponse)
 async def get_current_user_info(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Mevcut kullanıcının kendi bilgileri"""
-    # Role bilgisini yükle
-    role = None
-    if current_user.role_id:
-        role = db.query(Role).filter(Role.id == current_user.role_id).first()
+    # Role bilgisini cache'ten al
+    role = role_cache.get(db, current_user.role_id)
+    
+    # Kullanıcı ve rol zaten yüklü; rolün adı veya izinleri değişince ETag de değişir
+    etag = compute_etag(
+        "users-me", current_user.id, current_user.updated_at, current_user.role_id,
+        role.name if role else None,
+        ",".join(role.permission_list) if role else None
+    )
+    cached = conditional_response(request, response, etag)
+    if cached is not None:
+        return cached
     
     # Response object'ini hazırla
     response_data = {
@@ -258,7 +335,7 @@ async def get_user(
     current_user: User = Depends(require_supervisor_or_admin)
 ):
     """Belirli bir kullanıcının bilgileri"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -328,6 +405,37 @@ async def create_user(
     
     return new_user
 
+@router.post("/users/import", response_model=UserImportResult)
+def import_users_file(
+    request: Request,
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, alias="format", description="csv veya ndjson"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Toplu kullanıcı içe aktarma (CSV/NDJSON) - Sadece Admin"""
+    # Uzun süren hash'leme event loop'u bloklamasın diye sync endpoint (threadpool'da çalışır);
+    # hash'ler lifespan'de açılan ortak, sınırlı işlem havuzunda üretilir
+    if not file_format:
+        file_format = "ndjson" if file.filename and file.filename.endswith((".ndjson", ".jsonl")) else "csv"
+    
+    try:
+        rows = parse_user_rows(file.file.read().decode("utf-8-sig"), file_format)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Dosya okunamadı: {e}"
+        )
+    
+    try:
+        return import_users(db, rows, executor=request.app.state.hash_pool)
+    except psycopg2.IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="İçe aktarma sırasında eşzamanlı bir kayıt çakışması oluştu, tekrar deneyin"
+        )
+
 @router.put("/users/{user_id}", response_model=UserResponse)
 async def update_user(
     user_id: int,
@@ -336,7 +444,7 @@ async def update_user(
     current_user: User = Depends(require_admin)
 ):
     """Kullanıcı güncelleme - Sadece Admin"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -373,6 +481,9 @@ async def update_user(
     
     db.commit()
     db.refresh(user)
+    
+    # Rol, durum veya kategori değişmiş olabilir
+    assignment_engine.invalidate()
     return user
 
 @router.delete("/users/{user_id}")
@@ -381,14 +492,12 @@ async def delete_user(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    """Kullanıcı silme - Sadece Admin"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Kullanıcı bulunamadı"
-        )
-    
+    """
+    Kullanıcı silme - Sadece Admin. Hesap tek UPDATE ile silinmiş işaretlenip
+    devre dışı bırakılır; açık ticket atamaları aynı transaction'da boşaltılır ve
+    IN_PROGRESS olanlar OPEN'a döner.
+    Geçmişi olmayan hesaplar purge ile kalıcı silinir, olanlar pasif kalır.
+    """
     # Kendini silmeyi engelle
     if user_id == current_user.id:
         raise HTTPException(
@@ -396,8 +505,36 @@ async def delete_user(
             detail="Kendi hesabınızı silemezsiniz"
         )
     
-    db.delete(user)
+    deleted = db.execute(
+        update(User)
+        .where(User.id == user_id, User.deleted_at.is_(None))
+        .values(deleted_at=func.now(), is_active=False, status=UserStatus.INACTIVE)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if deleted is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Kullanıcı bulunamadı"
+        )
+    
+    # Sahibi kalmayan IN_PROGRESS ticket'lar kuyruğa (OPEN) geri döner
+    db.execute(
+        update(Ticket)
+        .where(Ticket.assigned_to_id == user_id, Ticket.status.in_(OPEN_STATUSES))
+        .values(
+            assigned_to_id=None,
+            status=case(
+                (Ticket.status == TicketStatus.IN_PROGRESS, literal(TicketStatus.OPEN, Ticket.status.type)),
+                else_=Ticket.status
+            ),
+            version=Ticket.version + 1
+        )
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
+    assignment_engine.invalidate()
     return {"message": "Kullanıcı başarıyla silindi"}
 
 @router.get("/roles", response_model=List[RoleResponse])
@@ -406,8 +543,7 @@ async def get_roles(
     current_user: User = Depends(require_admin)
 ):
     """Tüm rolleri getir - Sadece Admin"""
-    roles = db.query(Role).all()
-    return roles
+    return sorted(role_cache.all(db), key=lambda role: role.id)
 
 @router.put("/users/{user_id}/role", response_model=UserResponse)
 async def update_user_role(
@@ -417,7 +553,7 @@ async def update_user_role(
     current_user: User = Depends(require_admin)
 ):
     """Kullanıcının rolünü güncelle - Sadece Admin"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -456,6 +592,7 @@ async def update_user_role(
     
     db.commit()
     db.refresh(user)
+    assignment_engine.invalidate()
     
     # Response için role bilgisini hazırla
     response_data = {
@@ -511,8 +648,10 @@ async def upload_profile_image(
     file_path = upload_dir / unique_filename
     
     # Dosyayı kaydet
-    with open(file_path, "wb") as buffer:
-        buffer.write(content)
+    with observe_duration(UPLOAD_DURATION, "profile_image"):
+        with open(file_path, "wb") as buffer:
+            buffer.write(content)
+    UPLOAD_BYTES.labels("profile_image").inc(file_size)
     
     # URL oluştur
     image_url = f"/uploads/profile_images/{unique_filename}"
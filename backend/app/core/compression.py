@@ -0,0 +1,159 @@
+import time
+import zlib
+from typing import Optional
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.config import settings
+from app.core.metrics import COMPRESSION_SECONDS, COMPRESSION_INPUT_BYTES, COMPRESSION_OUTPUT_BYTES
+
+# Zaten sıkıştırılmış içerikleri tekrar sıkıştırmanın faydası yok
+INCOMPRESSIBLE_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip",
+                        "application/pdf", "application/octet-stream")
+
+
+def compressible(endpoint):
+    """Endpoint'i yanıt sıkıştırmasına dahil et (route bazlı opt-in)"""
+    endpoint.__compressible__ = True
+    return endpoint
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding'e göre br > gzip tercih et (q=0 olanları dışla)"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    for encoding in ("br", "gzip"):
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+class _Encoder:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        self.elapsed = 0.0
+        self.input_bytes = 0
+        self.output_bytes = 0
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(settings.GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def _timed(self, func) -> bytes:
+        started = time.perf_counter()
+        output = func()
+        self.elapsed += time.perf_counter() - started
+        self.output_bytes += len(output)
+        return output
+
+    def chunk(self, data: bytes) -> bytes:
+        """Akış parçası: istemci beklemesin diye her parçadan sonra flush"""
+        self.input_bytes += len(data)
+        if self.encoding == "br":
+            return self._timed(lambda: self._compressor.process(data) + self._compressor.flush())
+        return self._timed(lambda: self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH))
+
+    def finish(self, data: bytes = b"") -> bytes:
+        self.input_bytes += len(data)
+        if self.encoding == "br":
+            return self._timed(lambda: self._compressor.process(data) + self._compressor.finish())
+        return self._timed(lambda: self._compressor.compress(data) + self._compressor.flush())
+
+    def record(self) -> None:
+        COMPRESSION_SECONDS.labels(self.encoding).observe(self.elapsed)
+        COMPRESSION_INPUT_BYTES.labels(self.encoding).inc(self.input_bytes)
+        COMPRESSION_OUTPUT_BYTES.labels(self.encoding).inc(self.output_bytes)
+
+
+class CompressionMiddleware:
+    """
+    @compressible işaretli route'ların yanıtlarını Accept-Encoding'e göre
+    Brotli veya gzip ile sıkıştırır. Eşik altındaki, zaten kodlanmış ve
+    sıkıştırılamaz tipteki yanıtlar olduğu gibi geçer; akış yanıtları parça parça sıkıştırılır.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else settings.COMPRESSION_MIN_SIZE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(scope, send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, scope, send, encoding: str, minimum_size: int):
+        self.scope = scope
+        self.downstream = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+
+    def _eligible(self, headers: MutableHeaders) -> bool:
+        endpoint = self.scope.get("endpoint")
+        if not getattr(endpoint, "__compressible__", False):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return not content_type.startswith(INCOMPRESSIBLE_TYPES)
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            # Gövdenin ilk parçası gelene kadar başlıkları beklet
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(scope=self.start_message)
+            small = not more_body and len(body) < self.minimum_size
+            if small or not self._eligible(headers):
+                self.passthrough = True
+                await self.downstream(self.start_message)
+                await self.downstream(message)
+                return
+
+            self.encoder = _Encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                compressed = self.encoder.finish(body)
+                headers["Content-Length"] = str(len(compressed))
+                self.encoder.record()
+                await self.downstream(self.start_message)
+                await self.downstream({"type": "http.response.body", "body": compressed})
+                return
+
+            # Akış yanıtı: uzunluk bilinmiyor
+            del headers["Content-Length"]
+            await self.downstream(self.start_message)
+
+        if more_body:
+            await self.downstream({"type": "http.response.body", "body": self.encoder.chunk(body), "more_body": True})
+        else:
+            await self.downstream({"type": "http.response.body", "body": self.encoder.finish(body)})
+            self.encoder.record()
@@ -0,0 +1,88 @@
+import hashlib
+from datetime import datetime
+from typing import Optional, Set
+from fastapi import HTTPException, Request, Response, status
+from app.core.metrics import record_cache
+
+# Yanıtlar kullanıcıya özel olduğu için paylaşılan cache'ler saklamamalı,
+# tarayıcı ise her seferinde ETag ile yeniden doğrulamalı
+CACHE_CONTROL = "private, no-cache"
+
+def _format_part(part) -> str:
+    if part is None:
+        return ""
+    if isinstance(part, datetime):
+        return part.isoformat()
+    return str(part)
+
+def _digest(parts) -> str:
+    raw = "|".join(_format_part(part) for part in parts)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+
+def compute_etag(*parts) -> str:
+    """Ucuz doğrulayıcı parçalarından (id, updated_at, sayaç vb.) zayıf ETag üret"""
+    return f'W/"{_digest(parts)}"'
+
+def compute_versioned_etag(version: int, *parts) -> str:
+    """
+    Satır sürümünü açıkça taşıyan zayıf ETag (W/"<sürüm>.<özet>").
+    If-Match ile gelen değerden sürüm okunarak iyimser kilitleme yapılır.
+    """
+    return f'W/"{version}.{_digest(parts)}"'
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match başlığı verilen ETag ile eşleşiyor mu (zayıf karşılaştırma)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    target = _strip_weak(etag)
+    return any(_strip_weak(candidate) == target for candidate in header.split(","))
+
+def if_match_versions(request: Request) -> Optional[Set[int]]:
+    """
+    If-Match başlığındaki sürümler. Başlık yoksa veya '*' ise None döner
+    (koşulsuz güncelleme); sürüm okunamayan etiketler hiçbir sürümle eşleşmez.
+    """
+    header = request.headers.get("if-match")
+    if not header or header.strip() == "*":
+        return None
+    versions = set()
+    for candidate in header.split(","):
+        version, _, _ = _strip_weak(candidate).strip('"').partition(".")
+        if version.isdigit():
+            versions.add(int(version))
+    return versions
+
+def precondition_failed(detail: str) -> HTTPException:
+    """412: istemcinin gördüğü sürüm artık güncel değil"""
+    return HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=detail)
+
+def set_validator_headers(response: Response, etag: str) -> None:
+    """Yanıta ETag ve yeniden doğrulama başlıklarını ekle"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    response.headers["Vary"] = "Authorization"
+
+def not_modified(etag: str) -> Response:
+    """Gövdesiz 304 yanıtı"""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validator_headers(response, etag)
+    return response
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    ETag başlıklarını ayarla; istemcinin kopyası güncelse 304 döndür.
+    None dönerse endpoint tam yanıtı üretmeye devam etmelidir.
+    """
+    if etag_matches(request, etag):
+        record_cache("etag", True)
+        return not_modified(etag)
+    record_cache("etag", False)
+    set_validator_headers(response, etag)
+    return None
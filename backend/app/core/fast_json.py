@@ -0,0 +1,15 @@
+import orjson
+from fastapi import Response
+
+
+def fast_json_response(content, status_code: int = 200) -> Response:
+    """
+    Önceden hazırlanmış düz dict/list içeriğini orjson ile kodla.
+    Pydantic doğrulaması ve jsonable_encoder atlanır; içerik yanıt modelinin
+    alan sırası ve tipleriyle birebir kurulmalıdır.
+    """
+    return Response(
+        content=orjson.dumps(content),
+        status_code=status_code,
+        media_type="application/json"
+    )
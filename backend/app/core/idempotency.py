@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, delete, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.idempotency import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Süresi dolan kayıtlar bu aralıkla (worker başına) temizlenir
+PURGE_INTERVAL_SECONDS = 300
+PURGE_BATCH_SIZE = 1000
+
+_last_purge = 0.0
+
+def request_fingerprint(scope: str, payload: Any) -> str:
+    """Aynı anahtarla farklı bir istek gönderildiğini ayırt etmek için gövde özeti"""
+    raw = json.dumps([scope, jsonable_encoder(payload)], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+@dataclass
+class IdempotencyClaim:
+    """Anahtarın sahibi bu istekse replay None'dır; endpoint işi yapıp complete() çağırır"""
+    user_id: int
+    key: str
+    replay: Optional[JSONResponse] = None
+
+    def complete(self, db: Session, body: Any, status_code: int = status.HTTP_200_OK) -> None:
+        """Yanıtı sakla; sonraki denemeler bunu alır"""
+        db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == self.user_id, IdempotencyKey.key == self.key)
+            .values(status="completed", response_status=status_code, response_body=jsonable_encoder(body))
+        )
+        db.commit()
+
+    def release(self, db: Session) -> None:
+        """İstek başarısız oldu; anahtarı bırak ki tekrar deneme işi yeniden yapabilsin"""
+        db.rollback()
+        db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.user_id == self.user_id, IdempotencyKey.key == self.key)
+        )
+        db.commit()
+
+def _purge_expired(db: Session) -> None:
+    """Süresi dolan anahtarları küçük partilerle sil; TTL için ayrı bir iş gerekmez"""
+    global _last_purge
+    if time.monotonic() - _last_purge < PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = time.monotonic()
+    expired = (
+        select(IdempotencyKey.user_id, IdempotencyKey.key)
+        .where(IdempotencyKey.expires_at < datetime.now(timezone.utc))
+        .limit(PURGE_BATCH_SIZE)
+    )
+    db.execute(
+        delete(IdempotencyKey)
+        .where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired))
+    )
+    db.commit()
+
+async def claim_idempotency_key(
+    db: Session,
+    key: Optional[str],
+    user_id: int,
+    scope: str,
+    payload: Any
+) -> Optional[IdempotencyClaim]:
+    """
+    Idempotency-Key'i bu istek adına kilitle. Başlık yoksa None döner.
+    Anahtar daha önce tamamlandıysa saklanan yanıt replay olarak döner;
+    aynı anahtarla eşzamanlı bir istek sürüyorsa bitmesi beklenir.
+    """
+    if not key:
+        return None
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_HEADER} en fazla {MAX_KEY_LENGTH} karakter olabilir"
+        )
+
+    fingerprint = request_fingerprint(scope, payload)
+    now = datetime.now(timezone.utc)
+    stale_lock = now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS)
+    values = {
+        "user_id": user_id,
+        "key": key,
+        "scope": scope,
+        "fingerprint": fingerprint,
+        "status": "in_progress",
+        "response_status": None,
+        "response_body": None,
+        "locked_at": now,
+        "expires_at": now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+    }
+
+    # Tek ifade: anahtar yoksa, süresi dolmuşsa veya sahibi yarıda kalmışsa devral
+    statement = insert(IdempotencyKey).values(**values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+        set_={name: statement.excluded[name] for name in values if name not in ("user_id", "key")},
+        where=or_(
+            IdempotencyKey.expires_at < now,
+            and_(IdempotencyKey.status == "in_progress", IdempotencyKey.locked_at < stale_lock)
+        )
+    ).returning(IdempotencyKey.key)
+
+    _purge_expired(db)
+
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    delay = 0.05
+    while True:
+        claimed = db.execute(statement).first()
+        db.commit()
+        if claimed is not None:
+            return IdempotencyClaim(user_id=user_id, key=key)
+
+        record = db.execute(
+            select(
+                IdempotencyKey.scope,
+                IdempotencyKey.fingerprint,
+                IdempotencyKey.status,
+                IdempotencyKey.response_status,
+                IdempotencyKey.response_body
+            ).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        ).first()
+        db.rollback()
+
+        if record is not None:
+            if record.scope != scope or record.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"{IDEMPOTENCY_HEADER} farklı bir istek için kullanılmış"
+                )
+            if record.status == "completed":
+                return IdempotencyClaim(
+                    user_id=user_id,
+                    key=key,
+                    replay=JSONResponse(
+                        content=record.response_body,
+                        status_code=record.response_status,
+                        headers={REPLAYED_HEADER: "true"}
+                    )
+                )
+
+        # İlk istek sürüyor (veya arada silindi): kısa bekleyip tekrar dene
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Aynı Idempotency-Key ile bir istek hâlâ işleniyor"
+            )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.5)
@@ -0,0 +1,126 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RequestQueryStats:
+    """Tek bir isteğin SQL sayaçları"""
+
+    __slots__ = ("statements", "db_time", "shapes")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+
+    def suspected_n_plus_one(self, threshold: int):
+        """Aynı şekildeki ifadesi eşikten fazla tekrar eden sorgular"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    """Aktif isteğin SQL sayaçları (istek dışında None)"""
+    return _current_stats.get()
+
+
+def _statement_shape(statement: str, context) -> str:
+    # Derlenmiş SQL, IN listeleri genişletilmeden önceki hâlidir; parametre değerleri içermez
+    compiled = getattr(context, "compiled", None)
+    if compiled is not None:
+        statement = compiled.string
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        stats.db_time += time.perf_counter() - started.pop()
+    stats.statements += 1
+    stats.shapes[_statement_shape(statement, context)] += 1
+
+
+def install_sql_instrumentation(engine: Engine) -> None:
+    """Engine'e istek bazlı SQL sayacı event'lerini bağla"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Her istek için SQL ifade sayısını ve DB süresini ölçer, Server-Timing
+    başlığına yazar, yapılandırılmış log üretir ve olası N+1 kalıplarını işaretler.
+    """
+
+    def __init__(self, app, n_plus_one_threshold: Optional[int] = None):
+        self.app = app
+        self.threshold = n_plus_one_threshold or settings.SQL_N_PLUS_ONE_THRESHOLD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+                server_timing = (
+                    f'db;dur={stats.db_time * 1000:.2f};desc="{stats.statements} queries", '
+                    f"app;dur={total_ms:.2f}"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._log(scope, status_code, stats, time.perf_counter() - started)
+
+    def _log(self, scope, status_code: int, stats: RequestQueryStats, elapsed: float):
+        suspects = stats.suspected_n_plus_one(self.threshold)
+        record = {
+            "method": scope.get("method"),
+            "path": scope.get("path"),
+            "status": status_code,
+            "statements": stats.statements,
+            "db_ms": round(stats.db_time * 1000, 2),
+            "total_ms": round(elapsed * 1000, 2),
+        }
+        if suspects:
+            record["n_plus_one"] = [
+                {"count": count, "statement": shape[:300]} for shape, count in suspects
+            ]
+            logger.warning(json.dumps(record, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,171 @@
+import os
+import time
+from contextlib import contextmanager
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+
+# Birden çok worker ile çalışırken her süreç metriklerini bu klasördeki
+# mmap dosyalarına yazar; /metrics hepsini toplayarak döndürür
+MULTIPROCESS_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP istek süresi",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "İşlenmekte olan HTTP istekleri",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Havuzdan alınan bağlantı sayısı")
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Şu an kullanımda olan bağlantılar",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "pool_size üzerindeki ek bağlantılar",
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Bağlantı alma bekleme süresi",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+# Okuma replikaları (-1: erişilemiyor)
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Replika gecikmesi",
+    ["replica"],
+    multiprocess_mode="max",
+)
+DB_READ_ROUTES = Counter("db_read_routes_total", "Okuma oturumlarının gittiği sunucu", ["target"])
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt işlem süresi",
+    ["operation"],
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+
+UPLOAD_BYTES = Counter("upload_bytes_total", "Yüklenen dosya boyutu", ["kind"])
+UPLOAD_DURATION = Histogram(
+    "upload_duration_seconds",
+    "Dosya yükleme süresi",
+    ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# Sıkıştırma seviyesini ayarlamak için CPU maliyeti ve kazanılan boyut
+COMPRESSION_SECONDS = Histogram(
+    "response_compression_seconds",
+    "Yanıt sıkıştırma süresi (istek başına)",
+    ["encoding"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+COMPRESSION_INPUT_BYTES = Counter("response_compression_input_bytes_total", "Sıkıştırma öncesi boyut", ["encoding"])
+COMPRESSION_OUTPUT_BYTES = Counter("response_compression_output_bytes_total", "Sıkıştırma sonrası boyut", ["encoding"])
+
+ASSIGNMENT_DECISIONS = Counter("ticket_auto_assignments_total", "Otomatik atama kararları", ["result"])
+
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache istekleri", ["cache", "result"])
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Cache isabet/ıska sayacı (isabet oranı = hit / (hit + miss))"""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+@contextmanager
+def observe_duration(histogram, *labels):
+    """Bloğun süresini verilen histograma yaz"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        (histogram.labels(*labels) if labels else histogram).observe(elapsed)
+
+
+def install_pool_metrics(engine: Engine) -> None:
+    """Bağlantı havuzu event'lerini metriklere bağla"""
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_CHECKED_OUT.inc()
+        overflow = getattr(engine.pool, "overflow", None)
+        if overflow is not None:
+            DB_POOL_OVERFLOW.set(max(0, overflow()))
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+
+def _route_template(scope) -> str:
+    # Yüksek kardinaliteyi önlemek için gerçek path yerine route şablonu kullanılır
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    app = scope.get("app")
+    for candidate in getattr(getattr(app, "router", None), "routes", []):
+        match, _ = candidate.matches(scope)
+        if match == Match.FULL:
+            return candidate.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Route şablonu ve durum kodu bazında gecikme ve eşzamanlı istek metrikleri"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+        REQUESTS_IN_PROGRESS.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            REQUEST_LATENCY.labels(
+                scope.get("method", ""), _route_template(scope), str(status_code)
+            ).observe(time.perf_counter() - started)
+
+
+def render_metrics():
+    """Prometheus text formatında tüm metrikler (çok süreçli modda tüm worker'lar)"""
+    if MULTIPROCESS_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
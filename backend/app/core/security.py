@@ -6,6 +6,7 @@ from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION, observe_duration
 from app.db.session import get_db
 from app.models.user import User
 
@@ -14,11 +15,13 @@ security = HTTPBearer()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Düz metin şifreyi hash'lenmiş şifre ile doğrula"""
-    return pwd_context.verify(plain_password, hashed_password)
+    with observe_duration(PASSWORD_HASH_DURATION, "verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Şifreyi hash'le"""
-    return pwd_context.hash(password)
+    with observe_duration(PASSWORD_HASH_DURATION, "hash"):
+        return pwd_context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """JWT access token oluştur"""
@@ -0,0 +1,47 @@
+from sqlalchemy import false, or_, true
+from app.models.ticket import Ticket
+from app.models.ticket_comment import TicketComment
+from app.models.user import User
+
+# Ticket erişim kuralları tek yerde: her kural kullanıcıyı bir SQL koşuluna çevirir.
+# Koşullar hem sıcak (Ticket) hem arşiv (ArchivedTicket) modeline uygulanabilir;
+# endpoint'ler satırı yükleyip Python'da kontrol etmek yerine sorguya ekler.
+
+def ticket_visibility(principal: User, model=Ticket):
+    """Kullanıcının görebileceği ticket'lar (liste, detay, yorum ve dosya okuma/ekleme)"""
+    if principal.is_system_admin or principal.is_supervisor:
+        # Supervisor ve Admin tüm ticket'ları görür
+        return true()
+    if principal.is_agent:
+        # Agent kendi oluşturduğu, kendisine atanan veya henüz atanmamış ticket'ları görür
+        return or_(
+            model.created_by_id == principal.id,
+            model.assigned_to_id == principal.id,
+            model.assigned_to_id.is_(None)
+        )
+    if principal.is_customer:
+        # Customer sadece kendi açtığı ticket'ları görür
+        return model.created_by_id == principal.id
+    return false()
+
+def ticket_editability(principal: User, model=Ticket):
+    """Kullanıcının güncelleyebileceği ticket'lar (PUT /tickets/{id})"""
+    if principal.is_system_admin or principal.is_supervisor:
+        return true()
+    if principal.is_agent:
+        # Agent kendi oluşturduğu veya kendisine atanan ticket'ları güncelleyebilir
+        return or_(model.created_by_id == principal.id, model.assigned_to_id == principal.id)
+    if principal.is_customer:
+        return model.created_by_id == principal.id
+    return false()
+
+def comment_visibility(principal: User, model=TicketComment):
+    """Görünür bir ticket'ın yorumlarından kullanıcının görebilecekleri"""
+    if principal.is_customer:
+        # Customer'lar internal notları göremez
+        return model.is_internal == False
+    return true()
+
+def ticket_not_deleted(model=Ticket):
+    """Soft-delete edilmiş ticket'lar kalıcı silinene kadar hiçbir sorguda görünmez"""
+    return model.deleted_at.is_(None)
@@ -0,0 +1,65 @@
+import enum
+import io
+from datetime import datetime
+from typing import Iterable, Sequence
+from sqlalchemy.orm import Session
+
+# Tek bir COPY çağrısında belleğe alınacak en fazla satır
+COPY_CHUNK_SIZE = 50_000
+
+def _copy_value(value) -> str:
+    """Değeri PostgreSQL COPY text formatına çevir"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, enum.Enum):
+        # SQLEnum kolonları enum adlarını saklar
+        value = value.name
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    text = str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+def copy_rows(
+    db: Session,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    chunk_size: int = COPY_CHUNK_SIZE
+) -> int:
+    """
+    Satırları COPY ... FROM STDIN ile session'ın transaction'ı içinde yükle.
+    Commit çağıranın sorumluluğundadır. Yüklenen satır sayısını döndürür.
+    """
+    cursor = db.connection().connection.cursor()
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    total = 0
+    buffer = io.StringIO()
+    pending = 0
+
+    try:
+        for row in rows:
+            buffer.write("\t".join(_copy_value(value) for value in row))
+            buffer.write("\n")
+            pending += 1
+            if pending >= chunk_size:
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+                total += pending
+                buffer = io.StringIO()
+                pending = 0
+
+        if pending:
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            total += pending
+    finally:
+        cursor.close()
+
+    return total
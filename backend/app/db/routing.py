@@ -0,0 +1,189 @@
+import hashlib
+import hmac
+import logging
+import math
+import time
+from contextvars import ContextVar
+from http.cookies import CookieError, SimpleCookie
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.metrics import DB_REPLICA_LAG
+
+logger = logging.getLogger("app.db.routing")
+
+# Replika değilse (ayrı bir yerel veritabanı) veya tüm WAL uygulanmışsa gecikme 0'dır
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaSet:
+    """
+    Okuma replikaları: gecikmesi eşiği aşan veya erişilemeyen replikalar
+    bir sonraki kontrole kadar rotasyondan çıkar. Gecikme arka planda
+    ölçülür (check_lag); istek yolunda sadece son ölçüm okunur.
+    """
+
+    def __init__(self, engines: List[Engine], max_lag: float, check_interval: float):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        # Ölçüm bu kadar eskiyse replikaların durumu bilinmiyor sayılır
+        self.stale_after = check_interval * 3
+        self.lag: Dict[str, Optional[float]] = {}
+        # (engine, replikanın yakaladığı son an: ölçüm zamanı - gecikme)
+        self._healthy: List[Tuple[Engine, float]] = []
+        self._checked_at = 0.0
+        self._next = 0
+
+    @staticmethod
+    def _label(engine: Engine) -> str:
+        url = engine.url
+        return f"{url.host}:{url.port or 5432}/{url.database}"
+
+    def check_lag(self) -> None:
+        """Her replikanın gecikmesini ölç ve sağlıklı listeyi yenile (bloklar; istek yolunda çağrılmaz)"""
+        healthy = []
+        for engine in self.engines:
+            label = self._label(engine)
+            probed_at = time.time()
+            try:
+                with engine.connect() as connection:
+                    lag = float(connection.execute(REPLICA_LAG_SQL).scalar() or 0)
+            except Exception as exc:
+                logger.warning("Replika erişilemiyor (%s): %s", label, exc)
+                lag = None
+            self.lag[label] = lag
+            DB_REPLICA_LAG.labels(label).set(lag if lag is not None else -1)
+            if lag is not None and lag <= self.max_lag:
+                healthy.append((engine, probed_at - lag))
+            elif lag is not None:
+                logger.warning("Replika geride (%s): %.1fs", label, lag)
+        self._healthy = healthy
+        self._checked_at = time.monotonic()
+
+    def choose(self, not_before: Optional[float] = None) -> Optional[Engine]:
+        """
+        Sıradaki sağlıklı replika; not_before verilmişse sadece o ana (istemcinin son
+        yazması) kadar yakaladığı ölçülmüş replikalar. Uygun replika yoksa veya son
+        ölçüm eskimişse None (primary kullanılır).
+        """
+        if not self.engines or time.monotonic() - self._checked_at > self.stale_after:
+            return None
+        healthy = [
+            engine for engine, caught_up_at in self._healthy
+            if not_before is None or caught_up_at >= not_before
+        ]
+        if not healthy:
+            return None
+        self._next = (self._next + 1) % len(healthy)
+        return healthy[self._next]
+
+
+class WriteMarker:
+    """
+    Read-your-writes için istemcinin son yazma zamanı. Worker'lar arasında
+    paylaşılan bir durum tutulmaz: imzalı zaman damgası yanıtta çerez ve
+    X-Last-Write başlığı olarak istemciye verilir, sonraki okumada geri gelir.
+    """
+
+    COOKIE = "last_write"
+    HEADER = "X-Last-Write"
+
+    def __init__(self, window: float, secret: str):
+        self.window = window
+        self._key = hashlib.sha256(secret.encode()).digest()
+
+    def _sign(self, value: str) -> str:
+        return hmac.new(self._key, value.encode(), hashlib.sha256).hexdigest()[:32]
+
+    def issue(self, written_at: float) -> str:
+        value = f"{written_at:.3f}"
+        return f"{value}.{self._sign(value)}"
+
+    def cookie(self, token: str) -> str:
+        return f"{self.COOKIE}={token}; Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax"
+
+    def read(self, scope) -> Optional[float]:
+        """İstekteki geçerli ve pencere içindeki son yazma zamanı (başlık çerezden önce gelir)"""
+        headers = Headers(scope=scope)
+        token = headers.get(self.HEADER)
+        if token is None:
+            cookies = SimpleCookie()
+            try:
+                cookies.load(headers.get("cookie", ""))
+            except CookieError:
+                return None
+            morsel = cookies.get(self.COOKIE)
+            token = morsel.value if morsel is not None else None
+        if not token:
+            return None
+
+        value, _, signature = token.rpartition(".")
+        if not hmac.compare_digest(signature, self._sign(value)):
+            return None
+        try:
+            written_at = float(value)
+        except ValueError:
+            return None
+        if time.time() - written_at > self.window:
+            return None
+        return written_at
+
+
+_use_primary: ContextVar[bool] = ContextVar("db_use_primary", default=True)
+_last_write: ContextVar[Optional[float]] = ContextVar("db_last_write", default=None)
+
+
+def reads_use_primary() -> bool:
+    """Aktif istekte okumaların primary'e gitmesi gerekiyor mu"""
+    return _use_primary.get()
+
+
+def last_write_at() -> Optional[float]:
+    """Aktif isteği yapan istemcinin son yazma zamanı (pencere dışındaysa None)"""
+    return _last_write.get()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    GET isteklerini replikaya yönlendirir; istemci yakın zamanda yazma yaptıysa
+    sadece o yazmayı yakalamış replikalar (yoksa primary) kullanılır. Başarılı
+    yazmaların yanıtına imzalı son yazma zamanı eklenir.
+    """
+
+    def __init__(self, app, marker: WriteMarker):
+        self.app = app
+        self.marker = marker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        is_read = scope.get("method") in SAFE_METHODS
+        primary_token = _use_primary.set(not is_read)
+        last_write_token = _last_write.set(self.marker.read(scope) if is_read else None)
+
+        async def send_and_mark(message):
+            if (message["type"] == "http.response.start" and not is_read
+                    and message["status"] < 400):
+                token = self.marker.issue(time.time())
+                headers = MutableHeaders(scope=message)
+                headers.append("set-cookie", self.marker.cookie(token))
+                headers[WriteMarker.HEADER] = token
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_mark)
+        finally:
+            _last_write.reset(last_write_token)
+            _use_primary.reset(primary_token)
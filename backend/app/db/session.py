@@ -1,18 +1,64 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import DB_POOL_WAIT, DB_READ_ROUTES, observe_duration
+from app.db.routing import ReplicaSet, WriteMarker, last_write_at, reads_use_primary
 from app.models.base import Base  # Base'i models/base.py'den import et
 
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=settings.DB_ECHO
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT
 )
 
+# Okuma replikaları (erişilemeyen replika isteği uzun süre bekletmesin). Havuz boyutu
+# primary ile aynıdır; serve.py bunu bütçeyi primary + replika sayısına bölerek hesaplar
+replica_engines = [
+    create_engine(
+        url.strip(),
+        echo=settings.DB_ECHO,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        connect_args={"connect_timeout": 3}
+    )
+    for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()
+]
+replicas = ReplicaSet(
+    replica_engines,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_CHECK_INTERVAL_SECONDS
+)
+write_marker = WriteMarker(settings.READ_YOUR_WRITES_SECONDS, settings.SECRET_KEY)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _open_session(bind=None):
+    db = SessionLocal(bind=bind) if bind is not None else SessionLocal()
+    # Havuzdan bağlantı alma süresini ölç (ilk sorguda zaten alınacaktı)
+    with observe_duration(DB_POOL_WAIT):
+        db.connection()
+    return db
+
 # Dependency
 def get_db():
-    db = SessionLocal()
+    db = _open_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db():
+    """
+    Salt okunur endpoint'ler için oturum: uygun bir replika varsa ona,
+    yazma isteklerinde, istemcinin son yazmasını henüz yakalamamış
+    replikalarda veya tüm replikalar geride/erişilemezken primary'e bağlanır.
+    """
+    replica = None if reads_use_primary() else replicas.choose(not_before=last_write_at())
+    DB_READ_ROUTES.labels("replica" if replica is not None else "primary").inc()
+    db = _open_session(replica)
     try:
         yield db
     finally:
@@ -1,14 +1,114 @@
-from fastapi import FastAPI
+import time
+
+# Başlangıç profili için: modül importları bu noktadan itibaren ölçülür
+_import_started = time.perf_counter()
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, status
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from app.api.v1.routes import auth, users, tickets, test
+from app.core.config import settings
+from app.core.instrumentation import QueryStatsMiddleware, install_sql_instrumentation
+from app.core.metrics import MetricsMiddleware, install_pool_metrics, render_metrics
+from app.core.compression import CompressionMiddleware
+from app.db.session import engine, SessionLocal, replica_engines, replicas, write_marker
+from app.db.routing import ReplicaRoutingMiddleware
+from app.db.warmup import run_warmup, prewarm_replicas
+from app.services.purge import purge_deleted
+from app.services.user_import import create_hash_pool
+
+logging.basicConfig(
+    level=settings.LOG_LEVEL,
+    format="%(asctime)s %(levelname)s %(name)s %(message)s"
+)
+
+logger = logging.getLogger("app.startup")
+
+UPLOADS_PATH = Path("uploads")
+
+def _purge_once() -> None:
+    """Tek temizlik turu; tur başına parti sayısı sınırlıdır, kalan iş sonraki tura kalır"""
+    db = SessionLocal()
+    try:
+        purge_deleted(
+            db,
+            after_hours=settings.PURGE_AFTER_HOURS,
+            batch_size=settings.PURGE_BATCH_SIZE,
+            pause_seconds=settings.PURGE_BATCH_PAUSE_SECONDS,
+            max_batches=settings.PURGE_MAX_BATCHES_PER_RUN
+        )
+    finally:
+        db.close()
+
+async def _replica_lag_loop() -> None:
+    """Replika gecikmesini istek yolunun dışında ölç; yönlendirme sadece son ölçümü okur"""
+    while True:
+        await asyncio.sleep(replicas.check_interval)
+        try:
+            await run_in_threadpool(replicas.check_lag)
+        except Exception:
+            logger.exception("Replika gecikme kontrolü başarısız")
+
+async def _purge_loop() -> None:
+    """Silinmiş kayıtları istek yolunun dışında, arka planda kalıcı sil"""
+    while True:
+        await asyncio.sleep(settings.PURGE_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(_purge_once)
+        except Exception:
+            # Hata döngüyü durdurmaz; SKIP LOCKED sayesinde diğer worker'lar da devam eder
+            logger.exception("Purge turu başarısız")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Worker ısınması: hazır olmadan trafik alma, adım sürelerini raporla"""
+    app.state.ready = False
+    timings = {"import": (time.perf_counter() - _import_started) * 1000}
+    
+    started = time.perf_counter()
+    UPLOADS_PATH.mkdir(exist_ok=True)
+    timings["uploads_dir"] = (time.perf_counter() - started) * 1000
+    
+    # Bloklayan DB işlemleri event loop dışında
+    timings.update(await run_in_threadpool(run_warmup, engine, SessionLocal))
+    if replica_engines:
+        timings["replicas"] = await run_in_threadpool(prewarm_replicas, replicas)
+    timings["total"] = (time.perf_counter() - _import_started) * 1000
+    
+    app.state.startup_timings = {phase: round(ms, 2) for phase, ms in timings.items()}
+    app.state.ready = True
+    logger.info(json.dumps({"event": "startup", "timings_ms": app.state.startup_timings}))
+    
+    # Toplu içe aktarmaların paylaştığı sınırlı hash havuzu (istek başına işlem açılmaz)
+    app.state.hash_pool = create_hash_pool(settings.USER_IMPORT_WORKERS)
+    
+    purge_task = asyncio.create_task(_purge_loop()) if settings.PURGE_INTERVAL_SECONDS > 0 else None
+    lag_task = asyncio.create_task(_replica_lag_loop()) if replica_engines else None
+    
+    yield
+    
+    # Kapanışta readiness'i düşür ki load balancer yeni istek göndermesin
+    app.state.ready = False
+    for task in (purge_task, lag_task):
+        if task is not None:
+            task.cancel()
+    if app.state.hash_pool is not None:
+        app.state.hash_pool.shutdown(wait=False, cancel_futures=True)
 
 app = FastAPI(
     title="Yardım Masası API",
     description="Teknik destek ve yardım masası uygulaması API'si",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
+app.state.ready = False
+app.state.hash_pool = None
 
 # CORS ayarları
 app.add_middleware(
@@ -20,16 +120,30 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+# İstek bazlı SQL sayacı, Server-Timing başlığı ve N+1 tespiti
+for db_engine in (engine, *replica_engines):
+    install_sql_instrumentation(db_engine)
+app.add_middleware(QueryStatsMiddleware)
+
+# Prometheus metrikleri (gecikme, havuz, bcrypt, yükleme, cache)
+for db_engine in (engine, *replica_engines):
+    install_pool_metrics(db_engine)
+app.add_middleware(MetricsMiddleware)
+
+# Liste yanıtları için Accept-Encoding'e göre br/gzip sıkıştırma
+app.add_middleware(CompressionMiddleware)
+
+# Okumaları replikalara yönlendir; yazma yapan istemci son yazmasını yakalamamış replikaya gitmez
+app.add_middleware(ReplicaRoutingMiddleware, marker=write_marker)
+
 # API rotalarını dahil et
 app.include_router(auth.router, prefix="/api/v1", tags=["auth"])
 app.include_router(users.router, prefix="/api/v1", tags=["users"])
 app.include_router(tickets.router, prefix="/api/v1", tags=["tickets"])
 app.include_router(test.router, prefix="/api/v1", tags=["test"])
 
-# Static files için uploads klasörünü mount et
-uploads_path = Path("uploads")
-uploads_path.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Static files için uploads klasörünü mount et (klasör lifespan'de oluşturulur)
+app.mount("/uploads", StaticFiles(directory=UPLOADS_PATH, check_dir=False), name="uploads")
 
 @app.get("/")
 async def root():
@@ -39,6 +153,20 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """Isınma tamamlandıysa 200, aksi halde 503"""
+    if not app.state.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting"}
+    return {"status": "ready", "startup_timings_ms": app.state.startup_timings}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text formatında metrikler"""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
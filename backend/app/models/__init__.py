@@ -4,5 +4,7 @@ from .user import User
 from .ticket import Ticket
 from .role import Role
 from .ticket_comment import TicketComment
+from .archive import ArchivedTicket, ArchivedTicketComment
+from .idempotency import IdempotencyKey
 
-__all__ = ["BaseModel", "User", "Ticket", "Role", "TicketComment"]
+__all__ = ["BaseModel", "User", "Ticket", "Role", "TicketComment", "ArchivedTicket", "ArchivedTicketComment", "IdempotencyKey"]
@@ -0,0 +1,62 @@
+from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.models.base import Base
+from app.models.ticket import TicketStatus, TicketPriority, TicketCategory
+
+class ArchivedTicket(Base):
+    """
+    Arşivlenmiş (soğuk) ticket'lar. Kolonlar tickets tablosuyla aynıdır,
+    id korunur; böylece eski bağlantılar arşivden de çözülebilir.
+    """
+    __tablename__ = "tickets_archive"
+    __table_args__ = (
+        Index("ix_tickets_archive_created_by_id_created_at", "created_by_id", "created_at"),
+        Index("ix_tickets_archive_created_at", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    title = Column(String(500), nullable=False)
+    description = Column(Text, nullable=False)
+    status = Column(SQLEnum(TicketStatus))
+    priority = Column(SQLEnum(TicketPriority))
+    category = Column(SQLEnum(TicketCategory))
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    assigned_to_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    escalated_to_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    last_updated_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    resolution = Column(Text, nullable=True)
+    attachment_urls = Column(Text, nullable=True)
+    duplicate_of_id = Column(Integer, nullable=True)
+    version = Column(Integer, nullable=False, server_default="1")
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Arşive sadece silinmemişler taşınır
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # İlişkiler (salt okunur; kullanıcı tarafında karşılığı yok)
+    created_by = relationship("User", foreign_keys=[created_by_id])
+    assigned_to = relationship("User", foreign_keys=[assigned_to_id])
+    escalated_to = relationship("User", foreign_keys=[escalated_to_id])
+    last_updated_by = relationship("User", foreign_keys=[last_updated_by_id])
+    
+    def __repr__(self):
+        return f"<ArchivedTicket(title='{self.title}', status='{self.status}')>"
+
+class ArchivedTicketComment(Base):
+    """Arşivlenen ticket'ların yorumları"""
+    __tablename__ = "ticket_comments_archive"
+    __table_args__ = (
+        Index("ix_ticket_comments_archive_ticket_id_created_at", "ticket_id", "created_at", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    ticket_id = Column(Integer, ForeignKey("tickets_archive.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    content = Column(Text, nullable=False)
+    is_internal = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    user = relationship("User")
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, JSON
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+class IdempotencyKey(Base):
+    """
+    Idempotency-Key ile gelen isteklerin sonucu. Aynı kullanıcı aynı anahtarla
+    tekrar denediğinde istek yeniden çalıştırılmaz, saklanan yanıt döner.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    scope = Column(String(100), nullable=False)  # Endpoint (ör. tickets.create)
+    fingerprint = Column(String(64), nullable=False)  # İstek gövdesinin özeti
+    status = Column(String(20), nullable=False)  # in_progress / completed
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+    locked_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
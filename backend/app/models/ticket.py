@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index, Enum as SQLEnum, text
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -25,6 +25,20 @@ class TicketCategory(str, enum.Enum):
 
 class Ticket(BaseModel):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # Arşivleme adaylarını taramak için (sadece kapalı ticket'lar)
+        Index("ix_tickets_closed_updated_at", "updated_at", postgresql_where=text("status = 'CLOSED'")),
+        # Agent başına açık ticket sayımı (otomatik atama uzlaştırması)
+        Index(
+            "ix_tickets_open_assigned_to_id",
+            "assigned_to_id",
+            postgresql_where=text("status IN ('OPEN', 'IN_PROGRESS', 'WAITING')")
+        ),
+        # Kopya index'inin worker'lar arası senkronizasyonu (son değişen ticket'lar)
+        Index("ix_tickets_updated_at", "updated_at"),
+        # Çöp toplayıcının (purge_deleted.py) silinmiş ticket taraması
+        Index("ix_tickets_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
     
     title = Column(String(500), nullable=False)
     description = Column(Text, nullable=False)
@@ -32,22 +46,37 @@ class Ticket(BaseModel):
     priority = Column(SQLEnum(TicketPriority), default=TicketPriority.MEDIUM)
     category = Column(SQLEnum(TicketCategory), default=TicketCategory.OTHER)
     
-    # Kullanıcı ilişkileri
-    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    assigned_to_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    escalated_to_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    last_updated_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    # Kullanıcı ilişkileri. Kullanıcı silinince atama/yükseltme/son güncelleyen
+    # veritabanında NULL'lanır; ticket açmış kullanıcı silinemez
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    assigned_to_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    escalated_to_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    last_updated_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     
     # Ek bilgiler
     resolution = Column(Text, nullable=True)
     attachment_urls = Column(Text, nullable=True)  # JSON array olarak saklanacak
     
+    # Kopya olarak işaretlenen/birleştirilen ticket'ın asıl ticket'ı. Asıl ticket
+    # arşive taşınabildiği için FK yok; /tickets/{id} arşivden de çözer
+    duplicate_of_id = Column(Integer, nullable=True, index=True)
+    
+    # İyimser kilitleme: her UPDATE "WHERE version = :v" ile yapılır ve sürümü artırır
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
+    # Soft-delete: silinen ticket hemen görünmez olur, satır ve yorumları arka
+    # planda partiler hâlinde kalıcı silinir
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    
     # İlişkiler
     created_by = relationship("User", foreign_keys=[created_by_id], back_populates="created_tickets")
     assigned_to = relationship("User", foreign_keys=[assigned_to_id], back_populates="assigned_tickets")
     escalated_to = relationship("User", foreign_keys=[escalated_to_id], back_populates="escalated_tickets")
     last_updated_by = relationship("User", foreign_keys=[last_updated_by_id], back_populates="updated_tickets")
-    comments = relationship("TicketComment", back_populates="ticket", cascade="all, delete-orphan")
+    # Yorumlar veritabanında ON DELETE CASCADE ile silinir; ORM yüklemez
+    comments = relationship("TicketComment", back_populates="ticket", cascade="all, delete-orphan", passive_deletes=True)
+    
+    __mapper_args__ = {"version_id_col": version}
     
     def __repr__(self):
         return f"<Ticket(title='{self.title}', status='{self.status}')>"
@@ -1,14 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.base import Base
 
 class TicketComment(Base):
     __tablename__ = "ticket_comments"
+    __table_args__ = (
+        # Yorum listesi ve cursor sayfalama için
+        Index("ix_ticket_comments_ticket_id_created_at", "ticket_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    ticket_id = Column(Integer, ForeignKey("tickets.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    ticket_id = Column(Integer, ForeignKey("tickets.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
     is_internal = Column(Boolean, default=False)  # Internal notes only visible to staff
     created_at = Column(DateTime(timezone=True), server_default=func.now())
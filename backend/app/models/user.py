@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text, Integer, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, Text, Integer, DateTime, ForeignKey, JSON, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -38,13 +38,18 @@ class User(BaseModel):
     phone = Column(String(20), nullable=True)
     department = Column(String(100), nullable=True)
     profile_image = Column(Text, nullable=True)  # Base64 veya URL
+    # Agent'ın otomatik atamada baktığı ticket kategorileri (boş = hepsi)
+    ticket_categories = Column(JSON, nullable=True)
+    # Soft-delete: hesap hemen pasifleşir; geçmişi olmayan hesaplar arka planda kalıcı silinir
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
     
     # İlişkiler
     role_obj = relationship("Role", back_populates="users")
     created_tickets = relationship("Ticket", foreign_keys="Ticket.created_by_id", back_populates="created_by")
-    assigned_tickets = relationship("Ticket", foreign_keys="Ticket.assigned_to_id", back_populates="assigned_to")
-    escalated_tickets = relationship("Ticket", foreign_keys="Ticket.escalated_to_id", back_populates="escalated_to")
-    updated_tickets = relationship("Ticket", foreign_keys="Ticket.last_updated_by_id", back_populates="last_updated_by")
+    # Kullanıcı silinince bu ticket'lardaki referansları veritabanı NULL'lar (ON DELETE SET NULL)
+    assigned_tickets = relationship("Ticket", foreign_keys="Ticket.assigned_to_id", back_populates="assigned_to", passive_deletes=True)
+    escalated_tickets = relationship("Ticket", foreign_keys="Ticket.escalated_to_id", back_populates="escalated_to", passive_deletes=True)
+    updated_tickets = relationship("Ticket", foreign_keys="Ticket.last_updated_by_id", back_populates="last_updated_by", passive_deletes=True)
     ticket_comments = relationship("TicketComment", back_populates="user")
     
     def __repr__(self):
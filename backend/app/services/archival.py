@@ -0,0 +1,93 @@
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.models.ticket import Ticket
+from app.models.ticket_comment import TicketComment
+
+logger = logging.getLogger("app.archival")
+
+TICKET_COLUMNS = ", ".join(column.name for column in Ticket.__table__.columns)
+COMMENT_COLUMNS = ", ".join(column.name for column in TicketComment.__table__.columns)
+
+# Tek ifadede: aday ticket'ları kilitle, yorumlarını ve kendilerini sıcak
+# tablolardan silip arşive yaz. Başka işlemin kilitlediği satırlar atlanır;
+# silinmiş ticket'lar arşive değil purge'e kalır.
+ARCHIVE_BATCH_SQL = text(f"""
+    WITH batch AS (
+        SELECT id FROM tickets
+        WHERE status = 'CLOSED' AND updated_at < :cutoff AND deleted_at IS NULL
+        ORDER BY updated_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ),
+    moved_tickets AS (
+        DELETE FROM tickets WHERE id IN (SELECT id FROM batch)
+        RETURNING {TICKET_COLUMNS}
+    ),
+    archived_tickets AS (
+        INSERT INTO tickets_archive ({TICKET_COLUMNS})
+        SELECT {TICKET_COLUMNS} FROM moved_tickets
+        RETURNING id
+    ),
+    moved_comments AS (
+        DELETE FROM ticket_comments WHERE ticket_id IN (SELECT id FROM batch)
+        RETURNING {COMMENT_COLUMNS}
+    ),
+    archived_comments AS (
+        INSERT INTO ticket_comments_archive ({COMMENT_COLUMNS})
+        SELECT {COMMENT_COLUMNS} FROM moved_comments
+        RETURNING id
+    )
+    SELECT
+        (SELECT count(*) FROM archived_tickets) AS tickets,
+        (SELECT count(*) FROM archived_comments) AS comments
+""")
+
+@dataclass
+class ArchiveResult:
+    tickets: int = 0
+    comments: int = 0
+    batches: int = 0
+
+def archive_cutoff(older_than_days: int, now: Optional[datetime] = None) -> datetime:
+    """Bu tarihten önce son güncellenen kapalı ticket'lar arşivlenir"""
+    return (now or datetime.utcnow()) - timedelta(days=older_than_days)
+
+def archive_closed_tickets(
+    db: Session,
+    older_than_days: int,
+    batch_size: int = 500,
+    pause_seconds: float = 0.5,
+    max_batches: Optional[int] = None
+) -> ArchiveResult:
+    """
+    Kapalı ve belirtilen günden eski ticket'ları yorumlarıyla birlikte arşiv
+    tablolarına taşır. Her parti ayrı transaction'dır; partiler arasında
+    beklenerek primary ve replikalar üzerindeki yük sınırlanır.
+    """
+    cutoff = archive_cutoff(older_than_days)
+    result = ArchiveResult()
+
+    while max_batches is None or result.batches < max_batches:
+        started = time.perf_counter()
+        row = db.execute(ARCHIVE_BATCH_SQL, {"cutoff": cutoff, "batch_size": batch_size}).one()
+        db.commit()
+
+        result.batches += 1
+        result.tickets += row.tickets
+        result.comments += row.comments
+        logger.info(
+            "Arşiv partisi %d: %d ticket, %d yorum (%.0f ms)",
+            result.batches, row.tickets, row.comments, (time.perf_counter() - started) * 1000
+        )
+
+        if row.tickets < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    return result
@@ -0,0 +1,146 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import ASSIGNMENT_DECISIONS
+from app.models.ticket import Ticket, TicketStatus, TicketCategory
+from app.core.visibility import ticket_not_deleted
+from app.models.user import User, UserStatus
+from app.services.role_cache import role_cache
+
+logger = logging.getLogger("app.assignment")
+
+# Bu durumlardaki ticket'lar agent'ın yükünü oluşturur
+OPEN_STATUSES = (TicketStatus.OPEN, TicketStatus.IN_PROGRESS, TicketStatus.WAITING)
+
+ALL_CATEGORIES: FrozenSet[TicketCategory] = frozenset(TicketCategory)
+
+def load_owner(ticket) -> Optional[int]:
+    """Ticket'ı yükünde sayan agent (açık değilse veya atanmamışsa None)"""
+    if ticket.status in OPEN_STATUSES:
+        return ticket.assigned_to_id
+    return None
+
+def parse_categories(raw) -> FrozenSet[TicketCategory]:
+    """users.ticket_categories değerini kategori kümesine çevir (boş = tüm kategoriler)"""
+    categories = set()
+    for value in raw or []:
+        try:
+            categories.add(TicketCategory(value))
+        except ValueError:
+            continue
+    return frozenset(categories) or ALL_CATEGORIES
+
+class AssignmentEngine:
+    """
+    Aktif agent'ların açık ticket sayılarını kategori bazlı min-heap'lerde tutar.
+    Seçim ve yük değişimi O(log n)'dir; eski heap kayıtları sıra numarası
+    eşleşmediği için tembel olarak atlanır. Her worker kendi kopyasını tutar,
+    sapmalar periyodik uzlaştırma ile düzelir.
+    """
+
+    def __init__(self, reconcile_interval: float):
+        self.reconcile_interval = reconcile_interval
+        self._loads: Dict[int, int] = {}
+        self._categories: Dict[int, FrozenSet[TicketCategory]] = {}
+        self._latest: Dict[int, int] = {}
+        self._heaps: Dict[TicketCategory, List[Tuple[int, int, int]]] = {}
+        # Eşit yükte en uzun süredir iş almayan agent öne geçer
+        self._sequence = itertools.count()
+        self._reconciled_at = 0.0
+        self._lock = threading.Lock()
+
+    def _push(self, agent_id: int) -> None:
+        sequence = next(self._sequence)
+        self._latest[agent_id] = sequence
+        entry = (self._loads[agent_id], sequence, agent_id)
+        for category in self._categories[agent_id]:
+            heapq.heappush(self._heaps.setdefault(category, []), entry)
+
+    def _adjust(self, agent_id: Optional[int], delta: int) -> None:
+        if agent_id is None or agent_id not in self._loads:
+            return
+        self._loads[agent_id] = max(0, self._loads[agent_id] + delta)
+        self._push(agent_id)
+
+    def reconcile(self, db: Session) -> int:
+        """Aktif agent'ları ve açık ticket sayılarını tek sorguda yükleyip index'i yeniden kur"""
+        agent_role = role_cache.get_by_name(db, "agent")
+        rows = []
+        if agent_role is not None:
+            rows = db.execute(
+                select(User.id, User.ticket_categories, func.count(Ticket.id))
+                .outerjoin(Ticket, and_(
+                    Ticket.assigned_to_id == User.id,
+                    Ticket.status.in_(OPEN_STATUSES),
+                    ticket_not_deleted()
+                ))
+                .where(
+                    User.role_id == agent_role.id,
+                    User.is_active == True,
+                    User.status == UserStatus.ACTIVE
+                )
+                .group_by(User.id)
+            ).all()
+
+        with self._lock:
+            drift = sum(
+                abs(self._loads.get(agent_id, 0) - open_count)
+                for agent_id, _, open_count in rows
+            )
+            self._loads = {agent_id: open_count for agent_id, _, open_count in rows}
+            self._categories = {agent_id: parse_categories(raw) for agent_id, raw, _ in rows}
+            self._latest = {}
+            self._heaps = {}
+            for agent_id in self._loads:
+                self._push(agent_id)
+            self._reconciled_at = time.monotonic()
+
+        if drift:
+            logger.info("Atama index'i uzlaştırıldı: %d agent, sapma %d ticket", len(rows), drift)
+        return len(rows)
+
+    def invalidate(self) -> None:
+        """Agent veya toplu ticket değişikliğinden sonra bir sonraki seçimde yeniden yükle"""
+        self._reconciled_at = 0.0
+
+    def choose(self, db: Session, category: TicketCategory) -> Optional[int]:
+        """
+        Kategoriye bakan en az yüklü agent'ı seç ve yüküne bir ticket ekle.
+        Ticket kaydedilemezse çağıran release() ile geri almalıdır.
+        """
+        if time.monotonic() - self._reconciled_at > self.reconcile_interval:
+            self.reconcile(db)
+
+        with self._lock:
+            heap = self._heaps.get(category, [])
+            while heap:
+                load, sequence, agent_id = heap[0]
+                if self._latest.get(agent_id) != sequence:
+                    heapq.heappop(heap)
+                    continue
+                self._adjust(agent_id, +1)
+                ASSIGNMENT_DECISIONS.labels("assigned").inc()
+                return agent_id
+
+        ASSIGNMENT_DECISIONS.labels("no_agent").inc()
+        return None
+
+    def release(self, agent_id: Optional[int]) -> None:
+        with self._lock:
+            self._adjust(agent_id, -1)
+
+    def move(self, old_owner: Optional[int], new_owner: Optional[int]) -> None:
+        """Bir ticket'ın yük sahibinin değişimini uygula (load_owner önce/sonra)"""
+        if old_owner == new_owner:
+            return
+        with self._lock:
+            self._adjust(old_owner, -1)
+            self._adjust(new_owner, +1)
+
+assignment_engine = AssignmentEngine(settings.ASSIGNMENT_RECONCILE_SECONDS)
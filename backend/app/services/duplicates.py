@@ -0,0 +1,212 @@
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.ticket import Ticket
+from app.core.visibility import ticket_not_deleted
+from app.services.assignment import OPEN_STATUSES
+
+# 16 bant x 4 satır: ~%50 Jaccard benzerliğinde aday olma olasılığı yarıya yakındır
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+SIGNATURE_SIZE = NUM_BANDS * ROWS_PER_BAND
+SHINGLE_SIZE = 4
+# Açıklamanın sadece başı kullanılır; uzun log dökümleri imzayı değiştirmesin
+MAX_TEXT_LENGTH = 1000
+
+# updated_at uygulama saatinden ve commit'ten önce yazılır; geç commit edilen
+# satırlar ve worker'lar arası saat farkı için senkronizasyon bu kadar geriden başlar
+SYNC_OVERLAP = timedelta(seconds=60)
+
+_HASH_BITS = 32 - SIGNATURE_SIZE.bit_length() + 1
+_EMPTY = 1 << 40
+_NON_WORD = re.compile(r"[^\w]+")
+
+Signature = Tuple[int, ...]
+
+def _normalize(title: str, description: str) -> str:
+    text = f"{title} {description[:MAX_TEXT_LENGTH]}".casefold()
+    return _NON_WORD.sub(" ", text).strip()
+
+def signature(title: str, description: str) -> Optional[Signature]:
+    """
+    Tek permütasyonlu MinHash imzası: her shingle bir kez hash'lenip bir kutuya
+    düşer, kutu başına en küçük değer tutulur; boş kutular sağdaki dolu kutudan
+    uzaklık eklenerek doldurulur. Maliyet metin uzunluğuyla doğrusal, imza boyundan bağımsız.
+    """
+    text = _normalize(title or "", description or "")
+    if not text:
+        return None
+    if len(text) < SHINGLE_SIZE:
+        text = text.ljust(SHINGLE_SIZE)
+
+    bins = [_EMPTY] * SIGNATURE_SIZE
+    for start in range(len(text) - SHINGLE_SIZE + 1):
+        value = zlib.crc32(text[start:start + SHINGLE_SIZE].encode("utf-8"))
+        slot = value % SIGNATURE_SIZE
+        value //= SIGNATURE_SIZE
+        if value < bins[slot]:
+            bins[slot] = value
+
+    # Densification: boş kutu, döngüsel olarak sonraki dolu kutunun değerini alır
+    filled = {slot for slot, value in enumerate(bins) if value != _EMPTY}
+    for slot in range(SIGNATURE_SIZE):
+        if bins[slot] != _EMPTY:
+            continue
+        for distance in range(1, SIGNATURE_SIZE):
+            source = (slot + distance) % SIGNATURE_SIZE
+            if source in filled:
+                bins[slot] = bins[source] + distance * (1 << _HASH_BITS)
+                break
+    return tuple(bins)
+
+def similarity(left: Signature, right: Signature) -> float:
+    """İmzaların eşleşen konum oranı (Jaccard benzerliği tahmini)"""
+    return sum(1 for a, b in zip(left, right) if a == b) / SIGNATURE_SIZE
+
+def _band_keys(sig: Signature):
+    for band in range(NUM_BANDS):
+        start = band * ROWS_PER_BAND
+        yield band, sig[start:start + ROWS_PER_BAND]
+
+@dataclass
+class DuplicateMatch:
+    ticket_id: int
+    similarity: float
+
+class DuplicateIndex:
+    """
+    Açık ticket'ların başlık+açıklama MinHash imzaları üzerinde LSH index'i.
+    Sorgu sadece aynı bant kovasına düşen adayları karşılaştırır; açık
+    backlog büyüdükçe tarama maliyeti artmaz. Her worker kendi kopyasını
+    tutar; diğer worker'larda oluşturulan veya durumu değişen ticket'lar
+    updated_at sınırından itibaren çekilir.
+    """
+
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self._signatures: Dict[int, Signature] = {}
+        self._buckets: Dict[Tuple[int, Signature], Set[int]] = defaultdict(set)
+        self._watermark: Optional[datetime] = None
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def _add(self, ticket_id: int, sig: Signature) -> None:
+        self._remove(ticket_id)
+        self._signatures[ticket_id] = sig
+        for key in _band_keys(sig):
+            self._buckets[key].add(ticket_id)
+
+    def _remove(self, ticket_id: int) -> None:
+        sig = self._signatures.pop(ticket_id, None)
+        if sig is None:
+            return
+        for key in _band_keys(sig):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(ticket_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _load(self, db: Session) -> int:
+        rows = db.execute(
+            select(Ticket.id, Ticket.title, Ticket.description)
+            .where(Ticket.status.in_(OPEN_STATUSES), ticket_not_deleted())
+            .order_by(Ticket.id)
+            .execution_options(yield_per=2000)
+        )
+        count = 0
+        for ticket_id, title, description in rows:
+            sig = signature(title, description)
+            if sig is not None:
+                with self._lock:
+                    self._add(ticket_id, sig)
+                count += 1
+        return count
+
+    def _load_changes(self, db: Session, since: datetime) -> int:
+        """since'ten sonra oluşturulan/güncellenen ticket'ları ekle; açık olmayanları çıkar"""
+        rows = db.execute(
+            select(Ticket.id, Ticket.title, Ticket.description, Ticket.status, Ticket.deleted_at)
+            .where(Ticket.updated_at >= since - SYNC_OVERLAP)
+            .execution_options(yield_per=2000)
+        )
+        count = 0
+        for ticket_id, title, description, ticket_status, deleted_at in rows:
+            is_open = ticket_status in OPEN_STATUSES and deleted_at is None
+            sig = signature(title, description) if is_open else None
+            with self._lock:
+                if sig is None:
+                    self._remove(ticket_id)
+                else:
+                    self._add(ticket_id, sig)
+            count += 1
+        return count
+
+    def rebuild(self, db: Session) -> int:
+        """Açık ticket'ların tamamından index'i kur (başlangıçta bir kez)"""
+        started = datetime.utcnow()
+        with self._lock:
+            self._signatures = {}
+            self._buckets = defaultdict(set)
+        count = self._load(db)
+        self._watermark = started
+        self._synced_at = time.monotonic()
+        return count
+
+    def sync(self, db: Session) -> None:
+        """
+        Başka worker'larda oluşturulan, kapanan, yeniden açılan veya silinen
+        ticket'ları son senkronizasyondan beri değişen satırlardan uygula.
+        Yerel eklemeler sınırı ilerletmez; sınır sadece okuma başlangıcıdır.
+        """
+        if time.monotonic() - self._synced_at <= self.sync_interval:
+            return
+        self._synced_at = time.monotonic()
+        if self._watermark is None:
+            self.rebuild(db)
+            return
+        started = datetime.utcnow()
+        self._load_changes(db, self._watermark)
+        self._watermark = started
+
+    def update(self, ticket) -> None:
+        """Ticket açıksa imzasını yenile, değilse index'ten çıkar"""
+        sig = signature(ticket.title, ticket.description) if ticket.status in OPEN_STATUSES else None
+        with self._lock:
+            if sig is None:
+                self._remove(ticket.id)
+            else:
+                self._add(ticket.id, sig)
+
+    def discard(self, ticket_ids) -> None:
+        with self._lock:
+            for ticket_id in ticket_ids:
+                self._remove(ticket_id)
+
+    def candidates(self, title: str, description: str, exclude_id: Optional[int] = None) -> List[DuplicateMatch]:
+        """Eşik üstü benzerlikteki adaylar (benzerliğe göre azalan)"""
+        sig = signature(title, description)
+        if sig is None:
+            return []
+        with self._lock:
+            candidate_ids = set()
+            for key in _band_keys(sig):
+                candidate_ids.update(self._buckets.get(key, ()))
+            candidate_ids.discard(exclude_id)
+            matches = [
+                DuplicateMatch(ticket_id, similarity(sig, self._signatures[ticket_id]))
+                for ticket_id in candidate_ids
+            ]
+        matches = [match for match in matches if match.similarity >= settings.DUPLICATE_SIMILARITY_THRESHOLD]
+        matches.sort(key=lambda match: (-match.similarity, -match.ticket_id))
+        return matches
+
+duplicate_index = DuplicateIndex(settings.DUPLICATE_SYNC_SECONDS)
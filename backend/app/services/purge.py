@@ -0,0 +1,98 @@
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("app.purge")
+
+# Silinmiş ticket'ların yorumları önce parti parti silinir; böylece 10 bin yorumlu
+# bir ticket bile tek transaction'da tabloyu uzun süre meşgul etmez
+PURGE_COMMENTS_SQL = text("""
+    DELETE FROM ticket_comments WHERE id IN (
+        SELECT c.id FROM ticket_comments c
+        JOIN tickets t ON t.id = c.ticket_id
+        WHERE t.deleted_at < :cutoff
+        LIMIT :batch_size
+        FOR UPDATE OF c SKIP LOCKED
+    )
+""")
+
+# Yorumu kalmayan ticket'lar; kalan yorum varsa ON DELETE CASCADE temizler
+PURGE_TICKETS_SQL = text("""
+    DELETE FROM tickets WHERE id IN (
+        SELECT t.id FROM tickets t
+        WHERE t.deleted_at < :cutoff
+          AND NOT EXISTS (SELECT 1 FROM ticket_comments c WHERE c.ticket_id = t.id)
+        ORDER BY t.deleted_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+""")
+
+# Ticket açmamış ve yorum yazmamış silinmiş hesaplar. Atama, yükseltme ve son
+# güncelleyen referansları ON DELETE SET NULL ile boşalır; geçmişi olan hesaplar
+# pasif kayıt olarak kalır
+PURGE_USERS_SQL = text("""
+    DELETE FROM users WHERE id IN (
+        SELECT u.id FROM users u
+        WHERE u.deleted_at < :cutoff
+          AND NOT EXISTS (SELECT 1 FROM tickets t WHERE t.created_by_id = u.id)
+          AND NOT EXISTS (SELECT 1 FROM tickets_archive t WHERE t.created_by_id = u.id)
+          AND NOT EXISTS (SELECT 1 FROM ticket_comments c WHERE c.user_id = u.id)
+          AND NOT EXISTS (SELECT 1 FROM ticket_comments_archive c WHERE c.user_id = u.id)
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+""")
+
+@dataclass
+class PurgeResult:
+    comments: int = 0
+    tickets: int = 0
+    users: int = 0
+    batches: int = 0
+
+def purge_cutoff(after_hours: float, now: Optional[datetime] = None) -> datetime:
+    """Bu tarihten önce silinmiş kayıtlar kalıcı silinir"""
+    return (now or datetime.now(timezone.utc)) - timedelta(hours=after_hours)
+
+def purge_deleted(
+    db: Session,
+    after_hours: float,
+    batch_size: int = 1000,
+    pause_seconds: float = 0.2,
+    max_batches: Optional[int] = None
+) -> PurgeResult:
+    """
+    Soft-delete edilmiş yorumları, ticket'ları ve kullanıcıları partiler hâlinde
+    kalıcı siler. Her parti en fazla batch_size satırlık ayrı bir transaction'dır;
+    partiler arasında beklenir. Birden fazla worker aynı anda çalışabilir
+    (SKIP LOCKED), iş kalmayınca veya max_batches dolunca durur.
+    """
+    cutoff = purge_cutoff(after_hours)
+    params = {"cutoff": cutoff, "batch_size": batch_size}
+    result = PurgeResult()
+    
+    for field, statement in (("comments", PURGE_COMMENTS_SQL), ("tickets", PURGE_TICKETS_SQL), ("users", PURGE_USERS_SQL)):
+        while max_batches is None or result.batches < max_batches:
+            started = time.perf_counter()
+            deleted = db.execute(statement, params).rowcount
+            db.commit()
+            
+            result.batches += 1
+            setattr(result, field, getattr(result, field) + deleted)
+            if deleted:
+                logger.info(
+                    "Purge partisi %d: %d %s (%.0f ms)",
+                    result.batches, deleted, field, (time.perf_counter() - started) * 1000
+                )
+            
+            if deleted < batch_size:
+                break
+            if pause_seconds:
+                time.sleep(pause_seconds)
+    
+    return result
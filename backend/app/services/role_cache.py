@@ -0,0 +1,115 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+from sqlalchemy.orm import Session
+from app.core.metrics import record_cache
+from app.models.role import Role
+
+# Roller nadiren değişir; worker'lar arası tutarlılık için kısa süreli tazelenir
+ROLE_CACHE_TTL_SECONDS = 60
+# TTL boyunca hatırlanan bilinmeyen id/ad sayısı; dolunca yeni bilinmeyenler de tazeleme yapmaz
+MAX_NEGATIVE_ENTRIES = 1024
+
+
+@dataclass(frozen=True)
+class CachedRole:
+    """Session'dan bağımsız rol kopyası"""
+    id: int
+    name: str
+    description: Optional[str] = None
+    permissions: List[str] = field(default_factory=list)
+
+    @property
+    def permission_list(self):
+        return list(self.permissions)
+
+    def has_permission(self, permission: str) -> bool:
+        return permission in self.permissions
+
+
+class RoleCache:
+    """
+    roles tablosunun süreç içi kopyası (id ve ada göre). Bulunamayan id/adlar
+    da TTL dolana kadar hatırlanır; bilinmeyen rol filtresi her istekte tabloyu
+    yeniden okutmaz.
+    """
+
+    def __init__(self, ttl: float = ROLE_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._by_id: Dict[int, CachedRole] = {}
+        self._by_name: Dict[str, CachedRole] = {}
+        self._missing_ids: Set[int] = set()
+        self._missing_names: Set[str] = set()
+        self._missing_since = 0.0
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> int:
+        """Tüm rolleri tek sorguda yükle"""
+        roles = [
+            CachedRole(
+                id=role.id,
+                name=role.name,
+                description=role.description,
+                permissions=list(role.permission_list)
+            )
+            for role in db.query(Role).all()
+        ]
+        with self._lock:
+            self._by_id = {role.id: role for role in roles}
+            self._by_name = {role.name: role for role in roles}
+            self._loaded_at = time.monotonic()
+        return len(roles)
+
+    def _ensure_fresh(self, db: Session) -> None:
+        now = time.monotonic()
+        if now - self._loaded_at > self.ttl:
+            self.load(db)
+        # Bilinmeyenler kendi TTL'iyle unutulur; bulunamama tazelemeleri bu süreyi uzatmaz
+        if now - self._missing_since > self.ttl:
+            with self._lock:
+                self._missing_ids = set()
+                self._missing_names = set()
+                self._missing_since = now
+
+    def _may_reload(self, missing: Set) -> bool:
+        # Negatif kayıt sınırı dolduysa bilinmeyenler TTL dolana kadar tazeleme yapmaz
+        return len(missing) < MAX_NEGATIVE_ENTRIES
+
+    def _remember_missing(self, missing: Set, key) -> None:
+        with self._lock:
+            if len(missing) < MAX_NEGATIVE_ENTRIES:
+                missing.add(key)
+
+    def get(self, db: Session, role_id: Optional[int]) -> Optional[CachedRole]:
+        if role_id is None:
+            return None
+        self._ensure_fresh(db)
+        role = self._by_id.get(role_id)
+        record_cache("roles", role is not None)
+        if role is None and role_id not in self._missing_ids and self._may_reload(self._missing_ids):
+            # Yeni eklenmiş olabilir; bir kez tazeleyip tekrar dene
+            self.load(db)
+            role = self._by_id.get(role_id)
+            if role is None:
+                self._remember_missing(self._missing_ids, role_id)
+        return role
+
+    def get_by_name(self, db: Session, name: str) -> Optional[CachedRole]:
+        self._ensure_fresh(db)
+        role = self._by_name.get(name)
+        record_cache("roles", role is not None)
+        if role is None and name not in self._missing_names and self._may_reload(self._missing_names):
+            self.load(db)
+            role = self._by_name.get(name)
+            if role is None:
+                self._remember_missing(self._missing_names, name)
+        return role
+
+    def all(self, db: Session) -> List[CachedRole]:
+        self._ensure_fresh(db)
+        return list(self._by_id.values())
+
+
+role_cache = RoleCache()
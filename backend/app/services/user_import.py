@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, EmailStr, ValidationError
+from sqlalchemy import any_, bindparam, or_, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from app.core.security import get_password_hash
+from app.db.bulk import copy_rows
+from app.models.role import Role
+from app.models.user import User, UserRole, UserStatus
+
+# Yeni rol adlarının eski role enum'undaki karşılıkları
+LEGACY_ROLE_MAP = {
+    "customer": UserRole.USER,
+    "agent": UserRole.AGENT,
+    "supervisor": UserRole.SUPERVISOR,
+    "admin": UserRole.ADMIN,
+}
+
+USER_COPY_COLUMNS = (
+    "username", "email", "full_name", "hashed_password", "role_id", "role",
+    "status", "is_active", "is_admin", "phone", "department",
+    "created_at", "updated_at"
+)
+
+class UserImportRow(BaseModel):
+    username: str
+    email: EmailStr
+    full_name: str
+    password: str
+    role_name: str = "customer"
+    phone: Optional[str] = None
+    department: Optional[str] = None
+
+class UserImportError(BaseModel):
+    line: int
+    detail: str
+
+class UserImportResult(BaseModel):
+    total: int
+    imported: int
+    errors: List[UserImportError] = []
+
+def parse_user_rows(content: str, file_format: str) -> List[dict]:
+    """CSV (başlık satırlı) veya NDJSON içeriği satır sözlüklerine çevir"""
+    if file_format == "csv":
+        reader = csv.DictReader(io.StringIO(content))
+        return [
+            {key: (value if value != "" else None) for key, value in row.items()}
+            for row in reader
+        ]
+    if file_format == "ndjson":
+        rows = []
+        for line in content.splitlines():
+            if line.strip():
+                rows.append(json.loads(line))
+        return rows
+    raise ValueError(f"Desteklenmeyen format: {file_format}")
+
+# Havuz işlemine tek görevde gönderilen parola sayısı (görev başına bir IPC gidiş-dönüşü)
+HASH_CHUNK_SIZE = 64
+
+def create_hash_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """
+    Hash'leme için sınırlı işlem havuzu; 0 veya 1 işçide havuz açılmaz.
+    İşlemler spawn ile başlar: thread'li ve açık DB bağlantılı worker'ı fork'lamaz.
+    """
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+def hash_passwords(passwords: List[str], executor: Optional[Executor] = None) -> List[str]:
+    """
+    bcrypt hash'lerini verilen işlem havuzunda paralel üret (GIL'e takılmadan).
+    Havuz çağıran tarafa aittir (API'de lifespan'de açılan ortak havuz); yoksa sıralı hash'lenir.
+    """
+    if executor is None or len(passwords) < 2:
+        return [get_password_hash(password) for password in passwords]
+    return list(executor.map(get_password_hash, passwords, chunksize=HASH_CHUNK_SIZE))
+
+def import_users(db: Session, rows: List[dict], executor: Optional[Executor] = None) -> UserImportResult:
+    """
+    Kullanıcıları toplu içe aktar: doğrulama, tek sorguda çakışma kontrolü,
+    paralel hash'leme ve COPY ile yükleme. Hatalı satırlar atlanır ve raporlanır.
+    """
+    errors: List[UserImportError] = []
+    valid: List[tuple] = []
+    seen_usernames = set()
+    seen_emails = set()
+
+    # Satır doğrulama ve dosya içi tekrar kontrolü (satır numaraları 1'den başlar)
+    for line, raw in enumerate(rows, start=1):
+        try:
+            row = UserImportRow(**raw)
+        except (ValidationError, TypeError) as e:
+            errors.append(UserImportError(line=line, detail=str(e)))
+            continue
+        if row.username in seen_usernames:
+            errors.append(UserImportError(line=line, detail="Kullanıcı adı dosyada tekrar ediyor"))
+            continue
+        if row.email in seen_emails:
+            errors.append(UserImportError(line=line, detail="E-posta adresi dosyada tekrar ediyor"))
+            continue
+        seen_usernames.add(row.username)
+        seen_emails.add(row.email)
+        valid.append((line, row))
+
+    if not valid:
+        return UserImportResult(total=len(rows), imported=0, errors=errors)
+
+    # Rolleri ve mevcut kullanıcı çakışmalarını tek seferde getir
+    roles: Dict[str, Role] = {role.name: role for role in db.query(Role).all()}
+    conflicts = db.query(User.username, User.email).filter(or_(
+        User.username == any_(bindparam("usernames", list(seen_usernames), type_=ARRAY(String))),
+        User.email == any_(bindparam("emails", list(seen_emails), type_=ARRAY(String)))
+    )).all()
+    taken_usernames = {conflict.username for conflict in conflicts}
+    taken_emails = {conflict.email for conflict in conflicts}
+
+    accepted: List[UserImportRow] = []
+    for line, row in valid:
+        if row.username in taken_usernames:
+            errors.append(UserImportError(line=line, detail="Bu kullanıcı adı zaten kullanılıyor"))
+        elif row.email in taken_emails:
+            errors.append(UserImportError(line=line, detail="Bu e-posta adresi zaten kullanılıyor"))
+        elif row.role_name not in roles:
+            errors.append(UserImportError(line=line, detail=f"'{row.role_name}' rolü bulunamadı"))
+        else:
+            accepted.append(row)
+
+    if not accepted:
+        errors.sort(key=lambda error: error.line)
+        return UserImportResult(total=len(rows), imported=0, errors=errors)
+
+    hashes = hash_passwords([row.password for row in accepted], executor)
+    now = datetime.utcnow()
+
+    imported = copy_rows(db, User.__tablename__, USER_COPY_COLUMNS, (
+        (
+            row.username,
+            row.email,
+            row.full_name,
+            hashed_password,
+            roles[row.role_name].id,
+            LEGACY_ROLE_MAP.get(row.role_name, UserRole.USER),
+            UserStatus.ACTIVE,
+            True,
+            row.role_name == "admin",
+            row.phone,
+            row.department,
+            now,
+            now
+        )
+        for row, hashed_password in zip(accepted, hashes)
+    ))
+    db.commit()
+
+    errors.sort(key=lambda error: error.line)
+    return UserImportResult(total=len(rows), imported=imported, errors=errors)
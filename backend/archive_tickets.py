@@ -0,0 +1,54 @@
+"""
+Eski kapalı ticket'ları yorumlarıyla birlikte arşiv tablolarına taşıyan script
+(cron ile düzenli çalıştırılabilir)
+
+Kullanım:
+    python archive_tickets.py
+    python archive_tickets.py --older-than-days 180 --batch-size 1000 --pause 0.2
+"""
+import argparse
+import logging
+import time
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.archival import archive_closed_tickets, archive_cutoff
+
+def main():
+    parser = argparse.ArgumentParser(description="Kapalı ticket arşivleme")
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                        help="Bu kadar gündür güncellenmeyen kapalı ticket'lar taşınır")
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE, help="Parti başına ticket")
+    parser.add_argument("--pause", type=float, default=settings.ARCHIVE_BATCH_PAUSE_SECONDS,
+                        help="Partiler arası bekleme (sn)")
+    parser.add_argument("--max-batches", type=int, default=None, help="En fazla parti sayısı")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    
+    print(f"🚀 {archive_cutoff(args.older_than_days):%Y-%m-%d} öncesi kapalı ticket'lar arşivleniyor...")
+    started = time.perf_counter()
+    
+    session = SessionLocal()
+    try:
+        result = archive_closed_tickets(
+            session,
+            older_than_days=args.older_than_days,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause,
+            max_batches=args.max_batches
+        )
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Hata oluştu: {e}")
+        raise
+    finally:
+        session.close()
+    
+    print(f"\n📊 Özet:")
+    print(f"- Arşivlenen ticket: {result.tickets}")
+    print(f"- Arşivlenen yorum: {result.comments}")
+    print(f"- Parti: {result.batches}")
+    print(f"- Süre: {time.perf_counter() - started:.1f} sn")
+
+if __name__ == "__main__":
+    main()
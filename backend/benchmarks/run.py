@@ -0,0 +1,308 @@
+"""
+Endpoint bazlı API benchmark'ı
+
+Gerçek FastAPI uygulamasını (lifespan dahil: ısınma, rol cache'i, kopya
+index'i, hash havuzu) ASGI istemcisiyle süreç içinde çalıştırır, her endpoint için p50/p95/p99 gecikme, throughput ve istek başına SQL
+sorgu sayısını raporlar. baseline.json'daki bütçeler aşılırsa 1 ile çıkar.
+
+Önce generate_data.py ile veri üretilmiş olmalıdır (aynı --prefix ile).
+
+Kullanım:
+    python -m benchmarks.run
+    python -m benchmarks.run --iterations 500 --only tickets_list,ticket_detail
+    python -m benchmarks.run --update-baseline
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+import httpx
+from sqlalchemy import event
+from app.core.instrumentation import current_query_stats
+from app.db.session import engine, replica_engines, SessionLocal
+from app.main import app
+from app.models.ticket import Ticket
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+API = "/api/v1"
+PASSWORD = "test123"
+
+# Gecikme ölçümleri gürültülü; bütçe bu oran kadar aşılırsa hata say
+DEFAULT_LATENCY_TOLERANCE = 0.25
+
+
+class StatementCounter:
+    """
+    Primary ve replika engine'lerinde istekler içinde çalışan SQL ifadelerini sayar.
+    Lifespan'in ısınma ve arka plan işleri (purge, replika gecikmesi) istek dışında
+    çalıştığı için sayılmaz.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if current_query_stats() is not None:
+            self.count += 1
+
+
+@dataclass
+class Scenario:
+    name: str
+    role: str
+    build: Callable[["BenchContext"], httpx.Request]
+    # İstek gövdesinde id'si gereken diğer roller (ör. yükseltme hedefi)
+    needs: Tuple[str, ...] = ()
+
+
+@dataclass
+class Result:
+    name: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput: float
+    queries: float
+    errors: int
+
+
+class BenchContext:
+    """Senaryoların ihtiyaç duyduğu token'lar ve örnek id'ler"""
+
+    def __init__(self, client: httpx.AsyncClient, prefix: str):
+        self.client = client
+        self.prefix = prefix
+        self.tokens: Dict[str, str] = {}
+        self.user_ids: Dict[str, int] = {}
+        self.ticket_ids: List[int] = []
+        self.comment_ticket_ids: List[int] = []
+        self._cursor = 0
+        self._reopen_next = False
+
+    def username(self, role: str) -> str:
+        return f"{self.prefix}_{role}_{1:07d}"
+
+    def headers(self, role: str) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[role]}"}
+
+    def next_ticket_id(self) -> int:
+        self._cursor += 1
+        return self.ticket_ids[self._cursor % len(self.ticket_ids)]
+
+    def next_comment_ticket_id(self) -> int:
+        self._cursor += 1
+        return self.comment_ticket_ids[self._cursor % len(self.comment_ticket_ids)]
+
+    def next_status_change(self, role: str) -> httpx.Request:
+        """Aynı ticket'ı sırayla çöz ve yeniden aç; her istek geçerli bir durum değişikliğidir"""
+        ticket_id = self.ticket_ids[0]
+        self._reopen_next = not self._reopen_next
+        if self._reopen_next:
+            return self.client.build_request(
+                "PUT", f"{API}/tickets/{ticket_id}/resolve", headers=self.headers(role),
+                json={"resolution": "Benchmark tarafından çözüldü"}
+            )
+        return self.client.build_request(
+            "PUT", f"{API}/tickets/{ticket_id}/reopen", headers=self.headers(role)
+        )
+
+    async def login_all(self, roles):
+        for role in roles:
+            response = await self.client.post(
+                f"{API}/auth/login",
+                data={"username": self.username(role), "password": PASSWORD}
+            )
+            response.raise_for_status()
+            self.tokens[role] = response.json()["access_token"]
+            self.user_ids[role] = response.json()["user_info"]["id"]
+
+    def load_samples(self, sample_size: int):
+        """Detay ve yorum senaryoları için rastgele olmayan örnek ticket id'leri"""
+        session = SessionLocal()
+        try:
+            self.ticket_ids = [
+                row.id for row in session.query(Ticket.id).order_by(Ticket.id.desc()).limit(sample_size).all()
+            ]
+            self.comment_ticket_ids = [
+                row.id for row in session.query(Ticket.id)
+                .filter(Ticket.comments.any())
+                .order_by(Ticket.id.desc())
+                .limit(sample_size)
+                .all()
+            ] or self.ticket_ids
+        finally:
+            session.close()
+        if not self.ticket_ids:
+            raise SystemExit("❌ Ticket bulunamadı. Önce generate_data.py çalıştırın.")
+
+
+SCENARIOS = [
+    Scenario("login", "customer", lambda ctx: ctx.client.build_request(
+        "POST", f"{API}/auth/login",
+        data={"username": ctx.username("customer"), "password": PASSWORD}
+    )),
+    Scenario("tickets_list", "agent", lambda ctx: ctx.client.build_request(
+        "GET", f"{API}/tickets/", params={"limit": 100}, headers=ctx.headers("agent")
+    )),
+    Scenario("tickets_search", "agent", lambda ctx: ctx.client.build_request(
+        "GET", f"{API}/tickets/", params={"limit": 50, "search": "VPN"}, headers=ctx.headers("agent")
+    )),
+    Scenario("ticket_detail", "supervisor", lambda ctx: ctx.client.build_request(
+        "GET", f"{API}/tickets/{ctx.next_ticket_id()}", headers=ctx.headers("supervisor")
+    )),
+    Scenario("ticket_create", "customer", lambda ctx: ctx.client.build_request(
+        "POST", f"{API}/tickets/", headers=ctx.headers("customer"),
+        json={"title": "Benchmark ticket", "description": "Benchmark tarafından oluşturuldu"}
+    )),
+    Scenario("comments", "supervisor", lambda ctx: ctx.client.build_request(
+        "GET", f"{API}/tickets/{ctx.next_comment_ticket_id()}/comments", headers=ctx.headers("supervisor")
+    )),
+    # Durum değiştiren endpoint'ler: koşullu UPDATE ... RETURNING + tek toplu kullanıcı sorgusu
+    Scenario("ticket_escalate", "supervisor", lambda ctx: ctx.client.build_request(
+        "PUT", f"{API}/tickets/{ctx.next_ticket_id()}/escalate", headers=ctx.headers("supervisor"),
+        json={"escalated_to_id": ctx.user_ids["admin"], "escalation_reason": "Benchmark yükseltmesi"}
+    ), needs=("admin",)),
+    Scenario("ticket_resolve", "supervisor", lambda ctx: ctx.client.build_request(
+        "PUT", f"{API}/tickets/{ctx.next_ticket_id()}/resolve", headers=ctx.headers("supervisor"),
+        json={"resolution": "Benchmark tarafından çözüldü"}
+    )),
+    Scenario("ticket_status_change", "supervisor", lambda ctx: ctx.next_status_change("supervisor")),
+    Scenario("users_directory", "admin", lambda ctx: ctx.client.build_request(
+        "GET", f"{API}/users/", params={"limit": 100}, headers=ctx.headers("admin")
+    )),
+    Scenario("stats", "customer", lambda ctx: ctx.client.build_request(
+        "GET", f"{API}/auth/me/stats", headers=ctx.headers("customer")
+    )),
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_scenario(ctx: BenchContext, scenario: Scenario, counter: StatementCounter,
+                       iterations: int, warmup: int) -> Result:
+    for _ in range(warmup):
+        await ctx.client.send(scenario.build(ctx))
+
+    durations = []
+    errors = 0
+    counter.count = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        request = scenario.build(ctx)
+        request_started = time.perf_counter()
+        response = await ctx.client.send(request)
+        durations.append((time.perf_counter() - request_started) * 1000)
+        if response.status_code >= 400:
+            errors += 1
+    elapsed = time.perf_counter() - started
+
+    return Result(
+        name=scenario.name,
+        iterations=iterations,
+        p50_ms=statistics.median(durations),
+        p95_ms=percentile(durations, 95),
+        p99_ms=percentile(durations, 99),
+        throughput=iterations / elapsed,
+        queries=counter.count / iterations,
+        errors=errors,
+    )
+
+
+def check_budgets(results: List[Result], baseline: dict, tolerance: float) -> List[str]:
+    """Bütçe aşımlarını açıklayan mesajları döndür"""
+    violations = []
+    for result in results:
+        budget = baseline.get(result.name)
+        if not budget:
+            continue
+        if result.errors:
+            violations.append(f"{result.name}: {result.errors} hatalı yanıt")
+        if "queries" in budget and result.queries > budget["queries"]:
+            violations.append(
+                f"{result.name}: istek başına {result.queries:.1f} sorgu > bütçe {budget['queries']}"
+            )
+        if "p95_ms" in budget and result.p95_ms > budget["p95_ms"] * (1 + tolerance):
+            violations.append(
+                f"{result.name}: p95 {result.p95_ms:.1f} ms > bütçe {budget['p95_ms']} ms"
+            )
+    return violations
+
+
+def print_table(results: List[Result]):
+    header = f"{'endpoint':<18}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'sorgu':>8}{'hata':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r.name:<18}{r.p50_ms:>9.2f}{r.p95_ms:>9.2f}{r.p99_ms:>9.2f}"
+              f"{r.throughput:>9.1f}{r.queries:>8.1f}{r.errors:>6}")
+
+
+async def main_async(args) -> int:
+    selected = [s for s in SCENARIOS if not args.only or s.name in args.only.split(",")]
+    counter = StatementCounter()
+    engines = (engine, *replica_engines)
+    for db_engine in engines:
+        event.listen(db_engine, "before_cursor_execute", counter)
+
+    # ASGITransport lifespan'i çalıştırmaz; ölçümler üretimdeki gibi ısınmış uygulamada yapılır
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            ctx = BenchContext(client, args.prefix)
+            await ctx.login_all({role for s in selected for role in (s.role, *s.needs)})
+            ctx.load_samples(args.samples)
+
+            results = []
+            for scenario in selected:
+                results.append(await run_scenario(ctx, scenario, counter, args.iterations, args.warmup))
+
+    for db_engine in engines:
+        event.remove(db_engine, "before_cursor_execute", counter)
+    print_table(results)
+
+    if args.update_baseline:
+        baseline = {
+            r.name: {"p95_ms": round(r.p95_ms, 1), "queries": int(round(r.queries))}
+            for r in results
+        }
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n")
+        print(f"\n✓ Baseline güncellendi: {BASELINE_PATH}")
+        return 0
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    violations = check_budgets(results, baseline, args.tolerance)
+    if violations:
+        print("\n❌ Bütçe aşımı:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+    print("\n✨ Tüm endpoint'ler bütçe içinde")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Endpoint bazlı API benchmark'ı")
+    parser.add_argument("--prefix", default="gen", help="generate_data.py ile kullanılan ön ek")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=500, help="Detay/yorum senaryoları için ticket sayısı")
+    parser.add_argument("--only", help="Virgülle ayrılmış senaryo adları")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_LATENCY_TOLERANCE,
+                        help="p95 bütçesi için izin verilen aşım oranı")
+    parser.add_argument("--update-baseline", action="store_true", help="Ölçümleri yeni baseline olarak kaydet")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+Performans ölçümleri için yüksek hacimli sentetik veri üreten script
+
+Aynı --seed ve --end-date ile her çalıştırma aynı veriyi üretir. Satırlar
+PostgreSQL COPY ile parça parça yüklenir; bellek kullanımı parça boyutuyla sınırlıdır.
+
+Kullanım:
+    python generate_data.py --customers 100000 --agents 200 --tickets 2000000
+    python generate_data.py --seed 7 --prefix bench2 --tickets 500000
+"""
+import argparse
+import bisect
+import itertools
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.db.bulk import copy_rows
+from app.db.session import SessionLocal
+from app.core.security import get_password_hash
+from app.models.role import Role, RoleType
+from app.models.ticket import Ticket, TicketStatus, TicketPriority, TicketCategory
+from app.models.ticket_comment import TicketComment
+from app.models.user import User, UserStatus
+from app.services.user_import import USER_COPY_COLUMNS, LEGACY_ROLE_MAP
+from init_roles import create_default_roles
+
+# Tüm üretilen kullanıcıların ortak şifresi (tek bir bcrypt hash'i kullanılır)
+DEFAULT_PASSWORD = "test123"
+
+STATUS_WEIGHTS = {
+    TicketStatus.OPEN: 15,
+    TicketStatus.IN_PROGRESS: 15,
+    TicketStatus.WAITING: 10,
+    TicketStatus.RESOLVED: 20,
+    TicketStatus.CLOSED: 40,
+}
+
+PRIORITY_WEIGHTS = {
+    TicketPriority.LOW: 30,
+    TicketPriority.MEDIUM: 45,
+    TicketPriority.HIGH: 20,
+    TicketPriority.URGENT: 5,
+}
+
+CATEGORY_WEIGHTS = {
+    TicketCategory.HARDWARE: 20,
+    TicketCategory.SOFTWARE: 35,
+    TicketCategory.NETWORK: 20,
+    TicketCategory.ACCESS: 15,
+    TicketCategory.OTHER: 10,
+}
+
+DEPARTMENTS = ["IT", "Satış", "Muhasebe", "İnsan Kaynakları", "Pazarlama", "Operasyon", "Hukuk"]
+
+TITLES = {
+    TicketCategory.HARDWARE: ["Bilgisayar açılmıyor", "Yazıcı çalışmıyor", "Monitör görüntü vermiyor", "Klavye arızalı"],
+    TicketCategory.SOFTWARE: ["Email alamıyorum", "Outlook donuyor", "Lisans hatası", "Uygulama güncellenmiyor"],
+    TicketCategory.NETWORK: ["Ağ bağlantısı yok", "VPN bağlanmıyor", "WiFi çok yavaş", "Paylaşılan klasöre erişilemiyor"],
+    TicketCategory.ACCESS: ["Şifremi unuttum", "Hesabım kilitlendi", "Yetki talebi", "Sisteme giriş yapamıyorum"],
+    TicketCategory.OTHER: ["Genel bilgi talebi", "Ekipman talebi", "Toplantı odası sorunu", "Diğer"],
+}
+
+DESCRIPTION_SENTENCES = [
+    "Sorun bu sabahtan beri devam ediyor.",
+    "Bilgisayarı yeniden başlattım ama düzelmedi.",
+    "Aynı sorunu ekipteki başka kişiler de yaşıyor.",
+    "Acil olarak çözülmesi gerekiyor, müşteri toplantım var.",
+    "Hata mesajının ekran görüntüsünü ekledim.",
+    "Daha önce de benzer bir talep açmıştım.",
+    "Sorun sadece ofis ağındayken oluşuyor.",
+    "Dün akşama kadar her şey normal çalışıyordu.",
+]
+
+COMMENT_TEXTS = [
+    "Talebiniz inceleniyor.",
+    "Ek bilgi verebilir misiniz?",
+    "Sorun hâlâ devam ediyor.",
+    "Uzaktan bağlantı ile kontrol edildi.",
+    "Tedarikçiye iletildi, dönüş bekleniyor.",
+    "Teşekkürler, şimdi çalışıyor.",
+    "Log kayıtları incelendi.",
+    "Kullanıcı ile telefonda görüşüldü.",
+]
+
+ATTACHMENT_TYPES = [
+    ("png", "image/png"),
+    ("jpg", "image/jpeg"),
+    ("pdf", "application/pdf"),
+    ("log", "text/plain"),
+]
+
+TICKET_COPY_COLUMNS = (
+    "id", "title", "description", "status", "priority", "category",
+    "created_by_id", "assigned_to_id", "escalated_to_id", "last_updated_by_id",
+    "resolution", "attachment_urls", "created_at", "updated_at"
+)
+
+COMMENT_COPY_COLUMNS = ("ticket_id", "user_id", "content", "is_internal", "created_at", "updated_at")
+
+
+class WeightedChoice:
+    """Önceden hesaplanmış kümülatif ağırlıklarla O(log n) seçim"""
+
+    def __init__(self, items, weights):
+        self.items = list(items)
+        self.cumulative = list(itertools.accumulate(weights))
+        self.total = self.cumulative[-1]
+
+    def pick(self, rng: random.Random):
+        return self.items[bisect.bisect_right(self.cumulative, rng.random() * self.total)]
+
+
+def zipf_weights(count: int, exponent: float):
+    """Sıralamaya göre azalan ağırlıklar - az sayıda yoğun müşteri, uzun kuyruk"""
+    return [1.0 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def reserve_ids(session, sequence: str, count: int):
+    """Sequence'ten tek sorguda ardışık olmayabilecek id bloğu ayır"""
+    rows = session.execute(
+        text(f"SELECT nextval('{sequence}') FROM generate_series(1, :count)"),
+        {"count": count}
+    ).scalars().all()
+    return list(rows)
+
+
+def generate_users(session, rng, args, roles, password_hash, end_date):
+    """Kullanıcıları üret ve rollerine göre id listelerini döndür"""
+    plan = [
+        (RoleType.ADMIN, args.admins),
+        (RoleType.SUPERVISOR, args.supervisors),
+        (RoleType.AGENT, args.agents),
+        (RoleType.CUSTOMER, args.customers),
+    ]
+    ids_by_role = {}
+    total = 0
+
+    for role_type, count in plan:
+        if count <= 0:
+            ids_by_role[role_type] = []
+            continue
+        ids = reserve_ids(session, "users_id_seq", count)
+        ids_by_role[role_type] = ids
+        role = roles[role_type]
+        name = role_type.value
+
+        def rows():
+            for index, user_id in enumerate(ids, start=1):
+                created_at = end_date - timedelta(days=rng.uniform(30, args.days + 365))
+                yield (
+                    user_id,
+                    f"{args.prefix}_{name}_{index:07d}",
+                    f"{args.prefix}.{name}.{index}@example.com",
+                    f"{name.title()} {index}",
+                    password_hash,
+                    role.id,
+                    LEGACY_ROLE_MAP[name],
+                    UserStatus.ACTIVE,
+                    True,
+                    role_type == RoleType.ADMIN,
+                    None,
+                    rng.choice(DEPARTMENTS),
+                    created_at,
+                    created_at,
+                )
+
+        total += copy_rows(session, User.__tablename__, ("id",) + USER_COPY_COLUMNS, rows())
+        session.commit()
+
+    return ids_by_role, total
+
+
+def generate_tickets(session, rng, args, ids_by_role, end_date):
+    """Ticket, yorum ve ek dosya metadata'sını parça parça üret"""
+    customers = ids_by_role[RoleType.CUSTOMER] or ids_by_role[RoleType.AGENT]
+    agents = ids_by_role[RoleType.AGENT] or ids_by_role[RoleType.SUPERVISOR]
+    escalation_targets = ids_by_role[RoleType.SUPERVISOR] or ids_by_role[RoleType.ADMIN] or agents
+
+    creator_choice = WeightedChoice(customers, zipf_weights(len(customers), args.customer_skew))
+    agent_choice = WeightedChoice(agents, zipf_weights(len(agents), 0.3))
+    status_choice = WeightedChoice(STATUS_WEIGHTS.keys(), STATUS_WEIGHTS.values())
+    priority_choice = WeightedChoice(PRIORITY_WEIGHTS.keys(), PRIORITY_WEIGHTS.values())
+    category_choice = WeightedChoice(CATEGORY_WEIGHTS.keys(), CATEGORY_WEIGHTS.values())
+
+    ticket_total = 0
+    comment_total = 0
+    remaining = args.tickets
+
+    while remaining > 0:
+        chunk = min(args.chunk_size, remaining)
+        ticket_ids = reserve_ids(session, "tickets_id_seq", chunk)
+        ticket_rows = []
+        comment_rows = []
+
+        for ticket_id in ticket_ids:
+            status = status_choice.pick(rng)
+            category = category_choice.pick(rng)
+            created_by_id = creator_choice.pick(rng)
+            created_at = end_date - timedelta(seconds=rng.uniform(0, args.days * 86400))
+
+            assigned_to_id = None if status == TicketStatus.OPEN else agent_choice.pick(rng)
+            escalated_to_id = None
+            if assigned_to_id and rng.random() < 0.05:
+                escalated_to_id = rng.choice(escalation_targets)
+
+            resolution = None
+            if status in (TicketStatus.RESOLVED, TicketStatus.CLOSED):
+                resolution = "Sorun giderildi: " + rng.choice(COMMENT_TEXTS)
+                updated_at = created_at + timedelta(hours=rng.expovariate(1 / 48))
+            else:
+                updated_at = created_at + timedelta(hours=rng.uniform(0, 72))
+            updated_at = min(updated_at, end_date)
+
+            attachment_urls = None
+            if rng.random() < args.attachment_ratio:
+                attachments = []
+                for _ in range(rng.randint(1, 3)):
+                    extension, content_type = rng.choice(ATTACHMENT_TYPES)
+                    stored_name = f"{uuid.UUID(int=rng.getrandbits(128))}.{extension}"
+                    attachments.append({
+                        "original_name": f"ek_{rng.randint(1, 999)}.{extension}",
+                        "stored_name": stored_name,
+                        "path": f"uploads/tickets/{stored_name}",
+                        "size": rng.randint(2_000, 5 * 1024 * 1024),
+                        "content_type": content_type,
+                    })
+                attachment_urls = json.dumps(attachments)
+
+            ticket_rows.append((
+                ticket_id,
+                f"{rng.choice(TITLES[category])} #{ticket_id}",
+                " ".join(rng.sample(DESCRIPTION_SENTENCES, rng.randint(1, 4))),
+                status,
+                priority_choice.pick(rng),
+                category,
+                created_by_id,
+                assigned_to_id,
+                escalated_to_id,
+                assigned_to_id or created_by_id,
+                resolution,
+                attachment_urls,
+                created_at,
+                updated_at,
+            ))
+
+            # Yorum sayısı: üstel dağılım, küçük bir oranı çok uzun incident thread'leri
+            if rng.random() < args.incident_ratio:
+                comment_count = rng.randint(200, 2000)
+            else:
+                comment_count = int(rng.expovariate(1 / args.comments_per_ticket))
+            comment_at = created_at
+            for _ in range(comment_count):
+                comment_at += timedelta(minutes=rng.expovariate(1 / 90))
+                staff_author = assigned_to_id is not None and rng.random() < 0.5
+                author_id = assigned_to_id if staff_author else created_by_id
+                comment_rows.append((
+                    ticket_id,
+                    author_id,
+                    rng.choice(COMMENT_TEXTS),
+                    staff_author and rng.random() < 0.2,
+                    comment_at,
+                    comment_at,
+                ))
+
+        ticket_total += copy_rows(session, Ticket.__tablename__, TICKET_COPY_COLUMNS, ticket_rows)
+        comment_total += copy_rows(session, TicketComment.__tablename__, COMMENT_COPY_COLUMNS, comment_rows)
+        session.commit()
+
+        remaining -= chunk
+        print(f"  ... {ticket_total} ticket, {comment_total} yorum")
+
+    return ticket_total, comment_total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik veri üretici")
+    parser.add_argument("--seed", type=int, default=42, help="Rastgelelik tohumu")
+    parser.add_argument("--prefix", default="gen", help="Kullanıcı adı/e-posta ön eki (tekrar çalıştırmalar için)")
+    parser.add_argument("--end-date", default="2025-09-01", help="Üretilen verinin en yeni tarihi (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=730, help="Ticket'ların yayılacağı gün sayısı")
+    parser.add_argument("--admins", type=int, default=2)
+    parser.add_argument("--supervisors", type=int, default=20)
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--customers", type=int, default=50_000)
+    parser.add_argument("--tickets", type=int, default=500_000)
+    parser.add_argument("--comments-per-ticket", type=float, default=4.0, help="Ortalama yorum sayısı")
+    parser.add_argument("--incident-ratio", type=float, default=0.001, help="Çok uzun yorum thread'i olan ticket oranı")
+    parser.add_argument("--attachment-ratio", type=float, default=0.15, help="Ek dosyası olan ticket oranı")
+    parser.add_argument("--customer-skew", type=float, default=1.1, help="Müşteri başına ticket dağılımının Zipf üssü")
+    parser.add_argument("--chunk-size", type=int, default=20_000, help="COPY parça boyutu (ticket)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    end_date = datetime.fromisoformat(args.end_date)
+
+    print("🚀 Sentetik veri üretiliyor...\n")
+    create_default_roles()
+    started = time.perf_counter()
+
+    session = SessionLocal()
+    try:
+        roles = {role.name: role for role in session.query(Role).all()}
+        password_hash = get_password_hash(DEFAULT_PASSWORD)
+
+        ids_by_role, user_total = generate_users(session, rng, args, roles, password_hash, end_date)
+        print(f"✓ {user_total} kullanıcı yüklendi ({time.perf_counter() - started:.1f} sn)")
+
+        ticket_total, comment_total = generate_tickets(session, rng, args, ids_by_role, end_date)
+        print(f"✓ {ticket_total} ticket, {comment_total} yorum yüklendi ({time.perf_counter() - started:.1f} sn)")
+
+        # Planlayıcı istatistiklerini yeni veriye göre güncelle
+        session.execute(text("ANALYZE users"))
+        session.execute(text("ANALYZE tickets"))
+        session.execute(text("ANALYZE ticket_comments"))
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Hata oluştu: {e}")
+        raise
+    finally:
+        session.close()
+
+    print(f"\n✨ Tamamlandı: {time.perf_counter() - started:.1f} sn")
+    print(f"Tüm üretilen kullanıcıların şifresi: {DEFAULT_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+CSV veya NDJSON dosyasından toplu kullanıcı içe aktaran script
+
+Kullanım:
+    python import_users.py kullanicilar.csv
+    python import_users.py kullanicilar.ndjson --workers 8
+"""
+import argparse
+import os
+import time
+from app.db.session import SessionLocal
+from app.services.user_import import create_hash_pool, parse_user_rows, import_users
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu kullanıcı içe aktarma")
+    parser.add_argument("path", help="CSV (başlık satırlı) veya NDJSON dosyası")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Dosya formatı (varsayılan: uzantıdan)")
+    parser.add_argument("--workers", type=int, default=None, help="Hash'leme işlem sayısı (varsayılan: CPU sayısı)")
+    args = parser.parse_args()
+    
+    file_format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    
+    with open(args.path, encoding="utf-8-sig") as f:
+        rows = parse_user_rows(f.read(), file_format)
+    
+    print(f"🚀 {len(rows)} satır içe aktarılıyor...")
+    started = time.perf_counter()
+    
+    session = SessionLocal()
+    hash_pool = create_hash_pool(args.workers or os.cpu_count() or 1)
+    try:
+        result = import_users(session, rows, executor=hash_pool)
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Hata oluştu: {e}")
+        raise
+    finally:
+        if hash_pool is not None:
+            hash_pool.shutdown()
+        session.close()
+    
+    elapsed = time.perf_counter() - started
+    print(f"\n📊 Özet:")
+    print(f"- Toplam satır: {result.total}")
+    print(f"- İçe aktarılan: {result.imported}")
+    print(f"- Hatalı: {len(result.errors)}")
+    print(f"- Süre: {elapsed:.1f} sn")
+    
+    for error in result.errors[:20]:
+        print(f"  satır {error.line}: {error.detail}")
+    if len(result.errors) > 20:
+        print(f"  ... ve {len(result.errors) - 20} hata daha")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Soft-delete edilmiş ticket, yorum ve kullanıcıları kalıcı silen script
+(API worker'ları PURGE_INTERVAL_SECONDS ile bunu arka planda da yapar;
+büyük birikimleri boşaltmak veya arka plan döngüsü kapalıyken cron için)
+
+Kullanım:
+    python purge_deleted.py
+    python purge_deleted.py --after-hours 1 --batch-size 5000 --pause 0
+"""
+import argparse
+import logging
+import time
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.purge import purge_cutoff, purge_deleted
+
+def main():
+    parser = argparse.ArgumentParser(description="Silinmiş kayıtları kalıcı silme")
+    parser.add_argument("--after-hours", type=float, default=settings.PURGE_AFTER_HOURS,
+                        help="Bu kadar saattir silinmiş durumdaki kayıtlar temizlenir")
+    parser.add_argument("--batch-size", type=int, default=settings.PURGE_BATCH_SIZE, help="Parti başına satır")
+    parser.add_argument("--pause", type=float, default=settings.PURGE_BATCH_PAUSE_SECONDS,
+                        help="Partiler arası bekleme (sn)")
+    parser.add_argument("--max-batches", type=int, default=None, help="En fazla parti sayısı")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    
+    print(f"🚀 {purge_cutoff(args.after_hours):%Y-%m-%d %H:%M} öncesi silinmiş kayıtlar temizleniyor...")
+    started = time.perf_counter()
+    
+    session = SessionLocal()
+    try:
+        result = purge_deleted(
+            session,
+            after_hours=args.after_hours,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause,
+            max_batches=args.max_batches
+        )
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Hata oluştu: {e}")
+        raise
+    finally:
+        session.close()
+    
+    print(f"\n📊 Özet:")
+    print(f"- Silinen yorum: {result.comments}")
+    print(f"- Silinen ticket: {result.tickets}")
+    print(f"- Silinen kullanıcı: {result.users}")
+    print(f"- Parti: {result.batches}")
+    print(f"- Süre: {time.perf_counter() - started:.1f} sn")
+
+if __name__ == "__main__":
+    main()
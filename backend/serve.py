@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Yardım Masası API - Production Başlatıcı
+
+Gunicorn master süreci altında birden çok uvicorn worker'ı (uvloop + httptools)
+çalıştırır. Worker'lar önceden fork edilir ve SO_REUSEPORT ile dinler, SIGTERM'de
+işlenen istekleri bitirip kapanır, belirli sayıda istekten sonra yeniden başlatılır.
+DB bağlantı havuzları (primary ve replikalar), toplam bağlantı bütçesi worker'lara ve
+veritabanlarına bölünerek boyutlandırılır; bütçe yetmiyorsa sunucu başlamaz.
+
+Kullanım:
+    python serve.py --workers 8 --db-connection-budget 80
+    WEB_WORKERS=4 DB_CONNECTION_BUDGET=40 python serve.py
+
+Geliştirme için run.py (reload=True) kullanılmaya devam edilebilir.
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+
+class ProductionUvicornWorker(UvicornWorker):
+    """uvloop ve httptools'u zorunlu kılan uvicorn worker'ı"""
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+
+def pool_sizing(connection_budget: int, workers: int, databases: int = 1):
+    """
+    Toplam bağlantı bütçesini worker'lara ve her worker'ın açtığı havuzlara
+    (primary + her replika) böl: havuz başına bağlantıların yaklaşık dörtte biri
+    ani yükler için overflow olarak ayrılır. Her havuza en az bir bağlantı
+    düşmüyorsa bütçe karşılanamaz.
+    """
+    pools = workers * databases
+    if connection_budget < pools:
+        raise ValueError(
+            f"Bağlantı bütçesi ({connection_budget}) worker başına her veritabanına bir bağlantıya "
+            f"bile yetmiyor ({workers} worker × {databases} veritabanı = {pools})"
+        )
+    per_pool = connection_budget // pools
+    max_overflow = per_pool // 4
+    pool_size = max(1, per_pool - max_overflow)
+    return pool_size, max_overflow
+
+
+def on_starting(server):
+    # Önceki çalıştırmadan kalan çok süreçli metrik dosyalarını temizle
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Ölen/yeniden başlatılan worker'ın canlı gauge değerlerini düş
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+class HelpdeskServer(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+        return app
+
+
+def main():
+    default_workers = int(os.getenv("WEB_WORKERS", multiprocessing.cpu_count()))
+    parser = argparse.ArgumentParser(description="Production API sunucusu")
+    parser.add_argument("--bind", default=os.getenv("BIND", "0.0.0.0:8000"))
+    parser.add_argument("--workers", type=int, default=default_workers)
+    parser.add_argument("--db-connection-budget", type=int,
+                        default=int(os.getenv("DB_CONNECTION_BUDGET", "60")),
+                        help="Tüm worker'ların toplamda açabileceği en fazla DB bağlantısı")
+    parser.add_argument("--max-requests", type=int, default=int(os.getenv("MAX_REQUESTS", "10000")),
+                        help="Bu kadar istekten sonra worker yeniden başlatılır (0: kapalı)")
+    parser.add_argument("--max-requests-jitter", type=int, default=int(os.getenv("MAX_REQUESTS_JITTER", "1000")),
+                        help="Worker'ların aynı anda yeniden başlamaması için rastgele sapma")
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+                        help="SIGTERM sonrası işlenen isteklerin bitmesi için beklenecek süre (sn)")
+    parser.add_argument("--timeout", type=int, default=int(os.getenv("WORKER_TIMEOUT", "60")))
+    parser.add_argument("--keepalive", type=int, default=int(os.getenv("KEEPALIVE", "5")))
+    args = parser.parse_args()
+
+    # Primary ve her replika worker başına ayrı havuz açar; hepsi aynı bütçeden pay alır
+    from app.core.config import settings
+    databases = 1 + len([url for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()])
+    try:
+        pool_size, max_overflow = pool_sizing(args.db_connection_budget, args.workers, databases)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Worker'lar fork sonrası app'i import eder ve bu ortam değişkenlerini görür
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+
+    print(f"🚀 {args.workers} worker, worker başına {databases} havuz × {pool_size}+{max_overflow} "
+          f"(bütçe {args.db_connection_budget}) - {args.bind}")
+
+    HelpdeskServer({
+        "bind": args.bind,
+        "workers": args.workers,
+        "worker_class": "serve.ProductionUvicornWorker",
+        "reuse_port": True,
+        "preload_app": False,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests_jitter,
+        "graceful_timeout": args.graceful_timeout,
+        "timeout": args.timeout,
+        "keepalive": args.keepalive,
+        "on_starting": on_starting,
+        "child_exit": child_exit,
+        "accesslog": "-",
+        "errorlog": "-",
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
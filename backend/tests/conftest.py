@@ -0,0 +1,90 @@
+"""
+Test fixture'ları. Testler DATABASE_URL'deki (migration'ları uygulanmış)
+PostgreSQL'e bağlanır; her test dış bir transaction içinde çalışır ve sonunda
+geri alınır. Veritabanına ulaşılamazsa testler atlanır.
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.core.security import get_password_hash
+from app.db.session import engine
+from app.models.role import Role
+from app.models.user import User
+
+# Sayaca girmeyen transaction yönetimi ifadeleri (testin dış transaction'ı)
+_TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class StatementCounter:
+    """Bağlantı üzerinde çalışan SQL ifadelerini sadece açıkken say"""
+
+    def __init__(self, connection):
+        self.statements = []
+        self._active = False
+        event.listen(connection, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self._active and not statement.lstrip().upper().startswith(_TRANSACTION_CONTROL):
+            self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements.clear()
+        self._active = True
+        return self
+
+    def __exit__(self, *exc):
+        self._active = False
+
+
+@pytest.fixture
+def connection():
+    try:
+        connection = engine.connect()
+    except OperationalError as e:
+        pytest.skip(f"Veritabanına bağlanılamadı: {e}")
+    transaction = connection.begin()
+    yield connection
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def db(connection):
+    # Endpoint'lerin commit'leri savepoint'e gider, dış transaction sonunda geri alınır
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statement_counter(connection):
+    return StatementCounter(connection)
+
+
+@pytest.fixture
+def make_user(db):
+    roles = {}
+
+    def make_user(username: str, role_name: str) -> User:
+        if role_name not in roles:
+            role = db.query(Role).filter(Role.name == role_name).first()
+            if role is None:
+                role = Role(name=role_name, permissions=[])
+                db.add(role)
+                db.flush()
+            roles[role_name] = role
+        user = User(
+            username=username,
+            email=f"{username}@example.com",
+            full_name=username,
+            hashed_password=get_password_hash("test-password"),
+            role_id=roles[role_name].id
+        )
+        db.add(user)
+        db.flush()
+        # Kimlik doğrulama rolü zaten yüklemiş olur
+        assert user.role_obj is not None
+        return user
+
+    return make_user
@@ -0,0 +1,92 @@
+"""
+Durum değiştiren ticket endpoint'leri (yükseltme, çözme, kapatma, yeniden açma)
+çağrı başına en fazla iki ifade çalıştırır: UPDATE ... RETURNING ve yanıttaki
+kullanıcılar için toplu sorgu. Kimlik doğrulama sorguları bu bütçeye dahil değildir.
+"""
+import asyncio
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+from app.api.v1.routes import tickets
+from app.models.ticket import Ticket, TicketStatus
+
+MAX_MUTATION_STATEMENTS = 2
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "PUT", "path": "/", "headers": []})
+
+
+@pytest.fixture
+def ticket_setup(db, make_user):
+    customer = make_user("mutation_customer", "customer")
+    agent = make_user("mutation_agent", "agent")
+    supervisor = make_user("mutation_supervisor", "supervisor")
+    ticket = Ticket(
+        title="Yazıcı çalışmıyor",
+        description="Ofisteki yazıcı kağıt sıkıştırıyor",
+        created_by_id=customer.id,
+        assigned_to_id=agent.id,
+        status=TicketStatus.IN_PROGRESS
+    )
+    db.add(ticket)
+    db.commit()
+    return ticket.id, agent, supervisor
+
+
+def _authenticate(db, user):
+    """Önceki commit kullanıcıyı expire etti; istekte kimlik doğrulama onu ve rolünü yükler"""
+    db.refresh(user)
+    assert user.role_obj is not None
+    return user
+
+
+def _run(statement_counter, endpoint, *args, db, current_user, **kwargs):
+    kwargs.update(db=db, current_user=_authenticate(db, current_user))
+    with statement_counter as counter:
+        result = asyncio.run(endpoint(*args, request=_request(), response=Response(), **kwargs))
+    assert len(counter.statements) <= MAX_MUTATION_STATEMENTS, counter.statements
+    return result
+
+
+def test_mutators_stay_within_statement_budget(db, statement_counter, ticket_setup):
+    ticket_id, agent, supervisor = ticket_setup
+    
+    result = _run(
+        statement_counter, tickets.escalate_ticket, ticket_id,
+        tickets.TicketEscalate(escalated_to_id=supervisor.id, escalation_reason="Donanım değişimi gerekiyor"),
+        db=db, current_user=agent
+    )
+    assert result.status == TicketStatus.WAITING
+    assert result.escalated_to.id == supervisor.id
+    
+    result = _run(
+        statement_counter, tickets.resolve_ticket, ticket_id,
+        tickets.TicketResolve(resolution="Sıkışan kağıt çıkarıldı, test edildi"),
+        db=db, current_user=supervisor
+    )
+    assert result.status == TicketStatus.RESOLVED
+    
+    result = _run(
+        statement_counter, tickets.close_ticket, ticket_id,
+        tickets.TicketClose(closing_note="Müşteri onayladı"),
+        db=db, current_user=supervisor
+    )
+    assert result.status == TicketStatus.CLOSED
+    
+    result = _run(statement_counter, tickets.reopen_ticket, ticket_id, db=db, current_user=supervisor)
+    assert result.status == TicketStatus.IN_PROGRESS
+
+
+def test_rejected_mutation_stays_within_statement_budget(db, statement_counter, ticket_setup):
+    ticket_id, agent, supervisor = ticket_setup
+    
+    # Çözülmemiş ticket kapatılamaz; koşul aynı UPDATE'te kontrol edilir
+    _authenticate(db, supervisor)
+    with statement_counter as counter, pytest.raises(tickets.HTTPException) as error:
+        asyncio.run(tickets.close_ticket(
+            ticket_id, tickets.TicketClose(), request=_request(), response=Response(),
+            db=db, current_user=supervisor
+        ))
+    assert error.value.status_code == 400
+    assert len(counter.statements) <= MAX_MUTATION_STATEMENTS, counter.statements
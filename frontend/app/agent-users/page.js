@@ -16,6 +16,7 @@ const fetchCurrentUser = async () => {
   }
 
   const response = await fetch('http://localhost:8000/api/v1/users/me', {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
@@ -39,6 +40,7 @@ const fetchAgentUsers = async () => {
   }
 
   const response = await fetch('http://localhost:8000/api/v1/users/agents-customers', {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
@@ -24,6 +24,7 @@ export default function LoginPage() {
     setIsLoading(true);
     try {
       const response = await fetch('http://localhost:8000/api/v1/auth/login', {
+        credentials: 'include',
         method: 'POST',
         headers: {
           'Content-Type': 'application/x-www-form-urlencoded',
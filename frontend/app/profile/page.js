@@ -63,6 +63,7 @@ export default function ProfilePage() {
     try {
       // User bilgilerini al
       const userResponse = await fetch('http://localhost:8000/api/v1/auth/me', {
+        credentials: 'include',
         headers: {
           'Authorization': `Bearer ${token}`,
         },
@@ -81,6 +82,7 @@ export default function ProfilePage() {
 
         // User istatistiklerini al
         const statsResponse = await fetch('http://localhost:8000/api/v1/auth/me/stats', {
+          credentials: 'include',
           headers: {
             'Authorization': `Bearer ${token}`,
           },
@@ -137,6 +139,7 @@ export default function ProfilePage() {
 
       const token = localStorage.getItem('token');
       const response = await fetch('http://localhost:8000/api/v1/users/upload-profile-image', {
+        credentials: 'include',
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -190,6 +193,7 @@ export default function ProfilePage() {
     try {
       const token = localStorage.getItem('token');
       const response = await fetch('http://localhost:8000/api/v1/users/me', {
+        credentials: 'include',
         method: 'PUT',
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -230,6 +234,7 @@ export default function ProfilePage() {
     try {
       const token = localStorage.getItem('token');
       const response = await fetch('http://localhost:8000/api/v1/auth/change-password', {
+        credentials: 'include',
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`,
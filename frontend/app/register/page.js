@@ -39,6 +39,7 @@ export default function RegisterPage() {
     setIsLoading(true);
     try {
       const response = await fetch('http://localhost:8000/api/v1/auth/register', {
+        credentials: 'include',
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
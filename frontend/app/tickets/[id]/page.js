@@ -39,6 +39,7 @@ const fetchCurrentUser = async () => {
   }
 
   const response = await fetch('http://localhost:8000/api/v1/users/me', {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
@@ -58,6 +59,7 @@ const fetchTicket = async (id) => {
   }
 
   const response = await fetch(`http://localhost:8000/api/v1/tickets/${id}`, {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
@@ -81,6 +83,7 @@ const updateTicketStatus = async ({ id, status }) => {
   }
 
   const response = await fetch(`http://localhost:8000/api/v1/tickets/${id}/status`, {
+    credentials: 'include',
     method: 'PATCH',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -104,6 +107,7 @@ const escalateTicket = async ({ id, escalated_to_id, escalation_reason }) => {
   }
 
   const response = await fetch(`http://localhost:8000/api/v1/tickets/${id}/escalate`, {
+    credentials: 'include',
     method: 'PUT',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -128,6 +132,7 @@ const resolveTicket = async ({ id, resolution }) => {
   }
 
   const response = await fetch(`http://localhost:8000/api/v1/tickets/${id}/resolve`, {
+    credentials: 'include',
     method: 'PUT',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -155,6 +160,7 @@ const closeTicket = async ({ id, closing_note }) => {
   }
 
   const response = await fetch(`http://localhost:8000/api/v1/tickets/${id}/close`, {
+    credentials: 'include',
     method: 'PUT',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -177,6 +183,7 @@ const reopenTicket = async (id) => {
   }
 
   const response = await fetch(`http://localhost:8000/api/v1/tickets/${id}/reopen`, {
+    credentials: 'include',
     method: 'PUT',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -203,6 +210,7 @@ const uploadAttachments = async ({ id, files }) => {
   });
 
   const response = await fetch(`http://localhost:8000/api/v1/tickets/${id}/attachments`, {
+    credentials: 'include',
     method: 'POST',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -24,6 +24,7 @@ const fetchTickets = async (searchTerm = '') => {
     : 'http://localhost:8000/api/v1/tickets';
 
   const response = await fetch(url, {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
@@ -47,6 +48,7 @@ const fetchCurrentUser = async () => {
   }
 
   const response = await fetch('http://localhost:8000/api/v1/users/me', {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
@@ -70,6 +72,7 @@ const createTicket = async (ticketData) => {
   }
 
   const response = await fetch('http://localhost:8000/api/v1/tickets', {
+    credentials: 'include',
     method: 'POST',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -96,6 +99,7 @@ const updateTicket = async ({ ticketId, ticketData }) => {
   }
 
   const response = await fetch(`http://localhost:8000/api/v1/tickets/${ticketId}`, {
+    credentials: 'include',
     method: 'PUT',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -30,6 +30,7 @@ const fetchUsers = async (searchTerm = '') => {
     : 'http://localhost:8000/api/v1/users';
 
   const response = await fetch(url, {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
@@ -53,6 +54,7 @@ const fetchRoles = async () => {
   }
 
   const response = await fetch('http://localhost:8000/api/v1/roles', {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
@@ -72,6 +74,7 @@ const updateUserRole = async (userId, roleId) => {
   }
 
   const response = await fetch(`http://localhost:8000/api/v1/users/${userId}/role`, {
+    credentials: 'include',
     method: 'PUT',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -98,6 +101,7 @@ const fetchCurrentUser = async () => {
   }
 
   const response = await fetch('http://localhost:8000/api/v1/users/me', {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
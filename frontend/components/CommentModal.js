@@ -14,6 +14,7 @@ const addComment = async (ticketId, commentData) => {
   }
 
   const response = await fetch(`http://localhost:8000/api/v1/tickets/${ticketId}/comments`, {
+    credentials: 'include',
     method: 'POST',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -21,6 +21,7 @@ export default function Layout({ children }) {
     }
 
     const response = await fetch('http://localhost:8000/api/v1/users/me', {
+      credentials: 'include',
       headers: {
         'Authorization': `Bearer ${token}`,
       },
@@ -50,6 +51,7 @@ export default function Layout({ children }) {
 
       try {
         const response = await fetch('http://localhost:8000/api/v1/auth/me', {
+          credentials: 'include',
           headers: {
             'Authorization': `Bearer ${token}`,
           },
@@ -1,7 +1,7 @@
 'use client';
 
-import { useState } from 'react';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useEffect, useState } from 'react';
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Textarea } from '@/components/ui/textarea';
@@ -16,14 +16,24 @@ import {
   LockIcon
 } from 'lucide-react';
 
+// Yeni yorumları yoklama aralığı (sadece son sayfa yüklüyken)
+const COMMENT_POLL_INTERVAL = 15000;
+
 // API Functions
-const fetchTicketComments = async (ticketId) => {
+const fetchTicketComments = async (ticketId, { cursor, since } = {}) => {
   const token = localStorage.getItem('token');
   if (!token) {
     throw new Error('No token found');
   }
 
-  const response = await fetch(`http://localhost:8000/api/v1/tickets/${ticketId}/comments`, {
+  // Tek sayfa: sonraki sayfa X-Next-Cursor ile istenirse yüklenir, yoklama since ile sadece yenileri alır
+  const params = new URLSearchParams();
+  if (cursor) params.set('cursor', cursor);
+  if (since) params.set('since', since);
+  const query = params.toString();
+
+  const response = await fetch(`http://localhost:8000/api/v1/tickets/${ticketId}/comments${query ? `?${query}` : ''}`, {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
@@ -33,7 +43,26 @@ const fetchTicketComments = async (ticketId) => {
     throw new Error('Failed to fetch comments');
   }
 
-  return response.json();
+  return {
+    comments: await response.json(),
+    nextCursor: response.headers.get('X-Next-Cursor'),
+  };
+};
+
+// Yeni yorumları son sayfaya ekle (aynı id iki kez eklenmez)
+const appendComments = (data, fresh) => {
+  if (!data || fresh.length === 0) {
+    return data;
+  }
+  const known = new Set(data.pages.flatMap(page => page.comments.map(comment => comment.id)));
+  const added = fresh.filter(comment => !known.has(comment.id));
+  if (added.length === 0) {
+    return data;
+  }
+  const pages = [...data.pages];
+  const last = pages[pages.length - 1];
+  pages[pages.length - 1] = { ...last, comments: [...last.comments, ...added] };
+  return { ...data, pages };
 };
 
 const createComment = async ({ ticketId, content, isInternal }) => {
@@ -43,6 +72,7 @@ const createComment = async ({ ticketId, content, isInternal }) => {
   }
 
   const response = await fetch(`http://localhost:8000/api/v1/tickets/${ticketId}/comments`, {
+    credentials: 'include',
     method: 'POST',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -65,6 +95,7 @@ const fetchCurrentUser = async () => {
   }
 
   const response = await fetch('http://localhost:8000/api/v1/users/me', {
+    credentials: 'include',
     headers: {
       'Authorization': `Bearer ${token}`,
     },
@@ -89,18 +120,50 @@ export default function TicketComments({ ticketId }) {
     retry: false,
   });
 
-  // Fetch comments
-  const { data: comments, isLoading, error } = useQuery({
-    queryKey: ['ticketComments', ticketId],
-    queryFn: () => fetchTicketComments(ticketId),
+  // Fetch comments: ilk sayfa, devamı isteğe bağlı
+  const commentsKey = ['ticketComments', ticketId];
+  const {
+    data,
+    isLoading,
+    error,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
+    queryKey: commentsKey,
+    queryFn: ({ pageParam }) => fetchTicketComments(ticketId, { cursor: pageParam }),
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor || undefined,
     enabled: !!ticketId,
   });
 
+  const comments = data?.pages.flatMap(page => page.comments);
+  const lastComment = comments?.[comments.length - 1];
+
+  // Thread'in sonu yüklüyse sadece son yorumdan sonrakileri yokla
+  useEffect(() => {
+    if (!ticketId || !data || hasNextPage) {
+      return undefined;
+    }
+    const timer = setInterval(async () => {
+      try {
+        const { comments: fresh } = await fetchTicketComments(ticketId, { since: lastComment?.created_at });
+        queryClient.setQueryData(commentsKey, (current) => appendComments(current, fresh));
+      } catch {
+        // Yoklama hatası bir sonraki denemede tekrar edilir
+      }
+    }, COMMENT_POLL_INTERVAL);
+    return () => clearInterval(timer);
+  }, [ticketId, data, hasNextPage, lastComment?.created_at]);
+
   // Create comment mutation
   const createCommentMutation = useMutation({
     mutationFn: createComment,
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['ticketComments', ticketId] });
+    onSuccess: (created) => {
+      // Tüm sayfaları yeniden çekmek yerine yeni yorumu ekle; devamı yüklenmemişse sırası gelince gelir
+      if (!hasNextPage) {
+        queryClient.setQueryData(commentsKey, (current) => appendComments(current, [created]));
+      }
       setNewComment('');
       setIsInternal(false);
     },
@@ -220,6 +283,18 @@ export default function TicketComments({ ticketId }) {
               </div>
             ))
           )}
+          {hasNextPage && (
+            <div className="flex justify-center">
+              <Button
+                type="button"
+                variant="outline"
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+              >
+                {isFetchingNextPage ? 'Yükleniyor...' : 'Daha fazla yorum yükle'}
+              </Button>
+            </div>
+          )}
         </div>
 
         {/* Add Comment Form */}